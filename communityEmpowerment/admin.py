@@ -23,6 +23,8 @@ from orderable.admin import OrderableAdmin
 from django.utils.html import format_html
 
 from django.contrib.admin import SimpleListFilter
+from .utils.cache_versions import bump_on_commit
+from .utils.facet_index import invalidate_on_commit
 
 
 
@@ -410,6 +412,15 @@ class TagAdmin(OrganizationScopedAdmin):
 admin_site.register(Tag, TagAdmin)
 
 
+def active_flags_changed(*namespaces):
+    """
+    Invalidate what reads is_active once the transaction commits. The admin
+    actions below toggle it with queryset.update(), which sends no signals.
+    """
+    bump_on_commit(*namespaces)
+    invalidate_on_commit()
+
+
 class StateAdmin(OrganizationScopedAdmin):
     list_display = ('state_name', 'is_active')
     list_editable = ('is_active',)
@@ -419,10 +430,12 @@ class StateAdmin(OrganizationScopedAdmin):
 
     def activate_states(self, request, queryset):
         queryset.update(is_active=True)
+        active_flags_changed('states')
     activate_states.short_description = "Activate selected states"
 
     def deactivate_states(self, request, queryset):
         queryset.update(is_active=False)
+        active_flags_changed('states')
     deactivate_states.short_description = "Deactivate selected states"
 
     def is_active_checkbox(self, obj):
@@ -439,6 +452,7 @@ class StateAdmin(OrganizationScopedAdmin):
         if not obj.is_active:
             Department.objects.filter(state=obj).update(is_active=False)
             Scheme.objects.filter(department__state=obj).update(is_active=False)
+            active_flags_changed('departments', 'schemes')
 
 admin_site.register(State, StateAdmin)
 
@@ -452,10 +466,12 @@ class DepartmentAdmin(OrganizationScopedAdmin):
 
     def activate_departments(self, request, queryset):
         queryset.update(is_active=True)
+        active_flags_changed('departments')
     activate_departments.short_description = "Activate selected departments"
 
     def deactivate_departments(self, request, queryset):
         queryset.update(is_active=False)
+        active_flags_changed('departments')
     deactivate_departments.short_description = "Deactivate selected departments"
 
 admin_site.register(Department, DepartmentAdmin)
@@ -1,70 +1,210 @@
+import argparse
+import json
 import subprocess
 import os
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from django.core.management.base import BaseCommand
 
+# States whose scrapers only collect PDF links; their PDFs are downloaded
+# as soon as the scraper itself has finished.
+PDF_STATES = ["rajasthan", "goa", "tripura", "jharkhand"]
+
+SCRAPERS = {
+    "maharastra": "maharastra_scraper.js",
+    "gujarat": "gujarat_scraper.js",
+    "jammu_kashmir": "jammu_kashmir_scraper.js",
+    "meghalaya": "meghalaya_scraper.js",
+    "puducherry": "puducherry_scraper.js",
+    "tamilNadu": "tamilNadu_scraper.js",
+    "up_youthWelfare": "up_youthWelfare.js",
+    "madhyaPradesh": "madhyaPradesh_scraper.js",
+    "kerala": "kerala_scraper.js",
+    "manipur": "manipur_scraper.js",
+    "punjab": "punjab_scraper.js",
+    "andhraPradesh": "andhraPradesh_scraper.js",
+    "haryana": "haryana_scraper.js",
+    "assam": "assam_scraper.js",
+    "odisha": "odisha_scraper.js",
+    "rajasthan": "rajasthan_scraper.js",  # PDF
+    "goa": "goa_scraper.js",  # PDF
+    "tripura": "tripura_scraper.js",  # PDF
+    "jharkhand": "jharkhand_scraper.js",  # PDF
+    "uttarakhand": "uttarakhand_scraper.js",
+    "sikkim": "sikkim_scraper.js",
+    "telangana": "telangana_scraper.js",
+    "chhattisgarh": "chhattisgarh_scraper.js",
+    "arunachalPradesh": "arunachalPradesh_scraper.js",
+    "delhi": "delhi_scraper.js",
+    "ladakh": "ladakh_scraper.js",
+    "himachalPradesh": "himachalPradesh_scraper.js",
+    "dadraAndNagarHaveli": "dadraAndNagarHaveli.js",
+    "nagaland": "nagaland_scraper.js",
+    "chandigarh": "chandigarh_scraper.js",
+    "andamanAndNicobar": "andamanAndNicobar_scraper.js",
+}
+
+
+class Job:
+    """
+    One script in the pipeline. `requires` must succeed before the job runs
+    (otherwise it is skipped); `after` only has to have finished, so one
+    failed state does not hold back the stages that combine all states.
+    """
+
+    def __init__(self, name, command, requires=(), after=(), timeout=None, retries=0):
+        self.name = name
+        self.command = command
+        self.requires = list(requires)
+        self.after = list(after)
+        self.timeout = timeout
+        self.retries = retries
+        self.status = "pending"
+        self.returncode = None
+        self.attempts = 0
+        self.seconds = 0.0
+        self.output = ""
+
+
+def build_jobs(base_dir, scraper_timeout, stage_timeout, retries):
+    python = sys.executable
+    jobs = []
+    for state, script in SCRAPERS.items():
+        jobs.append(Job(f"scrape:{state}", ["node", os.path.join(base_dir, script)],
+                        timeout=scraper_timeout, retries=retries))
+
+    for state in PDF_STATES:
+        jobs.append(Job(f"pdf:{state}", [python, os.path.join(base_dir, '../downloadAndUploadPDFs.py'), state],
+                        requires=[f"scrape:{state}"], timeout=stage_timeout, retries=retries))
+
+    scrapers = [f"scrape:{state}" for state in SCRAPERS]
+    pdfs = [f"pdf:{state}" for state in PDF_STATES]
+    jobs += [
+        Job("pdfParser", [python, os.path.join(base_dir, '../geminiAndParsingScripts/pdfParser.py')],
+            after=pdfs, timeout=stage_timeout),
+        Job("structureScrapedSchemes",
+            [python, os.path.join(base_dir, '../geminiAndParsingScripts/structureScrapedSchemes.py')],
+            after=scrapers + ["pdfParser"], timeout=stage_timeout),
+        Job("converted_combined", [python, os.path.join(base_dir, '../converted_combined.py')],
+            after=["structureScrapedSchemes"], timeout=stage_timeout),
+        Job("load_data", [python, os.path.join(base_dir, '../../../../manage.py'), 'load_data'],
+            requires=["converted_combined"], timeout=stage_timeout),
+    ]
+    return jobs
+
+
 class Command(BaseCommand):
     help = 'Run all scraper scripts'
 
-    def handle(self, *args, **kwargs):
-        def run_script(script_command):
+    def add_arguments(self, parser):
+        add_scheduler_arguments(parser)
+
+    def run_job(self, job, retry_delay):
+        start = time.perf_counter()
+        for attempt in range(job.retries + 1):
+            job.attempts = attempt + 1
             try:
-                result = subprocess.run(script_command, shell=True, check=True, capture_output=True, text=True)
-                self.stdout.write(f"Output of {script_command}:\n{result.stdout}")
-            except subprocess.CalledProcessError as e:
-                self.stderr.write(f"Error running {script_command}:\n{e.stderr}")
-                raise
+                result = subprocess.run(job.command, capture_output=True, text=True, timeout=job.timeout)
+                job.returncode = result.returncode
+                job.output = result.stdout if result.returncode == 0 else result.stderr
+                job.status = "ok" if result.returncode == 0 else "failed"
+            except subprocess.TimeoutExpired:
+                job.returncode = None
+                job.output = f"timed out after {job.timeout}s"
+                job.status = "timeout"
+            except OSError as e:
+                job.returncode = None
+                job.output = str(e)
+                job.status = "failed"
+            if job.status == "ok":
+                break
+            if attempt < job.retries:
+                time.sleep(retry_delay * (attempt + 1))
+        job.seconds = time.perf_counter() - start
+        return job
+
+    def run_jobs(self, jobs, workers, retry_delay):
+        """Run `jobs` as their requires/after edges allow, at most `workers` at a time."""
+        by_name = {job.name: job for job in jobs}
+        finished = {"ok", "failed", "timeout", "skipped"}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            while True:
+                # A skipped job can unblock jobs listed before it, so sweep until stable.
+                changed = True
+                while changed:
+                    changed = False
+                    for job in jobs:
+                        if job.status != "pending":
+                            continue
+                        if any(by_name[name].status in finished - {"ok"} for name in job.requires):
+                            job.status = "skipped"
+                            changed = True
+                            self.stderr.write(f"Skipping {job.name}: a required step failed")
+                        elif all(by_name[name].status in finished for name in job.requires + job.after):
+                            job.status = "running"
+                            self.stdout.write(f"Running script: {' '.join(job.command)}")
+                            running[pool.submit(self.run_job, job, retry_delay)] = job
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    future.result()
+                    if job.status == "ok":
+                        self.stdout.write(f"Output of {job.name} ({job.seconds:.1f}s):\n{job.output}")
+                    else:
+                        self.stderr.write(f"Error running {job.name} ({job.status} after "
+                                          f"{job.attempts} attempts, {job.seconds:.1f}s):\n{job.output}")
+        return jobs
 
+    def handle(self, *args, **kwargs):
+        report_path = kwargs.get('report')
         base_dir = os.path.abspath(os.path.dirname(__file__))
-        scripts = [
-            f"node {os.path.join(base_dir, '../Scrapers/maharastra_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/gujarat_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/jammu_kashmir_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/meghalaya_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/puducherry_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/tamilNadu_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/up_youthWelfare.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/madhyaPradesh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/kerala_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/manipur_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/punjab_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/andhraPradesh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/haryana_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/assam_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/odisha_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/rajasthan_scraper.js')}",  # PDF
-            f"node {os.path.join(base_dir, '../Scrapers/goa_scraper.js')}",  # PDF
-            f"node {os.path.join(base_dir, '../Scrapers/tripura_scraper.js')}",  # PDF
-            f"node {os.path.join(base_dir, '../Scrapers/jharkhand_scraper.js')}",  # PDF
-            f"node {os.path.join(base_dir, '../Scrapers/uttarakhand_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/sikkim_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/telangana_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/chhattisgarh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/arunachalPradesh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/delhi_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/ladakh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/himachalPradesh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/dadraAndNagarHaveli_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/nagaland_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/chandigarh_scraper.js')}",
-            f"node {os.path.join(base_dir, '../Scrapers/andamanAndNicobar_scraper.js')}",
-            f"python {os.path.join(base_dir, '../downloadAndUploadPdfs.py')}",
-            f"python {os.path.join(base_dir, '../geminiAndParsingScripts/pdfParser.py')}",
-            f"python {os.path.join(base_dir, '../geminiAndParsingScripts/structureScrapedSchemes.py')}",
-            f"python {os.path.join(base_dir, '../converted_combined.py')}",
-            f"python {os.path.join(base_dir, '../../../../manage.py load_data')}"
-        ]
-
-
-        for script in scripts:
-            self.stdout.write(f"Running script: {script}")
-            run_script(script)
+        jobs = build_jobs(
+            base_dir,
+            scraper_timeout=kwargs.get('scraper_timeout', 900),
+            # The Gemini stages are rate limited and can run for hours, so
+            # they have no limit unless one is asked for.
+            stage_timeout=kwargs.get('stage_timeout'),
+            retries=kwargs.get('retries', 1),
+        )
+        self.run_jobs(jobs, workers=kwargs.get('workers') or 4, retry_delay=kwargs.get('retry_delay', 30))
+
+        self.stdout.write("Step                                   status     exit  tries    seconds")
+        for job in jobs:
+            self.stdout.write(f"{job.name:<38} {job.status:<9} {str(job.returncode):>5} {job.attempts:>6} {job.seconds:>10.1f}")
+        if report_path:
+            with open(report_path, 'w') as f:
+                json.dump([{
+                    'name': job.name, 'status': job.status, 'returncode': job.returncode,
+                    'attempts': job.attempts, 'seconds': round(job.seconds, 2),
+                } for job in jobs], f, indent=2)
 
+        failed = [job.name for job in jobs if job.status != "ok"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} steps did not succeed: {', '.join(failed)}")
         self.stdout.write(self.style.SUCCESS('All scripts ran successfully.'))
 
+
+def add_scheduler_arguments(parser):
+    parser.add_argument('--workers', type=int, default=4, help='Scripts run at the same time')
+    parser.add_argument('--scraper-timeout', type=int, default=900, help='Seconds before a scraper is killed')
+    parser.add_argument('--stage-timeout', type=int, default=None,
+                        help='Seconds before a later stage is killed (default: no limit)')
+    parser.add_argument('--retries', type=int, default=1, help='Retries for a failed or timed out scraper')
+    parser.add_argument('--retry-delay', type=int, default=30, help='Base seconds between retries')
+    parser.add_argument('--report', help='Write per-step status and timing to this JSON file')
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_scheduler_arguments(parser)
     try:
-        Command().handle()
+        Command().handle(**vars(parser.parse_args()))
     except Exception as e:
-        # print(f"Error: {str(e)}", file=sys.stderr)
+        print(f"Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from communityEmpowerment.management.commands.converted_combined import (
+    StateMerge, base_file_path, combine_state_files, state_sources,
+)
+
+
+class LegacyStateMerge(StateMerge):
+    """The previous lookup: scan the state's department list for every item."""
+
+    def organisation(self, department_name):
+        department = next((d for d in self.state["departments"] if d["department_name"] == department_name), None)
+        if department is None:
+            return super().organisation(department_name)
+        return department["organisations"][0]
+
+
+def legacy_combine(output_path, base_dir):
+    """The previous shape: the whole combined tree in memory, dumped at the end."""
+    combined_data = {"states": []}
+    for state_name, file_path, transform in state_sources:
+        state = LegacyStateMerge(state_name, "")
+        with open(os.path.join(base_dir, file_path), "r") as f:
+            transform(json.load(f), state)
+        combined_data["states"].append(state.state)
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(combined_data, file, ensure_ascii=False, indent=4)
+
+
+def write_scaled_inputs(directory, scale):
+    """Copy every scraped file with each item repeated `scale` times under distinct departments."""
+    for _, file_path, _ in state_sources:
+        with open(os.path.join(base_file_path, file_path), "r") as f:
+            items = json.load(f)
+        scaled = [
+            {**item, "department_name": f"{item.get('department_name')} {copy}"} if copy else item
+            for copy in range(scale) for item in items
+        ]
+        os.makedirs(os.path.dirname(os.path.join(directory, file_path)), exist_ok=True)
+        with open(os.path.join(directory, file_path), "w") as f:
+            json.dump(scaled, f)
+
+
+def measure(fn, memory=False):
+    """(seconds, peak traced MB or None, result); tracing slows the run, so it is opt-in."""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def describe(seconds, peak):
+    return f"{seconds:6.2f} s" + (f" (peak {peak:6.1f} MB)" if peak is not None else "")
+
+
+class Command(BaseCommand):
+    help = "Benchmark converted_combined on the scraped state files, optionally scaled up"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1,5,20',
+                            help='Comma separated copies of every scraped item (1 = the files as they are)')
+        parser.add_argument('--memory', action='store_true', help='Also trace peak Python memory (slower)')
+
+    def handle(self, *args, **options):
+        for scale in [int(scale) for scale in options['scales'].split(',') if scale.strip()]:
+            with tempfile.TemporaryDirectory() as directory:
+                base_dir = base_file_path
+                if scale > 1:
+                    base_dir = os.path.join(directory, 'input')
+                    write_scaled_inputs(base_dir, scale)
+
+                seconds, peak, (_, schemes) = measure(
+                    lambda: combine_state_files(os.path.join(directory, 'combined.json'), base_dir=base_dir),
+                    options['memory'],
+                )
+                legacy_seconds, legacy_peak, _ = measure(
+                    lambda: legacy_combine(os.path.join(directory, 'legacy.json'), base_dir), options['memory'],
+                )
+            self.stdout.write(
+                f"x{scale:<3} {schemes:>7} schemes  streaming {describe(seconds, peak)} "
+                f"[{schemes / seconds:.0f} schemes/s]  legacy {describe(legacy_seconds, legacy_peak)}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
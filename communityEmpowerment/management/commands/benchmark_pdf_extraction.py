@@ -0,0 +1,54 @@
+import glob
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from communityEmpowerment.utils.pdf_text import DEFAULT_MAX_PAGES, PdfExtractionService, PdfTextCache
+
+SCRAPED_PDFS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scrapedData', 'scrapedPdfs')
+
+
+def corpus_sources(paths, state=None, limit=None):
+    """PDF files under `paths`, plus the scraped PDF links of `state`."""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            sources += sorted(glob.glob(os.path.join(path, '**', '*.pdf'), recursive=True))
+        else:
+            sources.append(path)
+    if state:
+        with open(os.path.join(SCRAPED_PDFS_DIR, f'{state}Pdf.json')) as f:
+            sources += [item.get('pdf_link') or item.get('pdfUrl') for item in json.load(f)]
+    sources = [source for source in dict.fromkeys(sources) if source]
+    return sources[:limit] if limit else sources
+
+
+class Command(BaseCommand):
+    help = "Benchmark PDF text extraction throughput (pages/s) against worker count"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='PDF files or directories of PDFs')
+        parser.add_argument('--state', help='Also extract the scraped PDF links of this state, e.g. goa')
+        parser.add_argument('--limit', type=int, help='Use at most this many documents')
+        parser.add_argument('--workers', default='1,2,4', help='Comma separated parser process counts')
+        parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES)
+
+    def handle(self, *args, **options):
+        sources = corpus_sources(options['paths'], options['state'], options['limit'])
+        if not sources:
+            raise CommandError("No PDFs given; pass files, directories or --state")
+
+        worker_counts = [int(count) for count in options['workers'].split(',') if count.strip()]
+        self.stdout.write(f"{len(sources)} documents, at most {options['max_pages']} pages each")
+        for workers in worker_counts:
+            with tempfile.TemporaryDirectory() as directory:
+                service = PdfExtractionService(max_workers=workers, max_pages=options['max_pages'],
+                                               cache=PdfTextCache(directory))
+                _, cold = service.extract_many(sources)
+                _, warm = service.extract_many(sources)
+            self.stdout.write(f"{workers:>3} workers  cold: {cold.summary()}")
+            self.stdout.write(f"{'':>3}          warm: {warm.summary()}")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,65 @@
+import random
+import tempfile
+
+from django.core.management.base import BaseCommand
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from communityEmpowerment.models import Scheme
+from communityEmpowerment.utils.benchmarking import synthetic_schemes, time_call
+from communityEmpowerment.utils.similarity import SimilarityStore, build_similarity_store, scheme_text
+from communityEmpowerment.utils.utils import recommend_schemes
+
+
+def legacy_recommend_schemes(scheme_id, cosine_sim, top_n=10):
+    """The previous implementation: full Scheme list plus a Python loop over every row."""
+    schemes = list(Scheme.objects.select_related('department').all().order_by('id'))
+    id_to_index = {s.id: idx for idx, s in enumerate(schemes)}
+    scheme_index = id_to_index[scheme_id]
+    selected_state = schemes[scheme_index].department.state
+    similar = sorted(
+        [(i, score) for i, score in enumerate(cosine_sim[scheme_index])
+         if i != scheme_index and schemes[i].department.state == selected_state],
+        key=lambda x: x[1], reverse=True,
+    )
+    return [{'scheme': schemes[i], 'score': round(float(score), 4)} for i, score in similar[:top_n]]
+
+
+class Command(BaseCommand):
+    help = "Benchmark recommendation latency against scheme count"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,5000,20000',
+                            help='Comma separated synthetic scheme counts')
+        parser.add_argument('--lookups', type=int, default=20)
+        parser.add_argument('--legacy-max', type=int, default=5000,
+                            help='Largest size for which the dense-matrix path is also timed')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        for size in sizes:
+            with synthetic_schemes(size) as data, tempfile.TemporaryDirectory() as directory:
+                schemes = Scheme.objects.select_related('department').prefetch_related(
+                    'tags', 'beneficiaries', 'sponsors'
+                ).filter(id__in=[s.id for s in data['schemes']]).order_by('id')
+
+                build_time, _ = time_call(lambda: build_similarity_store(schemes, directory=directory), repeat=1)
+                store = SimilarityStore(directory)
+                sample = random.Random(0).sample([s.id for s in data['schemes']], min(options['lookups'], size))
+
+                lookup_time, _ = time_call(
+                    lambda: [recommend_schemes(scheme_id, store, top_n=10) for scheme_id in sample], repeat=3
+                )
+                line = (f"{size:>7} schemes  build {build_time:7.2f} s  "
+                        f"store lookup {lookup_time / len(sample) * 1000:8.2f} ms/request")
+
+                if size <= options['legacy_max']:
+                    matrix = TfidfVectorizer(stop_words='english').fit_transform([scheme_text(s) for s in schemes])
+                    cosine_sim = cosine_similarity(matrix, matrix)
+                    legacy_time, _ = time_call(
+                        lambda: [legacy_recommend_schemes(scheme_id, cosine_sim) for scheme_id in sample[:5]], repeat=1
+                    )
+                    line += f"  legacy {legacy_time / len(sample[:5]) * 1000:8.2f} ms/request"
+                self.stdout.write(line)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
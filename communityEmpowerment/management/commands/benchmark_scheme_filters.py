@@ -0,0 +1,72 @@
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from communityEmpowerment.models import Scheme
+from communityEmpowerment.utils.benchmarking import synthetic_schemes, time_call
+from communityEmpowerment.utils.facet_index import SchemeFacetIndex
+
+
+def orm_filter_ids(state_ids=None, department_ids=None, tag=None, user_tags=None,
+                   beneficiary_keywords=None, sponsor_ids=None):
+    """The multi-join ORM filter UnifiedSchemesAPIView used before the facet index."""
+    scheme_filters = Q(department__is_active=True, department__state__is_active=True, is_active=True)
+    if tag:
+        scheme_filters &= Q(tags__name__icontains=tag)
+    if user_tags:
+        tag_filters = Q()
+        for user_tag in user_tags:
+            tag_filters |= Q(tags__name__icontains=user_tag)
+        scheme_filters &= tag_filters
+    if tag == "job":
+        scheme_filters &= Q(tags__name__icontains='job') | Q(tags__name__icontains='employment')
+    if state_ids:
+        scheme_filters &= Q(department__state_id__in=state_ids)
+    if department_ids:
+        scheme_filters &= Q(department_id__in=department_ids)
+    if beneficiary_keywords:
+        bf_filter = Q()
+        for keyword in beneficiary_keywords:
+            bf_filter |= Q(beneficiaries__beneficiary_type__icontains=keyword)
+        scheme_filters &= bf_filter
+    if sponsor_ids:
+        scheme_filters &= Q(sponsors__id__in=sponsor_ids)
+    return set(Scheme.objects.filter(scheme_filters).distinct().values_list('id', flat=True))
+
+
+class Command(BaseCommand):
+    help = "Benchmark facet-index scheme filtering against the ORM join path"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, default=50000,
+                            help='Number of throwaway schemes to generate (0 = use existing data)')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        count = options['synthetic']
+        context = synthetic_schemes(count) if count else nullcontext()
+        with context as data:
+            state_ids = [s.id for s in data['states'][:3]] if data else []
+            sponsor_ids = [data['sponsors'][0].id] if data else []
+            cases = {
+                'tag': {'tag': 'scholarship'},
+                'job tag + states': {'tag': 'job', 'state_ids': state_ids},
+                'profile tags + beneficiaries': {'user_tags': ['sc', 'obc'], 'beneficiary_keywords': ['students']},
+                'states + sponsors': {'state_ids': state_ids, 'sponsor_ids': sponsor_ids},
+            }
+
+            index = SchemeFacetIndex()
+            build_time, _ = time_call(index.rebuild, repeat=1)
+            self.stdout.write(f"Index build over {len(index)} schemes: {build_time * 1000:.1f} ms")
+
+            for name, filters in cases.items():
+                orm_time, orm_ids = time_call(lambda: orm_filter_ids(**filters), options['repeat'])
+                index_time, index_ids = time_call(lambda: index.filter(**filters), options['repeat'])
+                match = "ok" if orm_ids == index_ids else "MISMATCH"
+                self.stdout.write(
+                    f"{name:<30} orm {orm_time * 1000:8.1f} ms  index {index_time * 1000:8.2f} ms  "
+                    f"hits {len(index_ids):>6}  {match}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
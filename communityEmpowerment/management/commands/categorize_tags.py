@@ -1,10 +1,69 @@
+from collections import Counter, defaultdict
+from itertools import islice
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from communityEmpowerment.models import Tag
+from communityEmpowerment.utils.cache_versions import bump_on_commit
+from communityEmpowerment.utils.facet_index import invalidate_on_commit
+from communityEmpowerment.utils.tag_classifier import classify_tags
+
+
+def recategorize_tags(chunk_size=2000, dry_run=False):
+    """
+    Reclassify every tag and write only the categories that changed, in one
+    transaction. Returns (category counts before, counts after, tags changed).
+    """
+    before, after = Counter(), Counter()
+    changed = defaultdict(list)
+    # Plain rows rather than Tag instances: DirtyFieldsMixin connects a
+    # post_save receiver in every Tag.__init__, which dominates a full scan.
+    rows = Tag.objects.order_by('id').values_list('id', 'name', 'category').iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        for (tag_id, _, current), category in zip(chunk, classify_tags([name for _, name, _ in chunk])):
+            before[current] += 1
+            after[category] += 1
+            if current != category:
+                changed[category].append(tag_id)
+
+    if changed and not dry_run:
+        # One UPDATE per new category and chunk of ids. Queryset updates send
+        # no post_save, so retire what the Tag signals would have instead:
+        # cached responses and fragments nesting tags, and the facet index.
+        with transaction.atomic():
+            for category, tag_ids in changed.items():
+                for start in range(0, len(tag_ids), chunk_size):
+                    Tag.objects.filter(id__in=tag_ids[start:start + chunk_size]).update(category=category)
+            bump_on_commit('tags')
+            invalidate_on_commit()
+    return before, after, sum(len(tag_ids) for tag_ids in changed.values())
+
 
 class Command(BaseCommand):
     help = "Categorize existing tags into relevant categories"
 
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Tags read and written per query')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how the category distribution would change without writing it')
+
     def handle(self, *args, **kwargs):
-        for tag in Tag.objects.all():
-            tag.save() 
-        self.stdout.write(self.style.SUCCESS("Successfully updated all tags with correct categories!"))
+        before, after, changed = recategorize_tags(kwargs['chunk_size'], kwargs['dry_run'])
+        total = sum(after.values())
+
+        if kwargs['dry_run']:
+            self.stdout.write(f"{'category':<28}{'now':>8}{'after':>8}{'diff':>8}")
+            for category in sorted(set(before) | set(after)):
+                diff = after[category] - before[category]
+                if diff:
+                    self.stdout.write(f"{category:<28}{before[category]:>8}{after[category]:>8}{diff:>+8}")
+            self.stdout.write(self.style.WARNING(f"Dry run: {changed} of {total} tags would change category."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully updated all tags with correct categories! ({changed} of {total} changed)"
+        ))
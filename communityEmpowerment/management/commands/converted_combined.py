@@ -6,15 +6,19 @@ from django.core.management.base import BaseCommand
 from datetime import datetime
 import pytz
 base_file_path = os.path.join(os.path.dirname(__file__), '..','scrapedData')
+output_file_path = os.path.join(base_file_path, 'combined_schemes_data.json')
 
 class Command(BaseCommand):
     help = 'Converts and combines data into a JSON file'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=output_file_path, help='Where to write the combined JSON')
+
     def handle(self, *args, **kwargs):
-        # Your logic for combining data goes here
-        with open('combined_schemes_data.json', 'w') as outfile:
-            json.dump(combined_data, outfile, indent=4)
-        self.stdout.write(self.style.SUCCESS('Combined data has been successfully saved to combined_schemes_data.json'))
+        states, schemes = combine_state_files(kwargs['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Combined {schemes} schemes from {states} states into {kwargs["output"]}'
+        ))
 
 def remove_leading_numbers(title):
     # Use a regular expression to remove leading numbers followed by a dot and whitespace
@@ -104,42 +108,60 @@ def clean_field(field):
         return {key: clean_field(value) for key, value in field.items()}
     return field 
 
-def transform_and_add_state_data(state_name, original_data, combined_data):
-    ist = pytz.timezone('Asia/Kolkata')
-    created_at = datetime.now(ist).replace(microsecond=0).isoformat()
 
-    for item in original_data:
-        item = clean_field(item)
-        department_name = item.get("department_name")
-
-        # Find or create state
-        state = next((s for s in combined_data["states"] if s["state_name"] == state_name), None)
-        if not state:
-            state = {
-                "state_name": state_name,
-                "created_at": created_at,
-                "departments": []
-            }
-            combined_data["states"].append(state)
+class CleanedItem:
+    """A scraped item whose fields go through clean_field only when they are read."""
+
+    def __init__(self, item):
+        self.item = item
+
+    def get(self, key, default=None):
+        return clean_field(self.item.get(key, default))
+
+
+class StateMerge:
+    """One state being combined, with its departments indexed by name."""
 
+    def __init__(self, state_name, created_at):
+        self.state_name = state_name
+        self.created_at = created_at
+        self.state = {
+            "state_name": state_name,
+            "created_at": created_at,
+            "departments": []
+        }
+        self.departments = {}
+        self.schemes = 0
+
+    def organisation(self, department_name):
         # Find or create department
-        department = next((d for d in state["departments"] if d["department_name"] == department_name), None)
-        if not department:
+        department = self.departments.get(department_name)
+        if department is None:
             department = {
                 "department_name": department_name,
-                "created_at": created_at,
+                "created_at": self.created_at,
                 "organisations": [
                     {
                         "organisation_name": department_name,
-                        "created_at": created_at,
+                        "created_at": self.created_at,
                         "schemes": []
                     }
                 ]
             }
-            state["departments"].append(department)
+            self.departments[department_name] = department
+            self.state["departments"].append(department)
+        return department["organisations"][0]
+
+    def add_scheme(self, organisation, scheme):
+        organisation["schemes"].append(scheme)
+        self.schemes += 1
+
+def transform_and_add_state_data(original_data, state):
+    for item in original_data:
+        item = CleanedItem(item)
+        organisation = state.organisation(item.get("department_name"))
 
         # Add scheme to organisation
-        organisation = department["organisations"][0]
         title = remove_leading_numbers(item.get("title"))
         description = item.get("description")
         scheme = {
@@ -165,42 +187,13 @@ def transform_and_add_state_data(state_name, original_data, combined_data):
             ],
             "tags": determine_tags(title, description) + item.get("tags", [])
         }
-        organisation["schemes"].append(scheme)
+        state.add_scheme(organisation, scheme)
 
-def transform_and_add_uttar_pradesh_data(original_data, combined_data):
+def transform_and_add_uttar_pradesh_data(original_data, state):
     for item in original_data:
-        item = clean_field(item)
-        state_name = "Uttar Pradesh"
-        ist = pytz.timezone('Asia/Kolkata')
-        created_at = datetime.now(ist).replace(microsecond=0).isoformat()
+        item = CleanedItem(item)
         department_name = "उत्तर प्रदेश सरकार"
-        state = next((s for s in combined_data["states"] if s["state_name"] == state_name), None)
-
-        if not state:
-            state = {
-                "state_name": state_name,
-                "created_at": created_at,
-                "departments": []
-            }
-            combined_data["states"].append(state)
-
-        department = next((d for d in state["departments"] if d["department_name"] == department_name), None)
-
-        if not department:
-            department = {
-                "department_name": department_name,
-                "created_at": created_at,
-                "organisations": [
-                    {
-                        "organisation_name": department_name,
-                        "created_at": created_at,
-                        "schemes": []
-                    }
-                ]
-            }
-            state["departments"].append(department)
-
-        organisation = department["organisations"][0]
+        organisation = state.organisation(department_name)
         if not item.get("title",""):
             continue
         title = remove_leading_numbers(item.get("title",""))
@@ -234,45 +227,15 @@ def transform_and_add_uttar_pradesh_data(original_data, combined_data):
                 requirement for requirement in item.get("requirements", [])
             ]
         }
-        organisation["schemes"].append(scheme)
+        state.add_scheme(organisation, scheme)
 
 
-def transform_and_add_goa_data(state_name, original_data, combined_data):
-    ist = pytz.timezone('Asia/Kolkata')
-    created_at = datetime.now(ist).replace(microsecond=0).isoformat()
-
+def transform_and_add_goa_data(original_data, state):
     for item in original_data:
-        item = clean_field(item)
-        department_name = item.get("department_name")
-
-        # Find or create state
-        state = next((s for s in combined_data["states"] if s["state_name"] == state_name), None)
-        if not state:
-            state = {
-                "state_name": state_name,
-                "created_at": created_at,
-                "departments": []
-            }
-            combined_data["states"].append(state)
-
-        # Find or create department
-        department = next((d for d in state["departments"] if d["department_name"] == department_name), None)
-        if not department:
-            department = {
-                "department_name": department_name,
-                "created_at": created_at,
-                "organisations": [
-                    {
-                        "organisation_name": department_name,
-                        "created_at": created_at,
-                        "schemes": []
-                    }
-                ]
-            }
-            state["departments"].append(department)
+        item = CleanedItem(item)
+        organisation = state.organisation(item.get("department_name"))
 
         # Add scheme to organisation
-        organisation = department["organisations"][0]
         title = remove_leading_numbers(item.get("title"))
         description = item.get("description")
         scheme = {
@@ -298,42 +261,12 @@ def transform_and_add_goa_data(state_name, original_data, combined_data):
             ],
             "tags": determine_tags(title, description) + item.get("tags", [])
         }
-        organisation["schemes"].append(scheme)
+        state.add_scheme(organisation, scheme)
 
-def transform_and_add_jharkhand_data(original_data, combined_data):
+def transform_and_add_jharkhand_data(original_data, state):
     for item in original_data:
-        item = clean_field(item)
-        state_name = "Jharkhand"
-        ist = pytz.timezone('Asia/Kolkata')
-        created_at = datetime.now(ist).replace(microsecond=0).isoformat()
-        department_name = item.get("department_name")
-        state = next((s for s in combined_data["states"] if s["state_name"] == state_name), None)
-
-        if not state:
-            state = {
-                "state_name": state_name,
-                "created_at": created_at,
-                "departments": []
-            }
-            combined_data["states"].append(state)
-
-        department = next((d for d in state["departments"] if d["department_name"] == department_name), None)
-
-        if not department:
-            department = {
-                "department_name": department_name,
-                "created_at": created_at,
-                "organisations": [
-                    {
-                        "organisation_name": department_name,
-                        "created_at": created_at,
-                        "schemes": []
-                    }
-                ]
-            }
-            state["departments"].append(department)
-
-        organisation = department["organisations"][0]
+        item = CleanedItem(item)
+        organisation = state.organisation(item.get("department_name"))
         title = remove_leading_numbers(item.get("title",""))
         description = item.get("description")
         scheme = {
@@ -359,7 +292,7 @@ def transform_and_add_jharkhand_data(original_data, combined_data):
             ],
             "tags": determine_tags(title, description) + item.get("tags",[])
         }
-        organisation["schemes"].append(scheme)
+        state.add_scheme(organisation, scheme)
 
 
 
@@ -396,33 +329,67 @@ state_data_files = {
     "West Bengal": "westBengal.json",
 }
 
-# Initialize the combined data structure
-combined_data = {
-    "states": []
-}
-
-# Process each state
-for state_name, file_path in state_data_files.items():
-    with open(base_file_path + "/" + file_path, "r") as file:
-        state_data = json.load(file)
-        transform_and_add_state_data(state_name, state_data, combined_data)
-
-with open(base_file_path+"/up/up_youth_welfare.json", "r") as file:
-    up_data = json.load(file)
-
-with open(base_file_path+"/goa.json", "r") as file:
-    goa_data = json.load(file)
-
-with open(base_file_path+"/jharkhand.json", "r") as file:
-    jharkhand_data = json.load(file)
-
-transform_and_add_uttar_pradesh_data(up_data,combined_data)
-transform_and_add_goa_data("Goa",goa_data,combined_data)
-transform_and_add_jharkhand_data(jharkhand_data, combined_data)
-
-# Save the combined data to a new JSON file
-with open(base_file_path + "/combined_schemes_data.json", "w", encoding="utf-8") as file:
-    json.dump(combined_data, file, ensure_ascii=False, indent=4)
+# (state name, file under scrapedData, transform) in output order
+state_sources = [
+    (state_name, file_path, transform_and_add_state_data) for state_name, file_path in state_data_files.items()
+] + [
+    ("Uttar Pradesh", "up/up_youth_welfare.json", transform_and_add_uttar_pradesh_data),
+    ("Goa", "goa.json", transform_and_add_goa_data),
+    ("Jharkhand", "jharkhand.json", transform_and_add_jharkhand_data),
+]
+
+
+class CombinedWriter:
+    """Writes {"states": [...]} one state at a time, laid out exactly as json.dump(indent=4) would."""
+
+    def __init__(self, file):
+        self.file = file
+        self.states = 0
+        self.encoder = json.JSONEncoder(ensure_ascii=False, indent=4)
+        self.file.write('{\n    "states": [')
+
+    def write_state(self, state):
+        self.file.write(',\n' if self.states else '\n')
+        self.file.write(' ' * 8)
+        # Encoded chunks never contain a raw newline inside a string, so indenting every newline is safe.
+        for chunk in self.encoder.iterencode(state):
+            self.file.write(chunk.replace('\n', '\n        '))
+        self.states += 1
+
+    def close(self):
+        self.file.write('\n    ]\n}' if self.states else ']\n}')
+
+
+def combine_state_files(output_path=output_file_path, base_dir=base_file_path, sources=None):
+    """
+    Merge the scraped files state by state and stream each finished state to
+    output_path, so only one state's tree is in memory at a time. Returns
+    (states, schemes) written.
+    """
+    ist = pytz.timezone('Asia/Kolkata')
+    created_at = datetime.now(ist).replace(microsecond=0).isoformat()
 
-# print("Combined data has been successfully saved to combined_schemes_data.json")
-# print("Combined data has been successfully saved to combined_schemes_data.json")
\ No newline at end of file
+    # A state fed by several files is merged from all of them before it is written.
+    by_state = {}
+    for state_name, file_path, transform in sources or state_sources:
+        by_state.setdefault(state_name, []).append((file_path, transform))
+
+    schemes = 0
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        writer = CombinedWriter(file)
+        for state_name, state_files in by_state.items():
+            state = StateMerge(state_name, created_at)
+            for file_path, transform in state_files:
+                with open(os.path.join(base_dir, file_path), "r") as f:
+                    transform(json.load(f), state)
+            if state.state["departments"]:
+                writer.write_state(state.state)
+                schemes += state.schemes
+        writer.close()
+    os.replace(tmp_path, output_path)
+    return writer.states, schemes
+
+
+if __name__ == "__main__":
+    combine_state_files()
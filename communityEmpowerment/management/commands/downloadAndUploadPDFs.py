@@ -1,19 +1,27 @@
-import requests
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a plain script by runAllScripts, so make the project importable first.
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
+    import django
+    django.setup()
+
+import argparse
 import boto3
 from urllib.parse import urlparse
-from os.path import basename
-import os
 import json
 import urllib.parse
 from django.conf import settings
+from communityEmpowerment.utils.pdf_transfer import PdfTransferEngine
 
 
-s3 = boto3.client('s3', 
-                  aws_access_key_id= settings.AWS_ACCESS_KEY_ID, 
-                  aws_secret_access_key= settings.AWS_SECRET_ACCESS_KEY, 
-                  region_name= settings.AWS_S3_REGION_NAME)
-
-BUCKET_NAME = settings.AWS_STORAGE_BUCKET_NAME
+def get_s3_client():
+    return boto3.client('s3',
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                        region_name=settings.AWS_S3_REGION_NAME)
 
 
 def encode_metadata_value(value):
@@ -22,43 +30,40 @@ def encode_metadata_value(value):
 
 def get_file_name_with_query(url):
     parsed_url = urlparse(url)
-    path = parsed_url.path.strip('/')  
-    query = parsed_url.query         
+    path = parsed_url.path.strip('/')
+    query = parsed_url.query
     if query:
-        return f"{path}?{query}"  
-    return path  
+        return f"{path}?{query}"
+    return path
 
-# Function to download PDF from URL and upload to S3
-def download_and_upload_pdf(pdf_url, state_name, scheme_url, title, scheme_id):
-    try:
-        # Download PDF
-        response = requests.get(pdf_url, stream=True)
-        response.raise_for_status()  # Ensure the request was successful
-
-        # Get the file name from the URL
-        file_name = get_file_name_with_query(pdf_url)
-        s3_directory = f"pdfs/{state_name}/"
-        encoded_title = encode_metadata_value(title)
-        metadata = {
+def pdf_item(pdf_url, state_name, scheme_url, title, scheme_id):
+    """Transfer job for one PDF: source URL, S3 key and object metadata."""
+    file_name = get_file_name_with_query(pdf_url)
+    return {
+        'url': pdf_url,
+        'key': f"pdfs/{state_name}/{file_name}",
+        'metadata': {
             'schemeUrl': scheme_url,
-            'title': encoded_title,
+            'title': encode_metadata_value(title),
             'pdfUrl': pdf_url,
-            'id': scheme_id
-        }
-        # Upload to S3
-        s3.upload_fileobj(response.raw, BUCKET_NAME, f"{s3_directory}{file_name}", ExtraArgs={'ContentType': 'application/pdf', 'Metadata': metadata})
-        print(f"Successfully uploaded {file_name} to S3.")
-    
-    except Exception as e:
-        print(f"Error downloading or uploading PDF: {e}")
+            'id': scheme_id,
+        },
+    }
 
+# Function to download PDF from URL and upload to S3
+def download_and_upload_pdf(pdf_url, state_name, scheme_url, title, scheme_id, engine=None):
+    engine = engine or PdfTransferEngine(get_s3_client(), settings.AWS_STORAGE_BUCKET_NAME)
+    return engine.run([pdf_item(pdf_url, state_name, scheme_url, title, scheme_id)])
 
 
-def main(input_file_path):
+def main(input_file_path, state_name, engine):
     with open(input_file_path, "r") as file:
         stateData = json.load(file)
-    for pdf_url in stateData:
-        download_and_upload_pdf(pdf_url["pdf_link"],'goa', pdf_url["schemeUrl"], pdf_url["title"], pdf_url["id"])
+    items = [
+        pdf_item(pdf_url["pdf_link"], state_name, pdf_url["schemeUrl"], pdf_url["title"], pdf_url["id"])
+        for pdf_url in stateData
+    ]
+    return engine.run(items)
 
 pdfStates = [
     "goa",
@@ -67,7 +72,18 @@ pdfStates = [
     "rajasthan"
 ]
 
-for state_name in pdfStates:
-    base_file_path = os.path.join(os.path.dirname(__file__),'..', 'scrapedData', 'scrapedPdfs', f'{state_name}Pdf.json')
-    input_file_path = os.path.abspath(base_file_path)
-    main(input_file_path)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    # runAllScripts passes the state whose scraper just finished.
+    parser.add_argument('states', nargs='*', default=pdfStates)
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent transfers')
+    parser.add_argument('--per-host', type=int, default=4, help='Concurrent downloads per source host')
+    args = parser.parse_args()
+
+    engine = PdfTransferEngine(get_s3_client(), settings.AWS_STORAGE_BUCKET_NAME,
+                               max_workers=args.workers, per_host=args.per_host)
+    for state_name in args.states:
+        base_file_path = os.path.join(os.path.dirname(__file__),'..', 'scrapedData', 'scrapedPdfs', f'{state_name}Pdf.json')
+        input_file_path = os.path.abspath(base_file_path)
+        stats = main(input_file_path, state_name, engine)
+        print(f"{state_name}: {stats.summary()}")
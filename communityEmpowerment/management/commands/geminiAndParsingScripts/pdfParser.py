@@ -1,11 +1,23 @@
+import os
+import sys
+
+from django.apps import apps
+
+if not apps.ready:
+    # Run as a plain script by runAllScripts (or imported by structureScrapedSchemes),
+    # so make the project importable and set Django up first.
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..')))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
+    import django
+    django.setup()
+
+import argparse
 import requests
 import io
-import pdfplumber
 from docx import Document
 import pypandoc
-import os
 import json
-from structureGemini import process_and_structure_document
+from structureGemini import MODEL_NAME, PROMPT_VERSION, gemini_client, process_and_structure_document
 import time
 from google.api_core.exceptions import ResourceExhausted
 from google.api_core.exceptions import DeadlineExceeded
@@ -15,9 +27,12 @@ from trackScheme import (
     save_current_state,
     identify_changes,
 )
-import os
 from dotenv import load_dotenv
-from commands.listDownloadFromS3 import process_pdfs_for_state
+from communityEmpowerment.management.commands.listDownloadFromS3 import process_pdfs_for_state
+from communityEmpowerment.utils.pdf_text import PdfExtractionService, extract_pdf_pages
+from communityEmpowerment.utils.llm_scheduler import Checkpoint, KeyPool, StructuringScheduler
+from communityEmpowerment.utils.structured_cache import StructuredResultCache, result_key
+from django.conf import settings
 
 
 load_dotenv()
@@ -43,18 +58,10 @@ api_keys = [
 
 
 
-def parse_pdf(pdf_url):
-    pdfText = ''
-    response = requests.get(pdf_url, stream=True)
-    response.raise_for_status()
-
-    pdf_buffer = io.BytesIO(response.content)
-
-    with pdfplumber.open(pdf_buffer) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            pdfText += text
-    return pdfText
+def parse_pdf(pdf_url, extraction_service=None):
+    extraction_service = extraction_service or PdfExtractionService(max_workers=1)
+    pages, _ = extract_pdf_pages(extraction_service.fetch(pdf_url), extraction_service.max_pages)
+    return '\n'.join(pages)
 
 
 def parse_docx(docx_url):
@@ -79,9 +86,15 @@ def parse_doc(doc_url):
     docText = pypandoc.convert_file(io.BytesIO(response.content), 'plain')
     return docText
 
-def parse_document(url):
+def is_word_document(url):
+    return url.split('.')[-1].lower() in ('docx', 'doc')
+
+
+def parse_document(url, extracted_texts=None):
     # print("ye url",url)
-    
+    if extracted_texts is not None and url in extracted_texts:
+        return extracted_texts[url]
+
     file_extension = url.split('.')[-1].lower()
 
 
@@ -99,177 +112,130 @@ def parse_document(url):
         return parse_pdf(url)
 
 
+QUOTA_ERRORS = (ResourceExhausted,)
+_key_pools = {}
+
+
+def get_key_pool(keys=None):
+    """Key pools are shared per process, so every caller draws on the same per-key quotas."""
+    keys = tuple(keys or api_keys)
+    if keys not in _key_pools:
+        _key_pools[keys] = KeyPool(keys, requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+                                   client=gemini_client)
+    return _key_pools[keys]
+
+
 def process_with_api_key_rotation(extractedSchemeText, api_keys, retries=5):
-    for api_key in api_keys:
-        # print(f"Trying API key: {api_key}")
-        for attempt in range(retries):
-            try:
-                result = process_and_structure_document(extractedSchemeText, api_key)
-                return result
-
-            except ResourceExhausted as e:
-                # print(f"Attempt {attempt + 1} with API key {api_key} failed: {str(e)}")
-                if attempt < retries - 1:
-                    backoff_time = 2 ** attempt
-                    # print(f"Retrying in {backoff_time} seconds...")
-                    time.sleep(backoff_time)
-                else:
-                    # print(f"API key {api_key} exhausted, moving to the next key.")
-                    break
-            except DeadlineExceeded as e:
-                print(f"Attempt {attempt + 1} with API key {api_key} failed due to DeadlineExceeded: {str(e)}")
-                if attempt < retries - 1:
-                    backoff_time = 2 ** attempt
-                    # print(f"Retrying in {backoff_time} seconds...")
-                    time.sleep(backoff_time)
-                else:
-                    # print(f"API key {api_key} exhausted, moving to the next key.")
-                    break
-
-            except Exception as e:
-                # print(f"Attempt {attempt + 1} with API key {api_key} failed due to an unexpected error: {str(e)}")
-                if attempt < retries - 1:
-                    backoff_time = 2 ** attempt
-                    # print(f"Retrying in {backoff_time} seconds...")
-                    time.sleep(backoff_time)
-                else:
-                    # print(f"API key {api_key} exhausted, moving to the next key.")
-                    break
-    # print("All API keys exhausted, unable to process the document.")
-    return None
-
-
-def process_schemes(state_pdf_text, output_file_path):
-
-    schemes_to_process = state_pdf_text
+    scheduler = StructuringScheduler(process_and_structure_document, get_key_pool(api_keys),
+                                     quota_errors=QUOTA_ERRORS, retries=retries)
+    return scheduler.run_one("document", extractedSchemeText)
+
+
+def scheme_details(result):
+    """The scheme_details argument of Gemini's add_to_database call, or None."""
+    if not result or not result.candidates:
+        return None
+    try:
+        fc = result.candidates[0].content.parts[0].function_call
+    except IndexError:
+        return None
+    return json.loads(json.dumps(type(fc).to_dict(fc))).get("args", {}).get("scheme_details")
+
+
+def structure_document(extractedSchemeText, client):
+    return scheme_details(process_and_structure_document(extractedSchemeText, client))
+
+
+def structure_documents(jobs, checkpoint_path, max_in_flight=8, cache=None):
+    """
+    Structure {job id: document text} with many requests in flight across the
+    key pool. Documents already structured by the same model and prompt
+    version come from the result cache without an API call; the rest are
+    checkpointed as they finish so a crashed run resumes.
+    """
+    cache = cache or StructuredResultCache()
+    results = {}
+    misses = {}
+    for job_id, document in dict(jobs).items():
+        digest = result_key(document, MODEL_NAME, PROMPT_VERSION)
+        cached = cache.get(digest)
+        if cached is not None:
+            results[job_id] = cached
+        else:
+            misses[job_id] = (digest, document)
+
+    def structure(job, client):
+        digest, document = job
+        final_converted_data = structure_document(document, client)
+        if final_converted_data is not None:
+            cache.set(digest, final_converted_data)
+        return final_converted_data
+
+    if misses:
+        scheduler = StructuringScheduler(structure, get_key_pool(), quota_errors=QUOTA_ERRORS,
+                                         max_in_flight=max_in_flight, retries=5,
+                                         checkpoint=Checkpoint(checkpoint_path))
+        results.update(scheduler.run(misses))
+    print(f"Gemini result cache: {cache.summary()}")
+    return results
+
+
+def scheme_info_for(scheme, final_converted_data):
+    """Gemini's structured scheme, or just the scraped title and links when it is missing or garbled."""
+    scheme_info = {
+        "title": scheme["title"],
+        "pdfUrl": scheme["pdfUrl"],
+        "schemeUrl": scheme.get("schemeUrl", "N/A")  # Default to "N/A" if schemeUrl is missing
+    }
+    if final_converted_data is None or not isinstance(final_converted_data, dict):
+        return scheme_info
+    final_converted_data["schemeUrl"] = scheme.get("schemeUrl", "N/A")
+
+    title = final_converted_data.get("title")
+    if not title or title == "null" or '\\' in title:
+        return scheme_info
+    description = final_converted_data.get("description")
+    if not description or '\\' in description:
+        return scheme_info
+    # Check if any description in the 'criteria' contains '\\' or '\\u'
+    if any('\\' in criteria.get("description", "") for criteria in final_converted_data.get("criteria", [])):
+        return scheme_info
+    return final_converted_data
+
+
+def scheme_job_id(scheme, index):
+    return scheme.get("id") or f"#{index}"
+
+
+def process_schemes(state_pdf_text, output_file_path, extraction_service=None, max_in_flight=8):
+
+    schemes_to_process = [scheme for scheme in state_pdf_text or [] if scheme["pdfUrl"] is not None]
     # previous_state = load_previous_state(state_file)
 
     # new_schemes, updated_schemes = identify_changes(statePdfText, previous_state)
     # schemes_to_process = new_schemes + updated_schemes
 
-    final_results = []
-
-    for scheme in schemes_to_process:
-        if scheme["pdfUrl"] is not None:
-            extractedSchemeText = parse_document(scheme["pdfUrl"])
-        else:
-            # print("None pdf")
-            continue
+    # Extract every PDF up front on the worker pool.
+    extraction_service = extraction_service or PdfExtractionService()
+    pdf_urls = [scheme["pdfUrl"] for scheme in schemes_to_process if not is_word_document(scheme["pdfUrl"])]
+    extracted_texts, stats = extraction_service.extract_many(pdf_urls)
+    print(f"Extracted PDF text: {stats.summary()}")
 
+    jobs = {}
+    for index, scheme in enumerate(schemes_to_process):
+        extractedSchemeText = parse_document(scheme["pdfUrl"], extracted_texts)
         if extractedSchemeText:
-            result = process_with_api_key_rotation(extractedSchemeText, api_keys)
-
-            if result and result.candidates:
-                try:
-                    fc = result.candidates[0].content.parts[0].function_call
-                    final_data = json.dumps(type(fc).to_dict(fc), indent=4)
-                    convert_data = json.loads(final_data)
-                    final_converted_data = convert_data.get("args", {})
-                    final_converted_data = final_converted_data.get("scheme_details")
-
-                    if final_converted_data is None or not isinstance(final_converted_data, dict):
-                        # print(f"Invalid final_converted_data for scheme: {scheme['pdfUrl']}")
-                        scheme_info = {
-                            "title": scheme["title"],
-                            "pdfUrl": scheme["pdfUrl"],
-                            "schemeUrl": scheme.get("schemeUrl", "N/A")  # Default to "N/A" if schemeUrl is missing
-                        }
-                    else:
-                        final_converted_data["schemeUrl"] = scheme.get("schemeUrl", "N/A")
-
-                        if not final_converted_data.get("title") or final_converted_data.get("title") == "null" or '\\u' in final_converted_data.get("title", "") or '\\' in final_converted_data.get("title", ""):
-                            scheme_info = {
-                                "title": scheme["title"],
-                                "pdfUrl": scheme["pdfUrl"],
-                                "schemeUrl": scheme.get("schemeUrl", "N/A") 
-                            }
-                        elif not final_converted_data.get("description"):
-                            scheme_info = {
-                                "title": scheme["title"],
-                                "pdfUrl": scheme["pdfUrl"],
-                                "schemeUrl": scheme.get("schemeUrl", "N/A")
-                            }
-                        elif '\\' in final_converted_data.get("description", "") or '\\u' in final_converted_data.get("description", ""):
-                            scheme_info = {
-                                "title": scheme["title"],
-                                "pdfUrl": scheme["pdfUrl"],
-                                "schemeUrl": scheme.get("schemeUrl", "N/A")
-                            }
-                        else:
-                            # Check if any description in the 'criteria' contains '\\' or '\ut'
-                            criteria_descriptions = final_converted_data.get("criteria", [])
-                            for criteria in criteria_descriptions:
-                                if criteria.get("description", "").find("\\") != -1 or criteria.get("description", "").find("\\u") != -1:
-                                    # print(f"Invalid description in criteria for scheme: {scheme['pdfUrl']}")
-                                    scheme_info = {
-                                        "title": scheme["title"],
-                                        "pdfUrl": scheme["pdfUrl"],
-                                        "schemeUrl": scheme.get("schemeUrl", "N/A")
-                                    }
-                                    break
-                            else:
-                                # Otherwise, append the final converted data
-                                scheme_info = final_converted_data
-                    
-                    with open(output_file, 'a', encoding='utf-8') as f:
-                        if os.stat(output_file).st_size == 0:
-                            f.write("[\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                        else:
-                            # f.seek(f.tell() - 1, os.SEEK_SET)  
-                            f.write(",\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                            
-                        
-                    # print(f"Processed and appended scheme: {scheme['pdfUrl']}")
-                except IndexError as e:
-                    # print(f"Error processing the result for {scheme['pdfUrl']}: {e}")
-                    scheme_info = {
-                            "title": scheme["title"],
-                            "pdfUrl": scheme["pdfUrl"],
-                            "schemeUrl": scheme.get("schemeUrl", "N/A")
-                        }
-                    with open(output_file, 'a', encoding='utf-8') as f:
-                        if os.stat(output_file).st_size == 0:
-                            f.write("[\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                        else:
-                            # f.seek(f.tell() - 1, os.SEEK_SET)  
-                            f.write(",\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-            else:
-                # print(f"Failed to process the scheme: {scheme['pdfUrl']}")
-                scheme_info = {
-                            "title": scheme["title"],
-                            "pdfUrl": scheme["pdfUrl"],
-                            "schemeUrl": scheme.get("schemeUrl", "N/A")
-                        }
-                with open(output_file, 'a', encoding='utf-8') as f:
-                        if os.stat(output_file).st_size == 0:
-                            f.write("[\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                        else:
-                            # f.seek(f.tell() - 1, os.SEEK_SET)  
-                            f.write(",\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-        else:
-            # print(f"Failed to extract text from the document: {scheme['pdfUrl']}")
-            scheme_info = {
-                            "title": scheme["title"],
-                            "pdfUrl": scheme["pdfUrl"],
-                            "schemeUrl": scheme.get("schemeUrl", "N/A")
-                        }
-            with open(output_file, 'a', encoding='utf-8') as f:
-                        if os.stat(output_file).st_size == 0:
-                            f.write("[\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                        else:
-                            # f.seek(f.tell() - 1, os.SEEK_SET)  
-                            f.write(",\n")
-                            json.dump(scheme_info, f, indent=4, ensure_ascii=False)
-                            
-    with open(output_file, 'a') as f:
-        f.write("\n]")
+            jobs[scheme_job_id(scheme, index)] = extractedSchemeText
+
+    os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+    checkpoint_path = f"{output_file_path}.checkpoint.jsonl"
+    structured = structure_documents(jobs, checkpoint_path, max_in_flight)
+    final_results = [scheme_info_for(scheme, structured.get(scheme_job_id(scheme, index)))
+                     for index, scheme in enumerate(schemes_to_process)]
+
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        json.dump(final_results, f, indent=4, ensure_ascii=False)
+    Checkpoint(checkpoint_path).remove()
     # current_state = {scheme["id"]: calculate_hash(scheme) for scheme in statePdfText}
     # save_current_state(state_file, current_state)
 
@@ -282,8 +248,17 @@ pdfStates = [
 ]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+    parser.add_argument('--max-pages', type=int, default=50, help='Pages read from each PDF')
+    parser.add_argument('--max-mb', type=int, default=25, help='Largest PDF downloaded, in MB')
+    parser.add_argument('--in-flight', type=int, default=8, help='Gemini requests in flight at once')
+    args = parser.parse_args()
+
+    extraction_service = PdfExtractionService(max_workers=args.workers, max_pages=args.max_pages,
+                                              max_bytes=args.max_mb * 1024 * 1024)
     for state_name in pdfStates:
         output_file_path = os.path.join(os.path.dirname(__file__),'..', '..', 'structuredData', f'{state_name}_structured_results.json')
         statePdfData = process_pdfs_for_state(state_name)
-        process_schemes(statePdfData, output_file_path)
+        process_schemes(statePdfData, output_file_path, extraction_service, args.in_flight)
 
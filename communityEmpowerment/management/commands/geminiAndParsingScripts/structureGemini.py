@@ -1,13 +1,26 @@
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
 import os
 import textwrap
 import json
 
-# BELOW FUNCTION IS FOR GETTING STRUCTURED JSON FORMAT FROM PDF EXTRACTED TEXT
+MODEL_NAME = 'models/gemini-1.5-pro-latest'
+# Bump whenever the prompt or the scheme schema below changes, so cached results are not reused.
+PROMPT_VERSION = 1
+
+
+def gemini_client(api_key: str):
+    """
+    A Gemini client bound to `api_key`. genai.configure() sets one key for
+    the whole process, which concurrent requests on different keys would
+    overwrite under each other, so every key gets a client of its own.
+    """
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key})
 
-def process_and_structure_document(document_extracted_text: str, api_key: str):
 
-    genai.configure(api_key=api_key)
+# BELOW FUNCTION IS FOR GETTING STRUCTURED JSON FORMAT FROM PDF EXTRACTED TEXT
+
+def process_and_structure_document(document_extracted_text: str, client):
 
     beneficiary = genai.protos.Schema(
         type=genai.protos.Type.OBJECT,
@@ -94,24 +107,28 @@ def process_and_structure_document(document_extracted_text: str, api_key: str):
         )
     )
 
-    model = genai.GenerativeModel(
-        model_name='models/gemini-1.5-pro-latest',
-        tools=[add_to_database]
-    )
-
-
     # absolute_file_path = os.path.abspath(document_extracted_text)
     # print("Absolute file path:", absolute_file_path)
     
     # with open(absolute_file_path, "r") as file:
     #     goaPdfText = json.load(file)
 
-    # Generate the content and call the API function
-    result = model.generate_content(f"""
+    prompt = f"""
     Please add the following information from the extracted document text into the structured database:
 
     {document_extracted_text}
-    """, tool_config={'function_calling_config': 'ANY'}, request_options={"timeout": 1000})
+    """
+    # Generate the content and call the API function, on the caller's key
+    # (see gemini_client) rather than a global one.
+    request = glm.GenerateContentRequest(
+        model=MODEL_NAME,
+        contents=[glm.Content(role='user', parts=[glm.Part(text=prompt)])],
+        tools=[glm.Tool(function_declarations=[add_to_database])],
+        tool_config=glm.ToolConfig(
+            function_calling_config=glm.FunctionCallingConfig(mode=glm.FunctionCallingConfig.Mode.ANY)
+        ),
+    )
+    result = client.generate_content(request=request, timeout=1000)
 
     return result
 
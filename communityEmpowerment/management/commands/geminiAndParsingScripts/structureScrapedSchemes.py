@@ -1,6 +1,7 @@
 import os
 import json
-from pdfParser import process_with_api_key_rotation
+from pdfParser import scheme_job_id, structure_documents
+from communityEmpowerment.utils.llm_scheduler import Checkpoint
 
 api_keys = [
     os.getenv("API_KEY_1"),
@@ -19,27 +20,25 @@ def structure_schemes(input_file_path, output_file_path):
     if not os.path.exists(output_file_path):
         with open(output_file_path, 'w', encoding="utf-8") as f:
             json.dump([], f, ensure_ascii=False, indent=4)
-    for schemes in schemeData:
-        result = process_with_api_key_rotation(schemes, api_keys)
-        if result and result.candidates:
-                try:
-                    fc = result.candidates[0].content.parts[0].function_call
-                    final_data = json.dumps(type(fc).to_dict(fc), indent=4)
-                    convert_data = json.loads(final_data)
-                    final_converted_data = convert_data.get("args", {})
-                    final_converted_data = final_converted_data.get("scheme_details")
-                    if final_converted_data:
-                        final_converted_data["id"] = schemes.get("id")
-                        print("ye data", final_converted_data)
-                        with open(output_file_path, 'r+', encoding="utf-8") as f:
-                            existing_data = json.load(f)  # Load existing data
-                            existing_data.append(final_converted_data)  # Append new data
-                            f.seek(0)  # Reset file pointer to the start
-                            json.dump(existing_data, f, ensure_ascii=False, indent=4)  # Write updated data
-                            f.truncate()
 
-                except Exception as e:
-                     print("yaha aya thaaaa: ",e)
+    checkpoint_path = f"{output_file_path}.checkpoint.jsonl"
+    jobs = {scheme_job_id(schemes, index): schemes for index, schemes in enumerate(schemeData)}
+    structured = structure_documents(jobs, checkpoint_path)
+
+    new_data = []
+    for index, schemes in enumerate(schemeData):
+        final_converted_data = structured.get(scheme_job_id(schemes, index))
+        if final_converted_data:
+            final_converted_data["id"] = schemes.get("id")
+            new_data.append(final_converted_data)
+
+    with open(output_file_path, 'r+', encoding="utf-8") as f:
+        existing_data = json.load(f)  # Load existing data
+        existing_data.extend(new_data)  # Append new data
+        f.seek(0)  # Reset file pointer to the start
+        json.dump(existing_data, f, ensure_ascii=False, indent=4)  # Write updated data
+        f.truncate()
+    Checkpoint(checkpoint_path).remove()
 
 states_and_ut = [
     "punjab",
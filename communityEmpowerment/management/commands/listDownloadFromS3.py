@@ -1,44 +1,86 @@
 import boto3
 import io
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from pdfminer.high_level import extract_text
 import json
 from django.conf import settings
 import urllib.parse
 
-# AWS S3 Configuration
+logger = logging.getLogger(__name__)
+
+HEAD_WORKERS = 16
+
+# AWS S3 Configuration; the connection pool is sized for concurrent HEAD calls.
 s3 = boto3.client('s3', 
                   aws_access_key_id= settings.AWS_ACCESS_KEY_ID, 
                   aws_secret_access_key= settings.AWS_SECRET_ACCESS_KEY, 
-                  region_name= settings.AWS_S3_REGION_NAME)
+                  region_name= settings.AWS_S3_REGION_NAME,
+                  config=Config(max_pool_connections=HEAD_WORKERS))
 
 BUCKET_NAME = settings.AWS_STORAGE_BUCKET_NAME
 
-def list_pdfs_in_directory(state_name):
+MANIFEST_DIR = os.path.join(os.path.dirname(__file__), '..', 'scrapedData', 's3_manifest')
+
+
+def load_manifest(manifest_path):
+    """{s3 key: {'etag': ..., 'metadata': {...}}} from the last listing, or {}."""
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest_path, manifest):
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def list_pdfs_in_directory(state_name, client=None, bucket=None, manifest_path=None):
+    """
+    List every PDF under pdfs/<state_name>/ (all pages, not just the first
+    1000 keys) with its metadata. Metadata is cached in a local manifest keyed
+    by S3 key and ETag, so only new or changed objects are HEADed, concurrently.
+    """
+    client = client or s3
+    bucket = bucket or BUCKET_NAME
+    manifest_path = manifest_path or os.path.join(MANIFEST_DIR, f"{state_name}.json")
     try:
-        response = s3.list_objects_v2(Bucket=BUCKET_NAME, Prefix=f"pdfs/{state_name}/")
-        
-        pdf_files = []
-        
-        if 'Contents' in response:
-            for obj in response['Contents']:
-                metadata_response = s3.head_object(Bucket=BUCKET_NAME, Key=obj['Key'])
-                
-                metadata = metadata_response.get('Metadata', {})
-                pdf_key = obj['Key']
-                pdf_url = f'https://{BUCKET_NAME}.s3.amazonaws.com/{pdf_key}'
-
-                pdf_files.append({
-                    'pdf_key': obj['Key'],   # S3 key (path)
-                    'pdfUrl': pdf_url,
-                    'last_modified': obj['LastModified'],  # Last modified date
-                    'size': obj['Size'],  # File size
-                    'metadata': metadata  # Metadata dictionary
-                })
-        
-        return pdf_files
+        manifest = load_manifest(manifest_path)
+        objects = []
+        for page in client.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=f"pdfs/{state_name}/"):
+            objects.extend(page.get('Contents', []))
+
+        stale = [obj for obj in objects if manifest.get(obj['Key'], {}).get('etag') != obj['ETag']]
+
+        def head(obj):
+            return obj, client.head_object(Bucket=bucket, Key=obj['Key']).get('Metadata', {})
+
+        with ThreadPoolExecutor(max_workers=HEAD_WORKERS) as pool:
+            for obj, metadata in pool.map(head, stale):
+                manifest[obj['Key']] = {'etag': obj['ETag'], 'metadata': metadata}
+
+        listed = {obj['Key'] for obj in objects}
+        manifest = {key: entry for key, entry in manifest.items() if key in listed}
+        save_manifest(manifest_path, manifest)
+        logger.info(f"Listed {len(objects)} PDFs for {state_name}, fetched metadata for {len(stale)}")
+
+        return [{
+            'pdf_key': obj['Key'],   # S3 key (path)
+            'pdfUrl': f'https://{bucket}.s3.amazonaws.com/{obj["Key"]}',
+            'last_modified': obj['LastModified'],  # Last modified date
+            'size': obj['Size'],  # File size
+            'metadata': manifest[obj['Key']]['metadata']  # Metadata dictionary
+        } for obj in objects]
     
     except Exception as e:
-        # print(f"Error listing PDFs from S3: {e}")
+        logger.error(f"Error listing PDFs from S3 for {state_name}: {e}")
         return []
 
 def download_pdf_from_s3(pdf_key):
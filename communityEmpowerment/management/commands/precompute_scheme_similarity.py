@@ -1,45 +1,24 @@
 from django.core.management.base import BaseCommand
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from communityEmpowerment.models import Scheme
-import pickle
-import re
-def clean_text(text):
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text) 
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+from communityEmpowerment.utils.similarity import DEFAULT_TOP_K, build_similarity_store, get_store_dir
+
 class Command(BaseCommand):
     help = 'Precompute scheme similarity'
-    
 
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                            help='Number of neighbours stored per scheme')
 
     def handle(self, *args, **kwargs):
-        schemes = Scheme.objects.all()
-
-        scheme_data = []
-        for scheme in schemes:
-            tags = " ".join([(" ".join([tag.name] * int(tag.weight))) for tag in scheme.tags.all()])
-            description = scheme.description if scheme.description else ""
-            combined = " ".join([
-                scheme.title,
-                scheme.funding_pattern or "",
-                scheme.description or "",
-                " ".join(tag.name for tag in scheme.tags.all()),
-                " ".join(b.beneficiary_type for b in scheme.beneficiaries.all()),
-                " ".join(s.sponsor_type for s in scheme.sponsors.all()),
-                scheme.department.department_name or "",
-            ])
-
-            scheme_data.append(clean_text(combined))
-
-
-        vectorizer = TfidfVectorizer(stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform(scheme_data)
-
-        cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
-
-        with open('cosine_sim_matrix.pkl', 'wb') as f:
-            pickle.dump(cosine_sim, f)
-
-        self.stdout.write(self.style.SUCCESS('Successfully precomputed and saved similarity matrix!'))
+        schemes = Scheme.objects.select_related('department').prefetch_related(
+            'tags', 'beneficiaries', 'sponsors'
+        ).order_by('id')
+
+        count = build_similarity_store(schemes, k=kwargs['top_k'])
+        if not count:
+            self.stdout.write(self.style.WARNING('No schemes found, similarity store not written.'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully precomputed top-{kwargs["top_k"]} neighbours for {count} schemes in {get_store_dir()}!'
+        ))
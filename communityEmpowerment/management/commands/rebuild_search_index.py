@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from communityEmpowerment.models import Scheme
+from communityEmpowerment.utils.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search vectors for all schemes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options['batch_size']
+        scheme_ids = list(Scheme.objects.order_by('id').values_list('id', flat=True))
+
+        updated = 0
+        for start in range(0, len(scheme_ids), batch_size):
+            updated += backend.update(scheme_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt search index for {updated} schemes!'))
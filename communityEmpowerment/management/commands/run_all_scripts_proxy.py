@@ -1,16 +1,40 @@
 # communityEmpowerment/management/commands/run_all_scripts_proxy.py
 import subprocess
 import os
+import sys
 from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
     help = 'Proxy command to run runAllScripts from Scrapers directory'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Scripts run at the same time')
+        parser.add_argument('--scraper-timeout', type=int, default=900, help='Seconds before a scraper is killed')
+        parser.add_argument('--stage-timeout', type=int, default=None,
+                            help='Seconds before a later stage is killed (default: no limit)')
+        parser.add_argument('--retries', type=int, default=1, help='Retries for a failed or timed out scraper')
+        parser.add_argument('--retry-delay', type=int, default=30, help='Base seconds between retries')
+        parser.add_argument('--report', help='Write per-step status and timing to this JSON file')
+
     def handle(self, *args, **kwargs):
         script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'Scrapers/runAllScripts.py'))
+        command = [
+            sys.executable, script_path,
+            '--workers', str(kwargs['workers']),
+            '--scraper-timeout', str(kwargs['scraper_timeout']),
+            '--retries', str(kwargs['retries']),
+            '--retry-delay', str(kwargs['retry_delay']),
+        ]
+        if kwargs['stage_timeout'] is not None:
+            command += ['--stage-timeout', str(kwargs['stage_timeout'])]
+        if kwargs['report']:
+            command += ['--report', kwargs['report']]
         try:
-            result = subprocess.run(['python', script_path], check=True, capture_output=True, text=True)
+            result = subprocess.run(command, check=True, capture_output=True, text=True)
             self.stdout.write(f"Output of runAllScripts.py:\n{result.stdout}")
         except subprocess.CalledProcessError as e:
+            # Individual state failures are isolated; this is raised once the
+            # whole run has finished, with the per-step summary in stdout.
+            self.stdout.write(f"Output of runAllScripts.py:\n{e.stdout}")
             self.stderr.write(f"Error running runAllScripts.py:\n{e.stderr}")
             raise
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from communityEmpowerment.utils.collaborative import (
+    DEFAULT_COMPONENTS, get_model_dir, reset_new_interactions, train_collaborative_model,
+)
+
+class Command(BaseCommand):
+    help = 'Train the collaborative-filtering model from user interactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--components', type=int, default=DEFAULT_COMPONENTS,
+                            help='Number of latent factors')
+
+    def handle(self, *args, **kwargs):
+        # Interactions recorded while training count towards the next run.
+        reset_new_interactions()
+        result = train_collaborative_model(n_components=kwargs['components'])
+        if result is None:
+            self.stdout.write(self.style.WARNING('Not enough interactions to train, model not written.'))
+            return
+
+        users, schemes = result
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully trained collaborative model for {users} users and {schemes} schemes in {get_model_dir()}!'
+        ))
@@ -4,108 +4,133 @@ import json
 from django.core.cache import cache
 from django.utils.deprecation import MiddlewareMixin
 from django.http import HttpResponse
-from redis.exceptions import RedisError
-from django_redis import get_redis_connection  # Ensure django-redis is installed
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from communityEmpowerment.utils.cache_fill import get_or_fill
+from communityEmpowerment.utils.cache_versions import SCHEME_NAMESPACES, bump, get_versions
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# List of cacheable endpoints - only include read-only, non-user-specific endpoints
-CACHEABLE_ENDPOINTS = [
-    "schemes/multi-state-departments",
-    "departments/",
-    "organisations/",
-    "schemes/",
-    "schemes/scholarship/",
-    "schemes/job/",
-    "criteria/",
-    "procedures/",
-    "documents/",
-    "scheme-documents/",
-    "sponsors/",
-    "scheme-sponsors/",
-    "choices/gender/",
-    "choices/state/",
-    "choices/category/"
-]
+# Cacheable endpoints - only include read-only, non-user-specific endpoints - and
+# the cache namespaces (see utils/cache_versions.py) their responses are built from.
+# The longest matching prefix wins.
+CACHEABLE_ENDPOINTS = {
+    "schemes/multi-state-departments": SCHEME_NAMESPACES,
+    "departments/": SCHEME_NAMESPACES,
+    "organisations/": ('organisations',),
+    "schemes/": SCHEME_NAMESPACES,
+    "schemes/scholarship/": SCHEME_NAMESPACES,
+    "schemes/job/": SCHEME_NAMESPACES,
+    "criteria/": ('criteria',),
+    "procedures/": ('procedures',),
+    "documents/": ('documents',),
+    "scheme-documents/": ('schemes', 'documents'),
+    "sponsors/": ('sponsors',),
+    "scheme-sponsors/": ('schemes', 'sponsors'),
+    "choices/gender/": (),
+    "choices/state/": (),
+    "choices/category/": (),
+}
 
 CACHE_TIMEOUT = 60 * 15  # 15 minutes
+# Response headers kept with the cached body.
+STORED_HEADERS = ("ETag", "Last-Modified", "Cache-Control")
 # Define a common hash tag for all cache keys. This ensures they fall into the same Redis cluster slot.
 COMMON_HASH_TAG = "{simplecache}"
 
 class CacheMiddleware(MiddlewareMixin):
-    def get_cache_key(self, request):
-        """Generate a unique cache key based on request path and query params."""
+    # The cache and its fill locks are synchronous (see utils/cache_fill.py).
+    async_capable = False
+
+    def get_cache_key(self, request, versions=None):
+        """
+        Generate a unique cache key based on request path, query params and
+        the current generation of every namespace the endpoint depends on.
+        """
         base_key = f"{request.path}?{request.META.get('QUERY_STRING', '')}"
+        if versions:
+            base_key += "|" + ",".join(f"{namespace}:{version}" for namespace, version in sorted(versions.items()))
         hashed_key = hashlib.md5(base_key.encode()).hexdigest()
         return f"cache:{COMMON_HASH_TAG}_{hashed_key}"
 
+    def get_endpoint_namespaces(self, request):
+        """Namespaces of the cacheable endpoint `request` is for, or None if it is not cacheable."""
+        matches = [endpoint for endpoint in CACHEABLE_ENDPOINTS if request.path.startswith(f"/api/{endpoint}")]
+        if not matches:
+            return None
+        return CACHEABLE_ENDPOINTS[max(matches, key=len)]
+
     def is_cacheable_endpoint(self, request):
         """Check if the request should be cached based on its URL."""
-        return any(request.path.startswith(f"/api/{endpoint}") for endpoint in CACHEABLE_ENDPOINTS)
+        return self.get_endpoint_namespaces(request) is not None
+
+    def __call__(self, request):
+        """
+        Serve cacheable GETs from the cache. Misses are filled through
+        get_or_fill, so when a popular response expires or its namespaces are
+        bumped, one request renders it while the rest get the stale copy or
+        wait for the fresh one instead of all hitting the database.
+        """
+        if request.method != "GET":
+            return self.get_response(request)
+        namespaces = self.get_endpoint_namespaces(request)
+        if namespaces is None:
+            return self.get_response(request)
 
-    def process_request(self, request):
-        """Return cached response if available."""
-        if request.method != "GET" or not self.is_cacheable_endpoint(request):
-            return None
-        
         try:
-            cache_key = self.get_cache_key(request)
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.debug(f"Cache hit for {request.path}")
-                cached_response = json.loads(cached_data)
-                return HttpResponse(
-                    cached_response["content"],
-                    status=cached_response["status"],
-                    content_type=cached_response["content_type"]
-                )
-            logger.debug(f"Cache miss for {request.path}")
+            # Versions are read once, before the view runs: if a write bumps
+            # them meanwhile, this response is stored under the old key.
+            cache_key = self.get_cache_key(request, get_versions(namespaces))
         except Exception as e:
-            logger.error(f"Cache error in process_request: {str(e)}")
-        return None
-
-    def process_response(self, request, response):
+            logger.error(f"Cache error reading versions: {str(e)}")
+            return self.get_response(request)
 
-        """Cache successful GET responses."""
-        if request.method != "GET" or response.status_code != 200 or not self.is_cacheable_endpoint(request):
-            return response
+        rendered = []
 
-        """ Invalidate cache on data modification """
-        if request.method in ["POST", "PUT", "DELETE"]:
-            self.invalidate_cache()
-
-        try:
-            cache_key = self.get_cache_key(request)
+        def render():
+            logger.debug(f"Cache miss for {request.path}")
+            response = self.get_response(request)
+            rendered.append(response)
             # Store necessary response parts in JSON format
-            cached_data = {
-                "content": response.content.decode(),
+            return json.dumps({
+                "content": response.content.decode() if response.status_code == 200 else "",
                 "status": response.status_code,
                 "content_type": response.get("Content-Type", "text/html"),
-            }
-            cache.set(cache_key, json.dumps(cached_data), timeout=CACHE_TIMEOUT)
-            logger.debug(f"Cached response for {request.path}")
-        except Exception as e:
-            logger.error(f"Cache error in process_response: {str(e)}")
+                "headers": {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+            })
 
-        return response
-
-    def invalidate_cache(self, path_pattern):
-        """Invalidate cache for a specific API pattern using Redis SCAN."""
         try:
-            redis_client = get_redis_connection("default")
-            cursor = 0
-            match_pattern = f"cache:{COMMON_HASH_TAG}_{hashlib.md5(path_pattern.encode()).hexdigest()}*"
+            cached_data = get_or_fill(
+                cache_key, render, CACHE_TIMEOUT,
+                cacheable=lambda data: json.loads(data)["status"] == 200,
+            )
+        except Exception as e:
+            logger.error(f"Cache error filling {request.path}: {str(e)}")
+            return rendered[0] if rendered else self.get_response(request)
 
-            while True:
-                cursor, keys = redis_client.scan(cursor=cursor, match=match_pattern)
-                if keys:
-                    redis_client.delete(*keys)
-                    logger.debug(f"Invalidated {len(keys)} cache keys for pattern: {path_pattern}")
-                if cursor == 0:
-                    break
+        if rendered:
+            return rendered[0]
+        logger.debug(f"Cache hit for {request.path}")
+        cached_response = json.loads(cached_data)
+        response = HttpResponse(
+            cached_response["content"],
+            status=cached_response["status"],
+            content_type=cached_response["content_type"]
+        )
+        for header, value in cached_response.get("headers", {}).items():
+            response[header] = value
+        # Answer revalidations from the stored validators, as the view would (see utils/conditional_get.py).
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=parse_http_date_safe(response.get("Last-Modified")),
+            response=response,
+        )
 
-        except RedisError as e:
-            logger.error(f"Redis error while invalidating cache: {e}")
-        except Exception as e:
-            logger.error(f"Error in invalidate_cache: {e}")
+    def invalidate_cache(self, *namespaces):
+        """
+        Invalidate every cached response built from `namespaces` by starting
+        new generations; model signals already do this on every write.
+        """
+        bump(*namespaces)
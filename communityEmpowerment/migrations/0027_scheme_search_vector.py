@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-18 10:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communityEmpowerment', '0026_alter_faq_options_faq_order_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheme',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='scheme',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='scheme_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communityEmpowerment', '0027_scheme_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheme',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def backfill_search_vector(apps, schema_editor):
+    # Only the Postgres backend reads Scheme.search_vector.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from communityEmpowerment.utils.search import PostgresSearchBackend
+    Scheme = apps.get_model('communityEmpowerment', 'Scheme')
+    Scheme.objects.using(schema_editor.connection.alias).update(
+        search_vector=PostgresSearchBackend().search_vector(Scheme)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communityEmpowerment', '0028_scheme_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,9 @@ from dirtyfields import DirtyFieldsMixin
 from orderable.models import Orderable
 from PIL import Image, UnidentifiedImageError
 from storages.backends.s3boto3 import S3Boto3Storage
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from communityEmpowerment.utils.tag_classifier import classify_tag
 
 class MediaStorage(S3Boto3Storage):
     bucket_name = settings.AWS_MEDIA_STORAGE_BUCKET_NAME
@@ -351,1205 +354,13 @@ class Tag(DirtyFieldsMixin, TimeStampedModel):
         verbose_name_plural = "Tags"
         ordering = ['name']
 
-    def match_keywords(self, text, keywords):
-        for kw in keywords:
-            kw = kw.lower()
-            if kw in ["sc", "st", "obc"]:
-                if re.search(rf'\b{re.escape(kw)}\b', text):
-                    return True
-            else:
-                if kw in text:
-                    return True
-        return False
+    def categorize(self):
+        """Set category from the first keyword group matching the tag name."""
+        self.category = classify_tag(self.name)
+        return self.category
 
     def save(self, *args, **kwargs):
-        # Existing categories from the example
-        scholarship_keywords = [
-            "scholarship", "fellowship", "grant", "stipend", "tuition support", "fee waiver", "educational aid",
-            "Bursary", "Compulsory Fee Reimbursement", "Fee Exemption", "Fee Reimbursement", "Merit-based",
-            "Merit-cum-Means", "Post Matric", "Post-Matric", "Pre Matric", "Pre-Matric", "Pre-matric",
-            "Prematric", "Tuition Fee", "Tuition Fees", "Means-cum-Merit", "Student Performance",
-            "Meritorious Students", "Financial Aid", "Monetary Incentive"
-        ]
-
-        job_keywords = [
-            "job", "employment", "recruitment", "vacancy", "career", "job fair", "placement", "hiring",
-            "Civil Service", "Journalism", "Journalist", "Journalists", "Advocates", "Legal practice"
-        ]
-
-        govt_job_keywords = [
-            "govt job", "government recruitment", "public sector", "sarkari naukri", "upsc", "ssc", "psu", "rrb",
-            "IAS", "IPS", "IRS", "Government Service", "MPPSC"
-        ]
-
-        private_job_keywords = [
-            "private job", "corporate hiring", "MNC recruitment", "industry placement"
-        ]
-
-        internship_keywords = [
-            "internship", "apprentice", "trainee", "training program", "summer training", "industrial training"
-        ]
-
-        skill_job_keywords = [
-            "freelance", "gig work", "self-employment", "contract job", "daily wage", "micro job",
-            "Carpentry", "Electrician", "Fitting", "Masonry", "Motor Mechanic", "Plumbing", "Tailoring",
-            "Turning", "Welding", "Craft", "Crafts", "Handicrafts", "Leather", "Embroidery"
-        ]
-
-        defense_job_keywords = [
-            "army recruitment", "navy job", "air force", "police hiring", "defense", "paramilitary", "bsf", "cisf",
-            "Military", "Ex-Servicemen", "Veterans"
-        ]
-
-        sc_keywords = [
-            "sc", "scheduled caste", "dalit", "safai karamchari", "manual scavenger",
-            "Scheduled Caste", "Adi Dravidar", "Charmakar", "Charmakar Community", "Valmiki Samaj",
-            "Navbouddha", "SCSP", "SCs", "SCs/STs", "Caste Discrimination", "Untouchability",
-            "Untouchability Eradication", "Prevention of Atrocities", "Prevention of Atrocities Act",
-            "Atrocities", "Atrocity", "Victims of Atrocities"
-        ]
-
-        st_keywords = [
-            "st", "scheduled tribe", "tribal", "vanvasi", "aadivasi",
-            "Scheduled Tribe", "STs", "SCs/STs", "Vimukta Jatis", "Nomadic Tribes", "DNT", "Indigenous Population"
-        ]
-
-        obc_keywords = [
-            "obc", "other backward class", "backward class", "bc", "most backward class",
-            "OBC", "VJNT", "Backward Students", "OEC"
-        ]
-
-        minority_keywords = [
-            "minority", "muslim", "christian", "sikh", "buddhist", "jain", "parsi", "zoroastrian",
-            "Minorities", "National Minorities", "Hindu", "Hinduism"
-        ]
-
-        financial_keywords = [
-            "loan", "subsidy", "financial assistance", "funding", "support", "pension", "microfinance", "credit",
-            "Financial Incentive", "Monetary Relief", "Cash Prize", "Cash", "Assistance", "Financial Inclusion",
-            "Financial Viability", "Financial boost", "Interest-Free", "Interest-free", "Margin Money",
-            "Contributory Scheme", "Debt Relief Scheme", "One Time Settlement", "Deposit Accounts",
-            "Share Capital", "Capital", "Institutional finance", "Incentive Scheme", "Incentives",
-            "Central Assistance", "Special Assistance", "Financial Aid", "Compensation", "Relief",
-            "Marriage Assistance", "Marriage Incentive", "Calf Incentive", "One-time Incentive",
-            "One-time payment", "Maintenance Allowance", "Allowance", "Arrears", "Tax Reimbursement",
-            "Stamp Duty", "50:50 Cost Sharing", "Budget allocation"
-        ]
-
-        women_keywords = [
-            "women", "female", "girl child", "mahila", "nari", "pregnant", "lactating", "mother", "widow",
-            "working women", "Adolescent Girls", "Adolescent girls", "Girls", "Daughters", "Housewives",
-            "Maternity", "Maternity Benefit", "Deserted", "Destitute", "IGNWPS", "Marriage",
-            "Inter-caste Marriage", "Intercaste Marriage", "Mass Marriage", "Collective Wedding",
-            "Empowerment", "Economic empowerment", "Kishori Balika", "Pregnant Women", "Safe Motherhood"
-        ]
-
-        agriculture_keywords = [
-            "farmer", "agriculture", "kisaan", "crop", "irrigation", "fertilizer", "soil", "farm",
-            "Agricultural Marketing", "Agro-based industries", "Dairy", "Dairy Development",
-            "Animal Husbandry", "Livestock", "Livestock Development", "Poultry", "Piggery", "Goatery",
-            "Fisheries", "Fish Feed", "Fish Market", "Cattle rearing", "Cattle herders", "Milk Production",
-            "Seed", "Seed Certification", "Seed Multiplication", "Seed Production", "Seed Testing",
-            "Seeds", "Paddy Seeds", "Minikit", "Bio Agents", "Bio Pesticides", "Pesticides",
-            "Plant Protection", "Plant Protection Equipment", "Planting Material", "Cultivation Methods",
-            "Green Fodder Cultivation", "Fodder Development", "Compost", "Biogas", "Biomass Briquetting",
-            "Organic Waste", "Kitchen Garden", "Land Development", "Land terracing", "Land Management",
-            "Ponds", "Water Management", "Irrigation", "PMKSY", "PM-KISAN", "Pradhan Mantri Kisan Samman Nidhi",
-            "Pradhan Mantri Fasal Bima Yojana", "PMFBY", "Paddy Reapers", "Power Tillers",
-            "Mechanization", "Cold Storage", "Market Access", "Market Information", "Marketing",
-            "Oilseeds", "Pulses", "Maize", "Rice", "Wheat", "Grafting", "Eri Silk", "Silk Reeling",
-            "Rubber cultivation", "Tea cultivation", "Farm", "Farmers", "Fertilizer", "Rhizobium",
-            "Iodized Salt Distribution", "Subsidized Salt", "Subsidized Food Grains", "Antyodaya Anna Yojana",
-            "Food Grains", "Procurement", "Public Distribution System", "PDS", "RKVY", "Recommended Package of Practices"
-        ]
-
-        senior_keywords = [
-            "senior citizen", "pension", "old age", "vridh", "elderly", "retirement", "superannuation",
-            "IGNOAPS", "Old Age"
-        ]
-
-        disability_keywords = [
-            "disability", "divyang", "handicapped", "pwd", "special needs", "differently abled", "blind",
-            "hearing impaired", "Disabled", "Disabled Persons", "Disabled Students", "Differently-abled",
-            "Cerebral Palsy", "Mentally Challenged", "Motorized Tricycle", "Assistive Devices",
-            "Viklangta Praman Patra", "Dwarf", "NHFDC", "Persons with Disabilities", "Physical Disability",
-            "Mental Disability", "Special Needs"
-        ]
-
-        business_keywords = [
-            "startup", "business", "entrepreneur", "MSME", "enterprise", "self-employment", "new venture",
-            "industrial unit", "Cottage Industries", "Cooperative Societies", "Handloom", "Handloom Weavers",
-            "Textile", "Textiles", "Textile Parks", "Industrial Estates", "Industries", "Industry",
-            "Manufacturing", "Manufacturing Industries", "Manufacturing Sector", "Agri-tech",
-            "Meditech", "Self Help Group", "Self Help Groups", "Self Reliance", "Self-Sufficiency",
-            "Self-reliance", "Micro", "Small", "Medium", "SIPCOT", "TANSidCO Industrial Estates",
-            "TIIC", "UYEGP", "NEF scheme", "NSKFDC", "Stand-Up India", "Market", "Economic Development",
-            "Economic Upliftment", "Economic growth", "Investment", "Financial Viability", "Industrial Workers"
-        ]
-
-        education_keywords = [
-            "education", "training", "10+2", "coaching", "school", "college", "university", "exam",
-            "online course", "learning", "Class 10", "Class 11", "Class 12", "Class 6 to 8", "Class 9",
-            "Classes 6 to 8", "10th Standard", "11th Standard", "12th Standard", "12th pass",
-            "Matriculation", "Higher Secondary", "Post Graduate", "Post-Matriculation", "Post-Matric Courses",
-            "Pre-Matric Courses", "Diploma", "Certificate", "Certificate Programme", "Certification",
-            "Professional Courses", "Technical Courses", "Short Term Courses", "Evening Courses",
-            "Correspondence Courses", "Polytechnic", "ITI", "NCVT", "Engineering", "Engineering Entrance",
-            "JEE", "GUJCET", "NEET", "Architecture", "PhD", "MPhil", "Study Abroad", "Foreign Study",
-            "Coaching", "Free Textbooks", "Text Books", "Book Bank", "Book Distribution", "Book-bank Facilities",
-            "Books", "Library", "Library Management", "Library Award Scheme", "Best Library Award",
-            "Reference Books", "Stationary", "Stationery", "Drawing", "Drawing Materials", "Calculators",
-            "Computer", "Laptop", "Bicycle Distribution", "Free Travel", "Hostel", "Hostel Facilities",
-            "Hostels", "Girls Hostel", "Boarding", "Residential Facilities", "Residential Facility",
-            "Merit", "Merit Awards", "Awards", "Awards and Recognition", "Competition", "Competitive Capacity",
-            "Cultural Talent Search", "Essay writing", "Handwriting", "Poem Writing", "Science Seminars",
-            "Study Tour", "Exposure Visit", "Sanskrit", "Hindi", "Konkani", "Konkani Language", "Marathi",
-            "Language Skill Program", "Sarva Shiksha Abhiyan", "RTE", "RTE Act", "Mid Day Meal", "MDM",
-            "POSHAN Abhiyaan", "Literacy", "Education", "Students", "Student", "Backward Students",
-            "AICTE", "NIFT", "IIM", "NLU", "Gujarat Vidhyapeeth", "Universities", "Academic Excellence",
-            "Concessions", "Admission", "Enrolment"
-        ]
-
-        health_keywords = [
-            "health", "insurance", "medical", "ayushman", "treatment", "hospital", "disease", "wellness",
-            "nutrition", "Anemia", "Cancer", "HIV/AIDS prevention", "Tuberculosis control", "TB",
-            "TB patients", "Rabies", "Rabies Control", "Free diagnosis", "Free service", "Mediclaim Scheme",
-            "Maternity", "Maternity Benefit", "Family Planning", "Sterilization", "IFA supplementation",
-            "Childcare", "Children", "ICDS", "Anganwadi Workers", "Anganwadi Helpers", "ASHA",
-            "AWC", "Day Care", "Daycare", "Crèche", "Vaccination", "Veterinary Services", "Health Services",
-            "Emergency Services", "Ambulance service", "Fire Fighting Services", "Fire Safety",
-            "Cleanliness", "Hygienic", "Sanitation", "Drinking Water", "Water & Sewage Management",
-            "Sewerage", "Solid and Liquid Waste Management", "Waste Management", "Kitchen Waste",
-            "Organic Waste", "Stray Dog Management", "Stray Dogs", "Nutrition", "Food", "Food Security",
-            "Mid Day Meal", "Akshaya Patra", "Breakfast", "Subsidized Food Grains", "Antyodaya Anna Yojana",
-            "Public Distribution System", "POSHAN Abhiyaan", "Health Awareness", "Awareness Campaign",
-            "Awareness Programmes", "Awareness Programs", "Health Camps", "Camps"
-        ]
-
-        housing_keywords = [
-            "housing", "home", "pradhan mantri awas", "rental", "urban housing", "slum", "shelter",
-            "infrastructure", "PMAY", "House Site", "Construction of New Houses", "Repairs of Existing Houses",
-            "Reconstruction of Existing Houses", "Building", "Building Construction", "Accommodation",
-            "Government Buildings", "Guest House", "Community Halls", "Conference Hall", "Dr.Ambedkar Bhavan",
-            "Ambedkar Bhavan", "Babu Jagjiban Ram Chatrabas Yojana", "Burial Ground", "Cremation Ground",
-            "Funeral Expenses", "Funeral Rites", "Basic amenities", "Civic Amenities", "Roads-Plan",
-            "Road Construction", "Road Connectivity", "Rural Roads", "PMGSY", "Drainage", "Sewerage",
-            "Electricity", "Power Supply", "Power Tariff", "Broadband", "BharatNet", "City Wi-Fi",
-            "CCTVs", "Public Works", "Land Purchase Assistance", "Land Ownership", "Residential certificates",
-            "Economically Weaker Sections", "EWS", "Low Income", "LIG", "BPL", "Below Poverty Line",
-            "BPL families", "Urban Areas", "Urban Development", "Infrastructure Development"
-        ]
-
-        youth_keywords = [
-            "skill development", "training", "youth", "vocational", "NSDC", "kaushal", "apprenticeship",
-            "capacity building", "Skill India", "Skill upgradation", "Skills Development", "SANKALP",
-            "Yuva Srujan Puraskar", "Youth", "Cultural Talent Search", "Competitive Capacity",
-            "Sports", "Games", "Creativity", "Cultural Activities", "Dance", "Drama", "Painting",
-            "Cultural Shows", "Exhibition", "Exhibitions", "Festival/Exhibition", "Cultural Exchange",
-            "Cultural Groups", "Cultural Institutions", "Talent Search", "Competitions", "Career Counseling",
-            "Counseling", "Training Programs"
-        ]
-
-        transportation_keywords = [
-            "transport", "transportation scheme", "road safety", "public transport", "metro", "bus service",
-            "railway", "auto rickshaw", "Kadamba Buses", "Free Travel", "Bicycle Distribution",
-            "Motorized Tricycle", "Electric Vehicles", "Road", "Road Construction", "Road Works",
-            "Road Connectivity", "Rural Roads", "PMGSY", "State Plan Road Works", "Border Management",
-            "Inter-State boundary", "Travel", "Tourism", "Pilgrimage", "Religious Tourism",
-            "Directorate of Civil Aviation", "Air Hostess", "Logistics", "Transport Services"
-        ]
-
-        environment_keywords = [
-            "environment", "climate change", "conservation", "pollution", "green energy", "eco-friendly",
-            "sustainability", "carbon footprint", "Afforestation", "Forestry", "Public Forest",
-            "Eco Tourism", "Green House Gas Emissions", "Green Investment", "Clean energy",
-            "Renewable Energy", "Renewable Energy sources", "Biogas", "Biomass Briquetting",
-            "Waste Management", "Solid and Liquid Waste Management", "Organic Waste", "Kitchen Waste",
-            "Waste to Wealth", "Wastelands", "Water Management", "Watershed", "Desilting", "Ponds",
-            "Ground Water Prospect Map", "Wildlife", "Wildlife damage", "Environmental Sustainability",
-            "Ecological Balance", "Forest Produce", "Minor Forest Produce", "Forest Crimes", "Forest Officer",
-            "Forest Department", "Wildlife Conservation", "Wild Animals", "National Park", "Tiger Foundation Society"
-        ]
-
-        digital_services_keywords = [
-            "digital", "e-governance", "online services", "internet connectivity", "technology",
-            "digital literacy", "digital payment", "smart city", "Aadhaar", "Aadhaar Based Attendance System",
-            "Biometrics", "Online Portal", "Online submission of Application for Mobile Tower and OFC",
-            "Electronic Service Delivery", "Digidhan Mission", "Common Service Centre (CSC)", "ICT",
-            "IT", "ITES", "IT initiatives", "IT/ITeS Investment Promotion", "NKN", "JharNet",
-            "SMS Gateway", "Video conferencing", "Geo Data base", "GIS", "WAMIS", "Digital Services",
-            "BharatNet", "City Wi-Fi", "e-District", "e-MULAKAT", "e-Nagarik", "e-Office", "e-Procurement",
-            "e-Service", "e-Service Platform", "eKalyan", "Payment Gateway", "UIDAI"
-        ]
-
-        social_welfare_keywords = [
-            "social welfare", "welfare", "poverty alleviation", "social security", "NGO", "community service",
-            "support program", "Social Development", "Social Inclusion", "Social Inequality", "Social Reform",
-            "Social Remedies", "Social Upliftment", "Social incentive", "Socio-economic Development",
-            "Poverty", "Poverty Line", "Poverty Upliftment", "Below Poverty Line", "BPL", "BPL families",
-            "Economically Weaker Sections", "Marginalized", "Marginalized Communities", "Destitute",
-            "Orphaned", "Care and Protection", "Family based care", "Foster Care", "Bonded Labour",
-            "Unorganized Sector", "Unskilled Manual Work", "Cleaning Occupations", "Cleaning Workers",
-            "Unclean Occupation", "Rehabilitation", "Relief and Rehabilitation", "NSAP", "National Social Assistance Programme",
-            "IGNDPS", "IGNOAPS", "IGNWPS", "NFBS", "Community Development", "Advisory Committees",
-            "Advisory Services", "Awareness", "Awareness Campaign", "Awareness Programmes", "Awareness Programs",
-            "Social Service", "Human Resource Development", "Human resource development", "Social Assistance",
-            "Special Component Plan", "Sub Plan", "TSP", "SCSP", "Social Capital", "Community Self-reliance",
-            "Vulnerable Communities", "Victim Compensation", "Witness Protection"
-        ]
-
-        rural_development_keywords = [
-            "rural development", "village", "panchayat", "rural infrastructure", "farmers' welfare",
-            "water supply", "sanitation", "road development", "Rural", "Rural Labourers", "Rural Roads",
-            "Rural Works Programme", "MGNREGA", "PMGSY", "Panchayat", "Panchayat Bhawan", "Local Area Development",
-            "Community Development", "Rural Electrification", "Drinking Water", "Basic amenities",
-            "Civic Amenities", "Drainage", "Sewerage", "Burial Ground", "Public Assets", "Land Development",
-            "Land Management", "Desilting", "Ponds", "Water Management", "Watershed", "Area Development",
-            "Village Development", "Gramin Vikas", "Sansad Adarsh Gram Yojana", "Rurban"
-        ]
-
-        urban_development_keywords = [
-            "urban development", "city planning", "infrastructure", "housing for all", "urban slums",
-            "urbanization", "smart cities", "metro development", "Urban", "Urban Areas", "City Wi-Fi",
-            "Smart City", "Civic Amenities", "Public Works", "Sewerage", "Drainage", "Road Construction",
-            "Urban Infrastructure", "Municipal Services"
-        ]
-
-        international_relations_keywords = [
-            "international aid", "foreign scholarships", "diaspora", "NRIs", "global initiatives",
-            "international collaboration", "International", "Overseas", "Foreign Study", "Study Abroad",
-            "Cultural Exchange"
-        ]
-
-        technology_innovation_keywords = [
-            "innovation", "tech innovation", "startups", "research and development", "artificial intelligence",
-            "robotics", "machine learning", "Technology", "IT", "ITES", "IT initiatives", "IT/ITeS Investment Promotion",
-            "STPI", "NSICTANSidCO Consortium", "Intellectual Property", "Modernisation", "Modernization",
-            "Mechanization", "Agri-tech", "Meditech", "Electronic Service Delivery", "Digital Services",
-            "Innovation", "Research", "ISO Certification"
-        ]
-
-        legal_keywords = [
-            "legal aid", "free legal consultation", "law", "legal assistance", "human rights", "constitution",
-            "rights", "justice", "Legal", "Special Courts", "Special Criminal Courts", "Judiciary",
-            "Prevention of Atrocities Act", "Atrocities", "Atrocity", "Victims of Atrocities",
-            "Witness Protection", "Legal Services", "Advocates", "Legal practice", "Regulation",
-            "Policy", "Consumer Protection", "Consumer Rights"
-        ]
-
-        food_security_keywords = [
-            "food security", "ration", "food assistance", "mid-day meal", "food subsidy", "PDS",
-            "nutrition scheme", "food distribution", "Antyodaya Anna Yojana", "Subsidized Food Grains",
-            "Subsidized Salt", "Public Distribution System", "Mid Day Meal", "Akshaya Patra",
-            "Breakfast", "POSHAN Abhiyaan", "Food Grains", "Iodized Salt Distribution", "Food",
-            "Nutrition", "Food Security"
-        ]
-
-        disaster_management_keywords = [
-            "disaster relief", "disaster management", "flood relief", "earthquake aid", "cyclone relief",
-            "drought relief", "natural calamities", "Disaster Mitigation", "Relief", "Relief and Rehabilitation",
-            "Accident", "Injury", "Death Benefit", "Compensation", "Contingency scheme", "Emergency Services",
-            "Fire Fighting Services", "Fire Safety", "Ambulance service", "Calamity Relief"
-        ]
-
-        climate_action_keywords = [
-            "climate action", "carbon emissions", "global warming", "environmental protection",
-            "green initiatives", "climate adaptation", "Green House Gas Emissions", "Green Investment",
-            "Clean energy", "Renewable Energy", "Renewable Energy sources", "Afforestation", "Forestry",
-            "Eco Tourism", "Waste Management", "Solid and Liquid Waste Management", "Waste to Wealth",
-            "Environmental Sustainability", "Ecological Balance"
-        ]
-
-        gender_equality_keywords = [
-            "gender equality", "equal pay", "women empowerment", "gender-based violence", "LGBTQ+",
-            "diversity", "gender parity", "Women", "Female", "Girl child", "Mahila", "Nari", "Empowerment",
-            "Economic empowerment", "Third Gender Community", "Eunuchs", "Social Inclusion",
-            "Inter-caste Marriage", "Intercaste Marriage", "Equality"
-        ]
-
-        child_welfare_keywords = [
-            "child welfare", "child protection", "child rights", "child labor", "nutrition for children",
-            "angawadi", "child development", "Childcare", "Children", "Children's Festival", "ICDS",
-            "Anganwadi Workers", "Anganwadi Helpers", "ASHA", "AWC", "Day Care", "Daycare", "Crèche",
-            "POSHAN Abhiyaan", "Mid Day Meal", "Akshaya Patra", "Breakfast", "Care and Protection",
-            "Family based care", "Foster Care", "Orphaned", "Child Development", "Nutrition for Children",
-            "Child Rights", "Child Protection"
-        ]
-
-        consumer_protection_keywords = [
-            "consumer rights", "consumer protection", "consumer complaints", "consumer helpline",
-            "fraud prevention", "product safety", "Consumer Protection", "Consumer Rights", "Commercial taxes",
-            "VAT", "Quality Control", "Quality Improvement"
-        ]
-
-        cultural_preservation_keywords = [
-            "culture", "cultural heritage", "art", "music", "literature", "folklore", "museum", "archaeology",
-            "traditional arts", "Cultural Activities", "Cultural Award", "State Cultural Award",
-            "Cultural Exchange", "Cultural Groups", "Cultural Institutions", "Cultural Shows",
-            "Cultural Talent Search", "Dance", "Drama", "Painting", "Handicrafts", "Traditional Products",
-            "Traditional crafts", "Ethnic Foods", "Festivals", "Festival", "Annual Mela", "Annual Event",
-            "Annual event", "One-day event", "Three-day event", "Exhibition", "Exhibitions",
-            "Festival/Exhibition", "Folk Festival", "Religious Event", "Hindu", "Hinduism", "Sufi",
-            "Christmas", "Anant Chaturdashi", "Ganesh Chaturthi", "Navratri", "Sharad Navratri",
-            "Chaitra", "Ramnavmi", "Krishna Janmashtami", "Shivratri", "Maha Shivratri", "Religious Tourism",
-            "Pilgrimage", "Teerth", "Temple", "Historical Place", "Chamunda Mata temple",
-            "Mahakaleshwar temple", "Omkareshwar", "Jyotirlinga", "Chandraprabhu", "Khandwa", "Narwar",
-            "Sonagiri", "Datia", "Nijampur", "Pitampara Peeth", "Harsiddhi temple", "Hanuman Dhara",
-            "Sati Anusuiya Ashram", "Jatashankar Dham", "Gupta Godavari", "Caves", "Kamdagiri Parikrama",
-            "Kanha", "Chitrakut", "Urs Mela", "Rang Panchmi", "Basant Panchmi Mela", "Deepawali Mela",
-            "Navratri Mela", "Rahas Mela", "Makar Sankranti", "Magh Shukla Purnima", "Bhagwan Shankar",
-            "Bhagwan ’Shiv ka vishal mandir", "Shani Dev", "Shiva", "Mahakal", "Cultural Preservation"
-        ]
-
-        research_and_development_keywords = [
-            "R&D", "scientific research", "innovation", "technology", "patents", "research funding",
-            "academic research", "university grants", "Research", "Evaluation", "Data Collection",
-            "Survey", "Census", "Monitoring", "Jharkhand Space Application Center (JSAC)", "Geo Data base",
-            "GIS", "WAMIS", "Ground Water Prospect Map", "Intellectual Property", "Innovation",
-            "Modernisation", "Modernization", "Scientific Research"
-        ]
-
-        # New categories for additional keywords
-        tourism_keywords = [
-            "tourism", "religious tourism", "pilgrimage", "eco tourism", "travel", "tour operator",
-            "teerth", "tirth yatra", "tirth sthal", "tirth sthan", "historical place", "temple",
-            "chamunda mata temple", "mahakaleshwar mandir", "omkareshwar", "jyotirlinga", "chandraprabhu",
-            "khandwa", "narwar", "sonagiri", "datia", "nijampur", "pitambara peeth", "harsiddhi mandir",
-            "hanuman dhara", "sati anusuiya ashram", "jatashankar dham", "gupta godavari", "caves",
-            "kamdagiri parikrama", "kanha", "chitrakut", "tourism promotion", "tourist destination"
-        ]
-
-        festival_keywords = [
-            "festival", "mela", "annual mela", "annual event", "one-day event", "three-day event",
-            "urs mela", "rang panchmi", "basant panchmi mela", "deepawali mela", "navratri mela",
-            "rahas mela", "makar sankranti", "magh shukla purnima", "chaitra navratra", "navratri",
-            "sharad navratri", "anant chaturdashi", "ganesh chaturthi", "ramnavmi", "krishna janmashtami",
-            "shivratri", "maha shivratri", "christmas", "festival safety", "cultural festival",
-            "folk festival", "religious event", "bhagoriya haat", "hat bazaar"
-        ]
-
-        administrative_keywords = [
-            "administrative", "administrative machinery", "district offices", "government employees",
-            "government scheme", "government schemes", "central government", "state governments",
-            "state plan", "state plan scheme", "state resources", "revenue", "revenue department",
-            "revenue land", "registration", "certified copy", "birth certificates", "death certificates",
-            "income certificates", "residential certificates", "identity card", "identity cards",
-            "identity proof", "license renewal", "tenders", "inspection", "regulation", "policy",
-            "gazette", "departmental proceedings", "state scheme", "central sector scheme",
-            "centrally sponsored scheme", "12 वीं पंचवर्षीय योजना", "12th five-year plan",
-            "monitoring", "evaluation", "survey", "census", "data collection", "statistics",
-            "contingency scheme", "advisory committees", "advisory services", "public services",
-            "publicity", "information dissemination", "information services", "information related to schemes",
-            "MLA", "MLA schemes", "sarpanch", "panch", "panchayat", "CDPO", "treasury offices",
-            "publication", "publications", "official language", "government of india", "government of goa",
-            "gujarat government", "madhya pradesh", "maharashtra", "himachal pradesh", "jharkhand",
-            "kerala", "tamil nadu", "pondicherry", "assam", "goa", "punjab", "haryana", "bhopal",
-            "indore", "ujjain", "sagar", "satna", "chhatarpur", "bijaipur", "alirajpur", "jhabua",
-            "raipur", "revenue collection"
-        ]
-
-        infrastructure_keywords = [
-            "infrastructure", "road construction", "roads-plan", "road connectivity", "rural roads",
-            "pmgsy", "state plan road works", "building", "building construction", "government buildings",
-            "community halls", "conference hall", "dr.ambedkar bhavan", "ambedkar bhavan",
-            "babu jagjiban ram chatrabas yojana", "guest house", "burial ground", "cremation ground",
-            "drainage", "sewerage", "water & sewage management", "drinking water", "water supply",
-            "ponds", "desilting", "watershed", "land development", "land terracing", "land management",
-            "public works", "public assets", "retaining wall", "electricity", "power supply", "power tariff",
-            "electrification", "broadband", "bharatnet", "city wi-fi", "cctvs", "civic amenities",
-            "basic amenities", "urban infrastructure", "rural infrastructure", "adhisanrachan",
-            "boundary wall", "poly house/shadenet house", "shadenet", "low-tunnel", "plastic mulching",
-            "godown-cum-office building"
-        ]
-
-        religious_keywords = [
-            "religious", "religious event", "religious tourism", "pilgrimage", "teerth", "tirth yatra",
-            "tirth sthal", "tirth sthan", "temple", "hindu", "hinduism", "sufi", "christianity",
-            "saint", "chamunda mata temple", "mahakaleshwar mandir", "omkareshwar", "jyotirlinga",
-            "chandraprabhu", "khandwa", "narwar", "sonagiri", "datia", "nijampur", "pitambara peeth",
-            "harsiddhi mandir", "hanuman dhara", "sati anusuiya ashram", "jatashankar dham",
-            "gupta godavari", "caves", "kamdagiri parikrama", "kanha", "chitrakut", "shiva", "mahakal",
-            "bhagwan shankar", "bhagwan ’shiv ka vishal mandir", "shani dev", "anant chaturdashi",
-            "ganesh chaturthi", "navratri", "sharad navratri", "chaitra navratra", "ramnavmi",
-            "krishna janmashtami", "shivratri", "maha shivratri", "urs mela", "rang panchmi",
-            "basant panchmi mela", "deepawali mela", "navratri mela", "rahas mela", "makar sankranti",
-            "magh shukla purnima", "palanquin", "religious festivals", "nikah"
-        ]
-
-        media_keywords = [
-            "mass media", "all india radio", "doordarshan", "radio broadcasting", "television",
-            "publicity", "information dissemination", "advertisement campaign", "awareness campaign",
-            "awareness programmes", "awareness programs", "journalism", "journalist", "journalists",
-            "newspapers", "periodicals", "electronic media"
-        ]
-
-        livestock_keywords = [
-            "animal husbandry", "livestock", "livestock development", "dairy", "dairy development",
-            "poultry", "piggery", "goatery", "cattle rearing", "cattle herders", "milk production",
-            "cattle breed improvement", "cattle breeding", "artificial insemination", "calf rearing",
-            "calf incentive", "buffalo", "buffalo bull", "goat", "cow sheds", "veterinary services",
-            "vaccination", "fodder development", "green fodder cultivation", "animal rescue",
-            "stray cattle", "stray cattle management", "carcass processing", "rabies", "rabies control",
-            "pashu palan", "pashudhan", "pashu chikitsa", "pashu utprerak", "gauvanshiya pashu",
-            "japanese quail", "broiler", "layer"
-        ]
-
-        fisheries_keywords = [
-            "fisheries", "fish", "fish production", "fish feed", "fish market", "matsya palan",
-            "mahaseer", "fishermen", "frp boats", "aquatic fauna", "ponds", "community ponds"
-        ]
-
-        awards_keywords = [
-            "award", "awards", "awards and recognition", "merit awards", "cultural award",
-            "state cultural award", "gallantry award", "non gallantry award", "institution award",
-            "best library award", "prize", "prizes", "cash prize", "recognition", "felicitation",
-            "yuva srujan puraskar", "puraskar", "puraskar yojana"
-        ]
-
-        poverty_alleviation_keywords = [
-            "poverty", "poverty line", "poverty upliftment", "below poverty line", "bpl",
-            "bpl families", "economically weaker sections", "ews", "low income", "lig",
-            "poverty alleviation", "poverty reduction", "garibi unmulan", "garibi rekha",
-            "economic upliftment", "economic development", "economic empowerment", "economic growth",
-            "socio-economic development", "income upliftment", "income generating opportunities",
-            "destitute", "orphaned", "deserted", "marginalized", "marginalized communities",
-            "vulnerable communities", "social inclusion", "social upliftment"
-        ]
-
-        water_management_keywords = [
-            "water", "drinking water", "water supply", "water management", "water resources",
-            "watershed", "ponds", "desilting", "irrigation", "ground water prospect map",
-            "water & sewage management", "jal", "jal praday", "peyjala", "community ponds",
-            "poly house/shadenet house", "shadenet", "low-tunnel", "plastic mulching"
-        ]
-
-        waste_management_keywords = [
-            "waste management", "solid and liquid waste management", "organic waste", "kitchen waste",
-            "waste to wealth", "open defecation", "sanitation", "cleanliness", "hygienic",
-            "incinerators", "vermi composting", "biogas"
-        ]
-
-        energy_keywords = [
-            "electricity", "power supply", "power tariff", "electrification", "renewable energy",
-            "renewable energy sources", "clean energy", "green energy", "biogas", "biomass briquetting",
-            "efficient lighting", "reduce electricity bills", "electricity bill waiver",
-            "power distribution", "power generating", "generator"
-        ]
-
-        land_management_keywords = [
-            "land", "land development", "land terracing", "land management", "land ownership",
-            "land purchase", "land purchase assistance", "land records", "land reclamation",
-            "landless labourers", "revenue land", "wastelands", "public forest", "minor forest produce",
-            "nationalized timber", "timber harvesting", "kastha", "patta", "private land",
-            "niji bhumi"
-        ]
-
-        sports_keywords = [
-            "sports", "games", "cricket", "fitness", "gymnasium", "playground", "sports equipments",
-            "olympic", "competitions", "games and sports"
-        ]
-
-        skill_development_keywords = [
-            "skill development", "training", "vocational", "nsdc", "kaushal", "apprenticeship",
-            "capacity building", "skill india", "skill upgradation", "skills development", "sankalp",
-            "rseti", "iti", "ncvt", "technical courses", "short term courses", "evening courses",
-            "diploma in computer application", "computer", "laptop", "computerisation",
-            "computerization", "professional development", "career counseling", "counseling",
-            "training programs", "master trainer", "mentoring", "employability"
-        ]
-
-        public_services_keywords = [
-            "public services", "public distribution system", "pds", "ration", "food distribution",
-            "subsidized food grains", "subsidized salt", "antyodaya anna yojana", "public works",
-            "public assets", "public safety", "public libraries", "public forest", "publicity",
-            "information dissemination", "information services", "information related to schemes",
-            "civic amenities", "basic amenities", "common service centre (csc)", "e-service",
-            "e-service platform", "e-district", "e-mulakat", "e-nagarik", "e-office", "e-procurement",
-            "ekalyan", "payment gateway", "toll free number", "citizen", "citizen of india",
-            "consumer rights", "consumer protection", "consumer complaints", "consumer helpline"
-        ]
-
-        crime_prevention_keywords = [
-            "crime", "atrocities", "atrocity", "victims of atrocities", "prevention of atrocities",
-            "prevention of atrocities act", "caste discrimination", "untouchability",
-            "untouchability eradication", "aspashyata nirmulan", "aspashyata nirmulan",
-            "atyachar nivaran", "special courts", "special criminal courts", "witness protection",
-            "victim compensation", "police", "gupt suchna", "crime prevention", "acid attack victims",
-            "dowry victims", "violence", "child marriage prevention", "human rights"
-        ]
-
-        local_governance_keywords = [
-            "panchayat", "sarpanch", "panch", "local governance", "panchayat bhawan", "local area development",
-            "community development", "community self-reliance", "village", "gramin", "gramin vikas",
-            "sansad adarsh gram yojana", "mla", "mla schemes", "cdpo", "local development"
-        ]
-
-        manufacturing_keywords = [
-            "manufacturing", "manufacturing industries", "manufacturing sector", "industries", "industry",
-            "industrial estates", "sipcot", "tansidco industrial estates", "tiic", "industrial workers",
-            "cottage industries", "handloom", "handloom weavers", "textile", "textiles", "textile parks",
-            "spinning mills", "leather", "footwear", "blacksmith", "clay idol making",
-            "production", "productivity", "quality control", "quality improvement"
-        ]
-
-        marketing_keywords = [
-            "marketing", "market", "market access", "market information", "agricultural marketing",
-            "trade fair", "exhibition", "exhibitions", "fair", "hat bazaar", "bhagoriya haat",
-            "procurement", "purchase", "sales", "retail", "wholesale", "khudra", "thok",
-            "vikray", "kharidi kendra", "samarthan mulya", "brand building"
-        ]
-
-        education_infrastructure_keywords = [
-            "school", "college", "university", "hostel", "hostel facilities", "girls hostel",
-            "boarding", "residential facilities", "library", "library management", "library books",
-            "public libraries", "accessible library", "audio-visual room", "acoustic auditorium",
-            "computer", "laptop", "computerisation", "computerization", "calculators", "science seminars",
-            "study circle", "adarsh nivasi shala", "madarsas", "madrasa", "sanskrit", "education infrastructure"
-        ]
-
-        health_infrastructure_keywords = [
-            "hospital", "healthcare", "ambulance service", "emergency services", "fire fighting services",
-            "fire safety", "camps", "health camps", "testing laboratories", "free diagnosis",
-            "free services", "mediclaim scheme", "anganwadi", "anganwadi bhawan", "anganwadi kendra",
-            "awc", "day care", "daycare", "crèche", "health infrastructure"
-        ]
-
-        social_reform_keywords = [
-            "social reform", "social remedies", "social inclusion", "social upliftment", "social incentive",
-            "socio-economic development", "samajik sudharna", "untouchability eradication",
-            "aspashyata nirmulan", "aspashyata nirmulan", "caste discrimination", "gender equality",
-            "equality", "social ostracism", "social activities", "social mobilization", "social capital",
-            "community development", "community self-reliance", "human rights", "child marriage prevention",
-            "dowry victims", "acid attack victims", "violence", "prevention of atrocities",
-            "prevention of atrocities act", "atyachar nivaran"
-        ]
-
-        economic_development_keywords = [
-            "economic development", "economic upliftment", "economic empowerment", "economic growth",
-            "socio-economic development", "income upliftment", "income generating opportunities",
-            "financial inclusion", "financial viability", "financial boost", "investment",
-            "industrial estates", "manufacturing", "manufacturing industries", "manufacturing sector",
-            "agri-tech", "meditech", "msme", "startup", "business", "entrepreneur", "enterprise",
-            "self-employment", "cooperative societies", "self help groups", "self reliance",
-            "self-sufficiency", "north east industrial development", "stand-up india", "make in india",
-            "market access", "market information", "marketing", "trade fair", "exhibition", "exhibitions"
-        ]
-
-        emergency_services_keywords = [
-            "emergency services", "ambulance service", "fire fighting services", "fire safety",
-            "disaster relief", "disaster management", "flood relief", "earthquake aid", "cyclone relief",
-            "drought relief", "natural calamities", "accident", "injury", "death benefit",
-            "compensation", "relief", "relief and rehabilitation", "calamity relief", "rescue",
-            "trauma counselling", "crisis intervention", "public safety"
-        ]
-
-        cultural_activities_keywords = [
-            "cultural activities", "dance", "drama", "painting", "cultural shows", "cultural talent search",
-            "essay writing", "handwriting", "poem writing", "cultural exchange", "cultural groups",
-            "cultural institutions", "exhibition", "exhibitions", "festival/exhibition", "folk festival",
-            "cultural festival", "traditional products", "traditional crafts", "ethnic foods",
-            "handicrafts", "chitrakari"
-        ]
-
-        training_keywords = [
-            "training", "vocational training", "skill development", "skill upgradation", "skills development",
-            "sankalp", "rseti", "iti", "ncvt", "technical courses", "short term courses", "evening courses",
-            "diploma in computer application", "computer", "laptop", "computerisation", "computerization",
-            "professional development", "career counseling", "counseling", "training programs",
-            "master trainer", "mentoring", "apprenticeship", "capacity building", "prashikshan"
-        ]
-
-        compensation_keywords = [
-            "compensation", "relief", "monetary relief", "victim compensation", "death benefit",
-            "injury", "accident", "calamity relief", "financial incentive", "cash prize", "cash",
-            "assistance", "special assistance", "marriage assistance", "marriage incentive",
-            "calf incentive", "one-time incentive", "one-time payment", "pratikar", "rahata rashi"
-        ]
-
-        rehabilitation_keywords = [
-            "rehabilitation", "relief and rehabilitation", "economic rehabilitation", "emotional rehabilitation",
-            "resettlement", "care and protection", "family based care", "foster care", "destitute",
-            "orphaned", "deserted", "bonded labour", "de-addiction", "drug de-addiction", "alcoholism",
-            "drug and alcohol abuse", "trauma counselling", "crisis intervention", "re-vitalization",
-            "recovery", "rehabilitative services"
-        ]
-
-        public_distribution_keywords = [
-            "public distribution system", "pds", "ration", "food distribution", "subsidized food grains",
-            "subsidized salt", "antyodaya anna yojana", "food security", "food assistance",
-            "mid-day meal", "nutrition scheme", "akshaya patra", "breakfast", "poshan abhiyaan",
-            "uchit mulya ki dukan", "khadya suraksha", "khadyanna", "khadyanna bhandaran",
-            "vitaran"
-        ]
-
-        agricultural_inputs_keywords = [
-            "seeds", "paddy seeds", "minikit", "bio agents", "bio pesticides", "pesticides",
-            "plant protection", "plant protection equipment", "planting material", "fertilizer",
-            "rhizobium", "green manure", "compost", "vermi composting", "irrigation", "paddy reapers",
-            "power tillers", "mechanization", "poly house/shadenet house", "shadenet", "low-tunnel",
-            "plastic mulching", "kitnashak", "urvarak", "bij utpadan", "farming inputs"
-        ]
-
-        rural_infrastructure_keywords = [
-            "rural infrastructure", "rural roads", "pmgsy", "road connectivity", "drinking water",
-            "water supply", "sanitation", "drainage", "sewerage", "ponds", "desilting", "watershed",
-            "land development", "land terracing", "public works", "public assets", "retaining wall",
-            "electrification", "rural electrification", "panchayat bhawan", "community halls",
-            "burial ground", "cremation ground", "basic amenities", "civic amenities", "gramin adhisanrachan"
-        ]
-
-        urban_infrastructure_keywords = [
-            "urban infrastructure", "city planning", "smart cities", "metro development", "urban housing",
-            "urban slums", "road construction", "drainage", "sewerage", "water & sewage management",
-            "electricity", "power supply", "broadband", "bharatnet", "city wi-fi", "cctvs",
-            "public works", "civic amenities", "urban development", "shahari adhisanrachan"
-        ]
-
-        traditional_crafts_keywords = [
-            "handicrafts", "handloom", "handloom weavers", "traditional products", "traditional crafts",
-            "ethnic foods", "leather", "footwear", "embroidery", "clay idol making", "blacksmith",
-            "chitrakari", "traditional arts", "silk reeling", "eri silk", "spinning mills",
-            "craft", "crafts"
-        ]
-
-        financial_inclusion_keywords = [
-            "financial inclusion", "financial assistance", "subsidy", "loan", "microfinance", "credit",
-            "pension", "funding", "support", "financial viability", "financial boost", "banking",
-            "deposit accounts", "jan suraksha schemes", "pmjjby", "pmsby", "apy", "digidhan mission",
-            "payment gateway", "direct benefit transfer", "dbt", "financial security", "vittiya samaveshan"
-        ]
-
-        digital_infrastructure_keywords = [
-            "digital infrastructure", "internet connectivity", "broadband", "bharatnet", "city wi-fi",
-            "online services", "e-governance", "digital payment", "digital literacy", "smart city",
-            "aadhaar", "aadhaar based attendance system", "biometrics", "online portal",
-            "e-service", "e-service platform", "e-district", "e-mulakat", "e-nagarik", "e-office",
-            "e-procurement", "ekalyan", "jharnet", "nkn", "sms gateway", "video conferencing",
-            "digital services", "shahari wifi"
-        ]
-
-        healthcare_services_keywords = [
-            "healthcare", "medical", "hospital", "treatment", "ayushman", "free diagnosis",
-            "free services", "mediclaim scheme", "ambulance service", "emergency services",
-            "health camps", "camps", "testing laboratories", "vaccination", "veterinary services",
-            "maternity benefit", "family planning", "sterilization", "ifa supplementation",
-            "tb patients", "tuberculosis control", "rabies control", "hiv/aids prevention",
-            "anemia prevention", "child immunization", "shishu swasthya", "surakshit matritva",
-            "swasthya seva"
-        ]
-
-        education_support_keywords = [
-            "education support", "free textbooks", "text books", "book bank", "book distribution",
-            "book-bank facilities", "books", "library books", "reference books", "stationary",
-            "stationery", "drawing materials", "calculators", "computer", "laptop", "bicycle distribution",
-            "free travel", "uniform allowance", "uniform assistance", "tuition fee", "tuition fees",
-            "fee reimbursement", "compulsory fee reimbursement", "fee exemption", "scholarship",
-            "stipend", "bursary", "merit awards", "shiksha", "shikshan", "shulka ki vapasi"
-        ]
-
-        social_security_keywords = [
-            "social security", "pension", "old age", "senior citizen", "ignops", "ignwps", "igndps",
-            "nfbs", "social assistance", "social welfare", "welfare", "poverty alleviation",
-            "destitute", "orphaned", "deserted", "widow", "disabled", "divyang", "special needs",
-            "financial assistance", "monetary relief", "death benefit", "funeral assistance",
-            "funeral expenses", "funeral rites", "samajik suraksha", "kalyan"
-        ]
-
-        community_development_keywords = [
-            "community development", "community halls", "community ponds", "community self-reliance",
-            "local area development", "panchayat", "panchayat bhawan", "sarpanch", "panch",
-            "local governance", "social capital", "social mobilization", "social inclusion",
-            "samudayik bhawan", "samudayik vikas", "sabhayata", "samaj"
-        ]
-
-        cultural_heritage_keywords = [
-            "cultural heritage", "historical place", "archaeology", "museum", "traditional arts",
-            "folklore", "literature", "music", "art", "handicrafts", "traditional products",
-            "traditional crafts", "ethnic foods", "cultural preservation", "cultural institutions",
-            "sanskrutik virasat", "paramparik kala"
-        ]
-
-        environmental_conservation_keywords = [
-            "environmental conservation", "afforestation", "forestry", "wildlife", "wildlife damage",
-            "wildlife conservation", "national park", "tiger foundation society", "public forest",
-            "minor forest produce", "nationalized timber", "timber harvesting", "wastelands",
-            "eco tourism", "green investment", "clean energy", "renewable energy sources",
-            "environmental sustainability", "ecological balance", "parayavarniya sanrakshan",
-            "van", "vanya prani sanrakshan", "vanyajivi"
-        ]
-
-        disability_support_keywords = [
-            "disability support", "disabled", "divyang", "handicapped", "pwd", "special needs",
-            "differently abled", "cerebral palsy", "mentally challenged", "motorized tricycle",
-            "assistive devices", "viklangta praman patra", "nhfdc", "persons with disabilities",
-            "disabled students", "disabled children", "special assistance", "visual", "visually challenged",
-            "hearing impaired", "physical therapy", "divyangjan sahayata"
-        ]
-
-        agricultural_development_keywords = [
-            "agricultural development", "farmer", "agriculture", "kisaan", "crop", "irrigation",
-            "fertilizer", "soil", "farm", "agricultural marketing", "agro-based industries",
-            "dairy development", "livestock development", "poultry", "piggery", "goatery",
-            "fisheries", "seed production", "seed certification", "seed multiplication",
-            "paddy seeds", "minikit", "bio agents", "bio pesticides", "plant protection",
-            "cultivation methods", "green fodder cultivation", "mechanization", "pm-kisan",
-            "pradhan mantri fasal bima yojana", "pmksy", "rkvy", "krishi vikas", "krishak"
-        ]
-
-        rural_livelihood_keywords = [
-            "rural livelihood", "livelihood", "livelihood intervention", "livelihood opportunities",
-            "rural labourers", "self help groups", "self reliance", "self-sufficiency",
-            "income generating opportunities", "cottage industries", "handloom weavers",
-            "cooperative societies", "rural areas", "gramin ajivika", "swarojgar"
-        ]
-
-        urban_livelihood_keywords = [
-            "urban livelihood", "street vendors", "unorganized sector", "unskilled manual work",
-            "urban areas", "urban livelihoods", "shahari ajivika", "self-employed"
-        ]
-
-        tourism_promotion_keywords = [
-            "tourism promotion", "tourism", "religious tourism", "eco tourism", "travel",
-            "tour operator", "pilgrimage", "historical place", "tirth yatra", "tirth sthal",
-            "tourist destination", "parayatan", "parayatan samvardhan"
-        ]
-
-        festival_management_keywords = [
-            "festival management", "festival safety", "mela", "annual mela", "annual event",
-            "one-day event", "three-day event", "urs mela", "navratri mela", "rahas mela",
-            "deepawali mela", "basant panchmi mela", "makar sankranti", "festival organization",
-            "mela prabandhan"
-        ]
-
-        public_safety_keywords = [
-            "public safety", "road safety", "festival safety", "fire fighting services", "fire safety",
-            "ambulance service", "emergency services", "police", "crime prevention", "witness protection",
-            "victim compensation", "accident", "injury", "calamity relief", "sarvajanik suraksha"
-        ]
-
-        health_promotion_keywords = [
-            "health promotion", "awareness campaign", "awareness programmes", "awareness programs",
-            "health camps", "camps", "anemia prevention", "hiv/aids prevention", "tuberculosis control",
-            "rabies control", "child immunization", "family planning", "sterilization",
-            "swasthya samvardhan", "swasthya jagrukta"
-        ]
-
-        education_promotion_keywords = [
-            "education promotion", "literacy", "sarva shiksha abhiyan", "rte", "rte act",
-            "mid day meal", "poshan abhiyaan", "free textbooks", "bicycle distribution",
-            "uniform allowance", "shiksha samvardhan", "saksharta"
-        ]
-
-        social_inclusion_keywords = [
-            "social inclusion", "social equality", "social reform", "social remedies", "social upliftment",
-            "caste discrimination", "untouchability eradication", "gender equality", "equality",
-            "marginalized communities", "vulnerable communities", "samajik samaveshan",
-            "samajik sudharna"
-        ]
-
-        economic_empowerment_keywords = [
-            "economic empowerment", "economic upliftment", "income generating opportunities",
-            "financial inclusion", "self reliance", "self-sufficiency", "msme", "startup",
-            "entrepreneur", "cooperative societies", "self help groups", "north east industrial development",
-            "stand-up india", "make in india", "arthik sashaktikaran"
-        ]
-
-        disaster_relief_keywords = [
-            "disaster relief", "flood relief", "earthquake aid", "cyclone relief", "drought relief",
-            "natural calamities", "calamity relief", "relief", "relief and rehabilitation",
-            "accident", "injury", "death benefit", "compensation", "emergency services",
-            "rescue", "rahata", "apada rahata"
-        ]
-
-        child_protection_keywords = [
-            "child protection", "child welfare", "child rights", "child labor", "child marriage prevention",
-            "nutrition for children", "anganwadi", "icds", "poshan abhiyaan", "care and protection",
-            "family based care", "foster care", "orphaned", "bal sanrakshan", "bal kalyan"
-        ]
-
-        women_empowerment_keywords = [
-            "women empowerment", "mahila", "nari", "girl child", "adolescent girls", "pregnant",
-            "lactating", "mother", "widow", "maternity benefit", "marriage assistance", "inter-caste marriage",
-            "economic empowerment", "mahila sashaktikaran", "kishori balika"
-        ]
-
-        legal_support_keywords = [
-            "legal support", "legal aid", "free legal consultation", "legal assistance", "human rights",
-            "special courts", "special criminal courts", "witness protection", "victim compensation",
-            "prevention of atrocities act", "consumer protection", "consumer rights",
-            "vidhik sahayata", "nyaya"
-        ]
-
-        agricultural_marketing_keywords = [
-            "agricultural marketing", "market", "market access", "market information", "procurement",
-            "purchase", "sales", "retail", "wholesale", "trade fair", "exhibition", "exhibitions",
-            "fair", "hat bazaar", "bhagoriya haat", "mandi", "samarthan mulya", "krishi vipanan"
-        ]
-
-        rural_electrification_keywords = [
-            "rural electrification", "electrification", "electricity", "power supply", "power distribution",
-            "power generating", "efficient lighting", "reduce electricity bills", "electricity bill waiver",
-            "gramin vidyutikaran"
-        ]
-
-        urban_electrification_keywords = [
-            "urban electrification", "electricity", "power supply", "broadband", "bharatnet", "city wi-fi",
-            "smart city", "shahari vidyutikaran"
-        ]
-
-        livestock_development_keywords = [
-            "livestock development", "animal husbandry", "dairy development", "poultry", "piggery",
-            "goatery", "cattle rearing", "cattle breed improvement", "artificial insemination",
-            "calf rearing", "milk production", "fodder development", "green fodder cultivation",
-            "veterinary services", "pashudhan vikas"
-        ]
-
-        fisheries_development_keywords = [
-            "fisheries development", "fisheries", "fish production", "fish feed", "fish market",
-            "frp boats", "mahaseer", "matsya vikas", "matsya palan"
-        ]
-
-        cultural_promotion_keywords = [
-            "cultural promotion", "cultural activities", "cultural award", "state cultural award",
-            "cultural exchange", "cultural shows", "cultural talent search", "exhibition", "exhibitions",
-            "festival/exhibition", "folk festival", "traditional arts", "sanskrutik samvardhan"
-        ]
-
-        tourism_development_keywords = [
-            "tourism development", "tourism", "religious tourism", "eco tourism", "travel",
-            "tour operator", "pilgrimage", "historical place", "tourist destination", "parayatan vikas"
-        ]
-
-        public_health_keywords = [
-            "public health", "healthcare", "hospital", "treatment", "ayushman", "free diagnosis",
-            "free services", "health camps", "vaccination", "maternity benefit", "family planning",
-            "anemia prevention", "tuberculosis control", "hiv/aids prevention", "rabies control",
-            "child immunization", "sarvajanik swasthya", "swasthya seva"
-        ]
-
-        social_services_keywords = [
-            "social services", "social welfare", "welfare", "poverty alleviation", "social security",
-            "community service", "support program", "social assistance", "social development",
-            "social inclusion", "samajik seva", "kalyan"
-        ]
-
-        infrastructure_development_keywords = [
-            "infrastructure development", "road construction", "roads-plan", "road connectivity",
-            "rural roads", "pmgsy", "building construction", "government buildings", "community halls",
-            "guest house", "burial ground", "drainage", "sewerage", "water supply", "ponds",
-            "electrification", "broadband", "bharatnet", "city wi-fi", "public works",
-            "adhisanrachan vikas"
-        ]
-
-        economic_support_keywords = [
-            "economic support", "financial assistance", "subsidy", "loan", "microfinance", "credit",
-            "pension", "funding", "support", "financial incentive", "monetary relief", "cash prize",
-            "assistance", "special assistance", "marriage assistance", "marriage incentive",
-            "calf incentive", "one-time incentive", "one-time payment", "arthik sahayata"
-        ]
-
-        community_welfare_keywords = [
-            "community welfare", "community development", "community halls", "community ponds",
-            "community self-reliance", "social capital", "social mobilization", "local area development",
-            "samudayik kalyan", "samajik vikas"
-        ]
-
-        environmental_sustainability_keywords = [
-            "environmental sustainability", "afforestation", "forestry", "wildlife conservation",
-            "clean energy", "renewable energy", "green investment", "eco tourism", "waste management",
-            "watershed", "ecological balance", "parayavarniya sthirata", "hariyali"
-        ]
-
-        agricultural_innovation_keywords = [
-            "agricultural innovation", "agri-tech", "mechanization", "poly house/shadenet house",
-            "shadenet", "low-tunnel", "plastic mulching", "paddy reapers", "power tillers",
-            "bio agents", "bio pesticides", "cultivation methods", "green fodder cultivation",
-            "krishi navachar"
-        ]
-
-        digital_governance_keywords = [
-            "digital governance", "e-governance", "online services", "e-service", "e-service platform",
-            "e-district", "e-mulakat", "e-nagarik", "e-office", "e-procurement", "ekalyan",
-            "digital payment", "digital literacy", "smart city", "digigov", "digital shasan"
-        ]
-
-        public_welfare_keywords = [
-            "public welfare", "social welfare", "poverty alleviation", "social security", "public services",
-            "public distribution system", "civic amenities", "basic amenities", "community service",
-            "support program", "sarvajanik kalyan", "samajik kalyan"
-        ]
-
-        healthcare_infrastructure_keywords = [
-            "healthcare infrastructure", "hospital", "testing laboratories", "ambulance service",
-            "emergency services", "fire fighting services", "anganwadi bhawan", "anganwadi kendra",
-            "healthcare facilities", "swasthya adhisanrachan"
-        ]
-
-        education_institutions_keywords = [
-            "education institutions", "school", "college", "university", "madarsas", "madrasa",
-            "adarsh nivasi shala", "hostel", "girls hostel", "library", "public libraries",
-            "shiksha sansthan"
-        ]
-
-        rural_welfare_keywords = [
-            "rural welfare", "rural development", "village", "panchayat", "rural infrastructure",
-            "farmers' welfare", "rural electrification", "sanitation", "drinking water",
-            "gramin kalyan", "gramin vikas"
-        ]
-
-        urban_welfare_keywords = [
-            "urban welfare", "urban development", "smart cities", "urban housing", "urban slums",
-            "city planning", "urban infrastructure", "shahari kalyan", "shahari vikas"
-        ]
-
-        cultural_institutions_keywords = [
-            "cultural institutions", "museum", "cultural groups", "cultural exchange", "cultural shows",
-            "cultural talent search", "sanskrutik sansthan"
-        ]
-
-        disability_welfare_keywords = [
-            "disability welfare", "disabled", "divyang", "special needs", "differently abled",
-            "assistive devices", "motorized tricycle", "viklangta praman patra", "nhfdc",
-            "disabled students", "divyangjan kalyan"
-        ]
-
-        agriculture_support_keywords = [
-            "agriculture support", "farmer", "kisaan", "crop", "irrigation", "fertilizer", "seeds",
-            "paddy seeds", "minikit", "pesticides", "mechanization", "pm-kisan", "pmksy",
-            "pradhan mantri fasal bima yojana", "rkvy", "krishi sahayata"
-        ]
-
-        livelihood_support_keywords = [
-            "livelihood support", "livelihood", "livelihood intervention", "income generating opportunities",
-            "self help groups", "self reliance", "self-sufficiency", "cottage industries",
-            "cooperative societies", "ajivika sahayata"
-        ]
-
-        public_infrastructure_keywords = [
-            "public infrastructure", "road construction", "roads-plan", "rural roads", "pmgsy",
-            "building construction", "government buildings", "community halls", "public works",
-            "drainage", "sewerage", "water supply", "electrification", "sarvajanik adhisanrachan"
-        ]
-
-        social_development_keywords = [
-            "social development", "social inclusion", "social reform", "social remedies", "social upliftment",
-            "socio-economic development", "social capital", "social mobilization", "samajik vikas"
-        ]
-
-        economic_inclusion_keywords = [
-            "economic inclusion", "financial inclusion", "economic empowerment", "income generating opportunities",
-            "self reliance", "self-sufficiency", "msme", "startup", "cooperative societies",
-            "arthik samaveshan"
-        ]
-
-        healthcare_support_keywords = [
-            "healthcare support", "free diagnosis", "free services", "mediclaim scheme", "health camps",
-            "vaccination", "maternity benefit", "family planning", "anemia prevention", "swasthya sahayata"
-        ]
-
-        education_welfare_keywords = [
-            "education welfare", "free textbooks", "bicycle distribution", "uniform allowance",
-            "scholarship", "stipend", "bursary", "literacy", "sarva shiksha abhiyan", "rte",
-            "shiksha kalyan"
-        ]
-
-        community_support_keywords = [
-            "community support", "community development", "community halls", "community ponds",
-            "local area development", "social capital", "samudayik sahayata"
-        ]
-
-        cultural_support_keywords = [
-            "cultural support", "cultural activities", "cultural award", "cultural exchange",
-            "cultural shows", "cultural talent search", "traditional arts", "sanskrutik sahayata"
-        ]
-
-        environmental_support_keywords = [
-            "environmental support", "afforestation", "wildlife conservation", "clean energy",
-            "renewable energy", "eco tourism", "waste management", "parayavarniya sahayata"
-        ]
-
-        disability_services_keywords = [
-            "disability services", "assistive devices", "motorized tricycle", "viklangta praman patra",
-            "nhfdc", "disabled students", "special needs", "divyangjan seva"
-        ]
-
-        agricultural_services_keywords = [
-            "agricultural services", "seed certification", "seed multiplication", "pesticides",
-            "plant protection", "cultivation methods", "mechanization", "krishi seva"
-        ]
-
-        livelihood_services_keywords = [
-            "livelihood services", "livelihood intervention", "income generating opportunities",
-            "self help groups", "cooperative societies", "ajivika seva"
-        ]
-
-        infrastructure_services_keywords = [
-            "infrastructure services", "road construction", "building construction", "public works",
-            "drainage", "sewerage", "water supply", "electrification", "adhisanrachan seva"
-        ]
-
-        public_support_keywords = [
-            "public support", "public services", "public distribution system", "civic amenities",
-            "basic amenities", "community service", "sarvajanik sahayata"
-        ]
-
-        healthcare_welfare_keywords = [
-            "healthcare welfare", "ayushman", "free diagnosis", "free services", "mediclaim scheme",
-            "health camps", "vaccination", "swasthya kalyan"
-        ]
-
-        education_services_keywords = [
-            "education services", "free textbooks", "bicycle distribution", "uniform allowance",
-            "scholarship", "literacy", "sarva shiksha abhiyan", "shiksha seva"
-        ]
-
-        community_services_keywords = [
-            "community services", "community development", "community halls", "local area development",
-            "samudayik seva"
-        ]
-
-        cultural_services_keywords = [
-            "cultural services", "cultural activities", "cultural exchange", "cultural shows",
-            "traditional arts", "sanskrutik seva"
-        ]
-
-        environmental_services_keywords = [
-            "environmental services", "afforestation", "wildlife conservation", "clean energy",
-            "waste management", "parayavarniya seva"
-        ]
-
-        disability_inclusion_keywords = [
-            "disability inclusion", "disabled", "divyang", "special needs", "differently abled",
-            "assistive devices", "divyangjan samaveshan"
-        ]
-
-        agricultural_welfare_keywords = [
-            "agricultural welfare", "farmer", "kisaan", "pm-kisan", "pradhan mantri fasal bima yojana",
-            "rkvy", "krishi kalyan"
-        ]
-
-        livelihood_welfare_keywords = [
-            "livelihood welfare", "livelihood", "self help groups", "self reliance", "cooperative societies",
-            "ajivika kalyan"
-        ]
-
-        infrastructure_welfare_keywords = [
-            "infrastructure welfare", "road connectivity", "rural roads", "building construction",
-            "public works", "adhisanrachan kalyan"
-        ]
-
-        public_welfare_services_keywords = [
-            "public welfare services", "public services", "public distribution system", "civic amenities",
-            "sarvajanik kalyan seva"
-        ]
-
-        healthcare_promotion_keywords = [
-            "healthcare promotion", "health camps", "awareness campaign", "anemia prevention",
-            "tuberculosis control", "swasthya samvardhan"
-        ]
-
-        education_inclusion_keywords = [
-            "education inclusion", "literacy", "sarva shiksha abhiyan", "rte", "free textbooks",
-            "shiksha samaveshan"
-        ]
-
-        community_inclusion_keywords = [
-            "community inclusion", "community development", "social capital", "local area development",
-            "samudayik samaveshan"
-        ]
-
-        cultural_inclusion_keywords = [
-            "cultural inclusion", "cultural exchange", "cultural shows", "traditional arts",
-            "sanskrutik samaveshan"
-        ]
-
-        environmental_inclusion_keywords = [
-            "environmental inclusion", "afforestation", "wildlife conservation", "clean energy",
-            "parayavarniya samaveshan"
-        ]
-
-
-        tag_lower = self.name.lower()
-        if self.match_keywords(tag_lower, scholarship_keywords):
-            self.category = "scholarship"
-        elif self.match_keywords(tag_lower, govt_job_keywords):
-            self.category = "govt_job"
-        elif self.match_keywords(tag_lower, private_job_keywords):
-            self.category = "private_job"
-        elif self.match_keywords(tag_lower, internship_keywords):
-            self.category = "internship"
-        elif self.match_keywords(tag_lower, skill_job_keywords):
-            self.category = "skill_based_job"
-        elif self.match_keywords(tag_lower, defense_job_keywords):
-            self.category = "defense_job"
-        elif self.match_keywords(tag_lower, job_keywords):
-            self.category = "job"
-        elif self.match_keywords(tag_lower, sc_keywords):
-            self.category = "sc"
-        elif self.match_keywords(tag_lower, st_keywords):
-            self.category = "st"
-        elif self.match_keywords(tag_lower, obc_keywords):
-            self.category = "obc"
-        elif self.match_keywords(tag_lower, minority_keywords):
-            self.category = "minority"
-        elif self.match_keywords(tag_lower, financial_keywords):
-            self.category = "financial_assistance"
-        elif self.match_keywords(tag_lower, women_keywords):
-            self.category = "women"
-        elif self.match_keywords(tag_lower, agriculture_keywords):
-            self.category = "agriculture"
-        elif self.match_keywords(tag_lower, senior_keywords):
-            self.category = "senior_citizen"
-        elif self.match_keywords(tag_lower, disability_keywords):
-            self.category = "disability"
-        elif self.match_keywords(tag_lower, business_keywords):
-            self.category = "business"
-        elif self.match_keywords(tag_lower, education_keywords):
-            self.category = "education"
-        elif self.match_keywords(tag_lower, health_keywords):
-            self.category = "health"
-        elif self.match_keywords(tag_lower, housing_keywords):
-            self.category = "housing"
-        elif self.match_keywords(tag_lower, youth_keywords):
-            self.category = "youth_skill"
-        elif self.match_keywords(tag_lower, transportation_keywords):  # New category
-            self.category = "transportation"
-        elif self.match_keywords(tag_lower, environment_keywords):  # New category
-            self.category = "environment"
-        elif self.match_keywords(tag_lower, digital_services_keywords):  # New category
-            self.category = "digital_services"
-        elif self.match_keywords(tag_lower, social_welfare_keywords):  # New category
-            self.category = "social_welfare"
-        elif self.match_keywords(tag_lower, rural_development_keywords):  # New category
-            self.category = "rural_development"
-        elif self.match_keywords(tag_lower, urban_development_keywords):  # New category
-            self.category = "urban_development"
-        elif self.match_keywords(tag_lower, international_relations_keywords):  # New category
-            self.category = "international_relations"
-        elif self.match_keywords(tag_lower, technology_innovation_keywords):  # New category
-            self.category = "technology_innovation"
-        elif self.match_keywords(tag_lower, legal_keywords):  # New category
-            self.category = "legal"
-        elif self.match_keywords(tag_lower, food_security_keywords):  # New category
-            self.category = "food_security"
-        elif self.match_keywords(tag_lower, disaster_management_keywords):  # New category
-            self.category = "disaster_management"
-        elif self.match_keywords(tag_lower, climate_action_keywords):  # New category
-            self.category = "climate_action"
-        elif self.match_keywords(tag_lower, gender_equality_keywords):  # New category
-            self.category = "gender_equality"
-        elif self.match_keywords(tag_lower, child_welfare_keywords):  # New category
-            self.category = "child_welfare"
-        elif self.match_keywords(tag_lower, consumer_protection_keywords):  # New category
-            self.category = "consumer_protection"
-        elif self.match_keywords(tag_lower, cultural_preservation_keywords):  # New category
-            self.category = "cultural_preservation"
-        elif self.match_keywords(tag_lower, research_and_development_keywords):  # New category
-            self.category = "research_and_development"
-        else:
-            self.category = "general"
-
-
+        self.categorize()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -1573,6 +384,10 @@ class Scheme(TimeStampedModel):
     tags = models.ManyToManyField('Tag', related_name='schemes', blank=True)  # Add this line
     benefits = models.ManyToManyField('Benefit', related_name='schemes', blank=True)
     is_active = models.BooleanField(default=True)
+    # Weighted title/tags/beneficiaries/department/description, maintained by utils.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # sha256 of the scraped record, set by load_data to skip unchanged schemes
+    content_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
 
     def clean(self):
         if not self.title.strip():  # Disallow empty or whitespace-only names
@@ -1582,6 +397,7 @@ class Scheme(TimeStampedModel):
         verbose_name = "Scheme"
         verbose_name_plural = "Schemes"
         ordering = ['introduced_on']
+        indexes = [GinIndex(fields=['search_vector'], name='scheme_search_vector_gin')]
 
     def __str__(self):
         return self.title or "N/A"
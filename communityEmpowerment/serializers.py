@@ -101,7 +101,7 @@ class SchemeSerializer(TimeStampedModelSerializer):
     tags = TagSerializer(many=True)
     class Meta:
         model = Scheme
-        fields = '__all__'
+        exclude = ['search_vector', 'content_hash']
 
 class SchemeBeneficiarySerializer(TimeStampedModelSerializer):
     beneficiary = BeneficiarySerializer()
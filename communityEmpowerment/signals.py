@@ -1,12 +1,195 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.management import call_command
-from .models import Tag
+from .models import (
+    Tag, Scheme, State, Department, Organisation, Beneficiary, Benefit, Sponsor, Document, Criteria, Procedure,
+    SchemeBeneficiary, SchemeSponsor, SchemeDocument, UserInteraction, FAQ, Announcement, LayoutItem, CompanyMeta,
+)
+from .utils.cache_versions import SCHEME_NAMESPACES, bump_on_commit
+from .utils.scheme_fragments import invalidate_fragments_on_commit
+from .utils.facet_index import invalidate_on_commit, reindex_on_commit
+from .utils.search import update_search_index
+from .utils.scheme_loader import schemes_ingested
+from .tasks import record_user_interaction, schedule_similarity_update
 
 @receiver(post_save, sender=Tag)
 def recalculate_similarity(sender, instance, **kwargs):
     """
-    Trigger similarity matrix recalculation whenever a Tag instance is updated or created.
+    Queue the tag's schemes for a similarity refresh whenever its weight changes.
     """
     if 'weight' in instance.get_dirty_fields():
-        call_command('precompute_scheme_similarity')
+        schedule_similarity_update(
+            Scheme.tags.through.objects.filter(tag_id=instance.pk).values_list('scheme_id', flat=True)
+        )
+
+
+@receiver(post_save, sender=UserInteraction)
+def count_user_interaction(sender, instance, **kwargs):
+    record_user_interaction()
+
+
+# Derived scheme indexes (facets, full-text search, similarity)
+
+def schemes_changed(scheme_ids):
+    scheme_ids = set(scheme_ids)
+    if not scheme_ids:
+        return
+    reindex_on_commit(scheme_ids)
+    update_search_index(scheme_ids)
+    schedule_similarity_update(scheme_ids)
+
+
+@receiver(schemes_ingested)
+def reindex_ingested_schemes(sender, changeset, **kwargs):
+    schemes_changed(changeset['new'] + changeset['updated'])
+
+
+@receiver(post_save, sender=Scheme)
+def reindex_scheme(sender, instance, **kwargs):
+    schemes_changed([instance.pk])
+
+
+@receiver(post_delete, sender=Scheme)
+def unindex_scheme(sender, instance, **kwargs):
+    reindex_on_commit([instance.pk])
+    schedule_similarity_update([instance.pk])
+
+
+@receiver(post_save, sender=SchemeBeneficiary)
+@receiver(post_delete, sender=SchemeBeneficiary)
+@receiver(post_save, sender=SchemeSponsor)
+@receiver(post_delete, sender=SchemeSponsor)
+def reindex_scheme_links(sender, instance, **kwargs):
+    schemes_changed([instance.scheme_id])
+
+
+@receiver(post_save, sender=Tag)
+def reindex_tag_schemes(sender, instance, created=False, **kwargs):
+    if created or 'name' not in instance.get_dirty_fields():
+        return
+    schemes_changed(Scheme.tags.through.objects.filter(tag_id=instance.pk).values_list('scheme_id', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_schemes(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so collect the schemes first.
+    instance._affected_scheme_ids = list(
+        Scheme.tags.through.objects.filter(tag_id=instance.pk).values_list('scheme_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Tag)
+def reindex_deleted_tag_schemes(sender, instance, **kwargs):
+    schemes_changed(getattr(instance, '_affected_scheme_ids', []))
+
+
+@receiver(post_save, sender=Beneficiary)
+def reindex_beneficiary_schemes(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    schemes_changed(SchemeBeneficiary.objects.filter(beneficiary_id=instance.pk).values_list('scheme_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Scheme.tags.through)
+def reindex_scheme_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schemes_changed([instance.pk])
+    elif pk_set:
+        schemes_changed(pk_set)
+    else:
+        invalidate_on_commit()
+
+
+@receiver(post_save, sender=Department)
+def reindex_department_schemes(sender, instance, created=False, **kwargs):
+    if not created:
+        update_search_index(Scheme.objects.filter(department=instance).values_list('id', flat=True))
+    invalidate_on_commit()
+
+
+@receiver(post_save, sender=State)
+def invalidate_scheme_facets(sender, instance, **kwargs):
+    # State/Department.save() cascade is_active with queryset.update(), which
+    # sends no per-scheme signals, so rebuild the facet index lazily instead.
+    invalidate_on_commit()
+
+
+# Cached API responses (see CacheMiddleware) and their ETags (see
+# utils/conditional_get.py): a write starts a new generation of the namespace
+# its model belongs to.
+
+CACHE_NAMESPACES = {
+    State: 'states',
+    Department: 'departments',
+    Organisation: 'organisations',
+    Scheme: 'schemes',
+    SchemeBeneficiary: 'schemes',
+    SchemeSponsor: 'schemes',
+    SchemeDocument: 'schemes',
+    Tag: 'tags',
+    Beneficiary: 'beneficiaries',
+    Benefit: 'benefits',
+    Sponsor: 'sponsors',
+    Document: 'documents',
+    Criteria: 'criteria',
+    Procedure: 'procedures',
+    FAQ: 'faqs',
+    Announcement: 'announcements',
+    LayoutItem: 'layout',
+    CompanyMeta: 'company_meta',
+}
+
+
+def bump_model_namespace(sender, **kwargs):
+    bump_on_commit(CACHE_NAMESPACES[sender])
+
+
+def scheme_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    bump_on_commit('schemes')
+    if not reverse:
+        invalidate_fragments_on_commit([instance.pk])
+    elif pk_set:
+        invalidate_fragments_on_commit(pk_set)
+    else:
+        # Cleared from the other side: the schemes are unknown by now, so
+        # retire every fragment through the related model's namespace.
+        bump_on_commit(CACHE_NAMESPACES[type(instance)])
+
+
+for model in CACHE_NAMESPACES:
+    post_save.connect(bump_model_namespace, sender=model, dispatch_uid=f'cache_namespace_save_{model.__name__}')
+    post_delete.connect(bump_model_namespace, sender=model, dispatch_uid=f'cache_namespace_delete_{model.__name__}')
+
+for field in ('tags', 'benefits', 'beneficiaries', 'sponsors', 'documents'):
+    m2m_changed.connect(
+        scheme_links_changed, sender=getattr(Scheme, field).through, dispatch_uid=f'cache_namespace_{field}'
+    )
+
+
+@receiver(schemes_ingested)
+def bump_ingested_namespaces(sender, changeset, **kwargs):
+    # The loader writes schemes and everything they link to in bulk, without model signals.
+    bump_on_commit(*SCHEME_NAMESPACES)
+    invalidate_fragments_on_commit(changeset['new'] + changeset['updated'] + changeset['removed'])
+
+
+# Serialized scheme fragments: shared rows (tags, departments, ...) retire all
+# of them through the namespaces above; these retire a single scheme's fragment.
+
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+def invalidate_scheme_fragment(sender, instance, **kwargs):
+    invalidate_fragments_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=SchemeBeneficiary)
+@receiver(post_delete, sender=SchemeBeneficiary)
+@receiver(post_save, sender=SchemeSponsor)
+@receiver(post_delete, sender=SchemeSponsor)
+@receiver(post_save, sender=SchemeDocument)
+@receiver(post_delete, sender=SchemeDocument)
+def invalidate_linked_scheme_fragment(sender, instance, **kwargs):
+    invalidate_fragments_on_commit([instance.scheme_id])
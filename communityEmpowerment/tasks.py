@@ -124,10 +124,27 @@
 
 
 # communityEmpowerment/tasks.py
+import logging
 from celery import shared_task
 from django.core.management import call_command
 from django.core.mail import send_mail
+from django.core.cache import cache
 from django.conf import settings
+from communityEmpowerment.utils.collaborative import count_new_interaction
+from communityEmpowerment.utils.similarity import (
+    pop_pending_similarity_updates, queue_similarity_update, update_similarity_store,
+)
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_UPDATE_DELAY = 60
+SIMILARITY_SCHEDULED_KEY = "similarity:{simplecache}_scheduled"
+SIMILARITY_LOCK_KEY = "similarity:{simplecache}_lock"
+SIMILARITY_LOCK_TIMEOUT = 60 * 30
+
+COLLABORATIVE_SCHEDULED_KEY = "collaborative:{simplecache}_scheduled"
+COLLABORATIVE_LOCK_KEY = "collaborative:{simplecache}_lock"
+COLLABORATIVE_LOCK_TIMEOUT = 60 * 30
 
 
 @shared_task
@@ -145,4 +162,73 @@ def send_expiry_email_task():
 
 @shared_task
 def send_monthly_analytics_report_task():
-    call_command('send_monthly_analytics_report')
\ No newline at end of file
+    call_command('send_monthly_analytics_report')
+
+
+def schedule_similarity_update(scheme_ids):
+    """
+    Queue schemes for an incremental neighbour refresh. Edits arriving within
+    SIMILARITY_UPDATE_DELAY seconds are coalesced into one task run.
+    """
+    scheme_ids = list(scheme_ids)
+    if not scheme_ids:
+        return
+    try:
+        queue_similarity_update(scheme_ids)
+        if cache.add(SIMILARITY_SCHEDULED_KEY, 1, timeout=SIMILARITY_UPDATE_DELAY):
+            update_scheme_similarity_task.apply_async(countdown=SIMILARITY_UPDATE_DELAY)
+    except Exception as e:
+        # The nightly refit picks up anything missed here.
+        logger.error(f"Could not schedule similarity update for {len(scheme_ids)} schemes: {str(e)}")
+
+
+@shared_task
+def update_scheme_similarity_task():
+    cache.delete(SIMILARITY_SCHEDULED_KEY)
+    if not cache.add(SIMILARITY_LOCK_KEY, 1, timeout=SIMILARITY_LOCK_TIMEOUT):
+        # A refit or another update is running; try again once it has finished.
+        if cache.add(SIMILARITY_SCHEDULED_KEY, 1, timeout=SIMILARITY_UPDATE_DELAY):
+            update_scheme_similarity_task.apply_async(countdown=SIMILARITY_UPDATE_DELAY)
+        return
+    try:
+        scheme_ids = pop_pending_similarity_updates()
+        if scheme_ids and update_similarity_store(scheme_ids) is None:
+            call_command('precompute_scheme_similarity')
+    finally:
+        cache.delete(SIMILARITY_LOCK_KEY)
+
+
+@shared_task
+def refit_scheme_similarity_task():
+    """Full refit, so the vocabulary and IDF weights follow the current corpus."""
+    if not cache.add(SIMILARITY_LOCK_KEY, 1, timeout=SIMILARITY_LOCK_TIMEOUT):
+        return
+    try:
+        pop_pending_similarity_updates()
+        call_command('precompute_scheme_similarity')
+    finally:
+        cache.delete(SIMILARITY_LOCK_KEY)
+
+
+def record_user_interaction():
+    """Retrain once COLLABORATIVE_RETRAIN_INTERACTIONS new interactions have arrived."""
+    try:
+        threshold = getattr(settings, 'COLLABORATIVE_RETRAIN_INTERACTIONS', 500)
+        if count_new_interaction() >= threshold and cache.add(
+            COLLABORATIVE_SCHEDULED_KEY, 1, timeout=COLLABORATIVE_LOCK_TIMEOUT
+        ):
+            train_collaborative_model_task.delay()
+    except Exception as e:
+        # The scheduled retrain picks these up anyway.
+        logger.error(f"Could not schedule collaborative model training: {str(e)}")
+
+
+@shared_task
+def train_collaborative_model_task():
+    cache.delete(COLLABORATIVE_SCHEDULED_KEY)
+    if not cache.add(COLLABORATIVE_LOCK_KEY, 1, timeout=COLLABORATIVE_LOCK_TIMEOUT):
+        return
+    try:
+        call_command('train_collaborative_model')
+    finally:
+        cache.delete(COLLABORATIVE_LOCK_KEY)
@@ -1,9 +1,10 @@
-from django.test import TestCase
+from unittest import skipUnless
+from django.test import TestCase, TransactionTestCase
 from django.utils.timezone import now
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 
-from .models import State, Department, Organisation, Scheme, Tag, Beneficiary, Benefit, Sponsor, Document
+from .models import State, Department, Organisation, Scheme, Tag, Beneficiary, Benefit, Sponsor, Document, CustomUser
 
 class StateModelTest(TestCase):
     def test_create_state(self):
@@ -196,3 +197,1198 @@ class DocumentModelTest(TestCase):
         document = Document.objects.create(document_name="Aadhar Card", requirements="Valid Aadhar Number")
         self.assertEqual(document.document_name, "Aadhar Card")
         self.assertEqual(document.requirements, "Valid Aadhar Number")
+
+
+class SchemeFacetIndexTest(TestCase):
+    def setUp(self):
+        from .utils.facet_index import SchemeFacetIndex
+        state = State.objects.create(state_name="Kerala")
+        department = Department.objects.create(state=state, department_name="Education Department")
+        self.scholarship = Scheme.objects.create(title="Post Matric Scholarship", department=department)
+        self.job = Scheme.objects.create(title="Job Fair", department=department)
+        self.scholarship.tags.add(Tag.objects.create(name="Post Matric Scholarship SC"))
+        self.job.tags.add(Tag.objects.create(name="Employment"))
+        self.index = SchemeFacetIndex()
+        self.index.rebuild()
+
+    def test_tag_filters_match_icontains(self):
+        self.assertEqual(self.index.filter(tag="scholarship"), {self.scholarship.id})
+        self.assertEqual(self.index.filter(tag="job"), set())
+        self.assertEqual(self.index.filter(user_tags=["employment"]), {self.job.id})
+
+    def test_reindex_after_deactivation(self):
+        Scheme.objects.filter(id=self.job.id).update(is_active=False)
+        self.index.reindex_schemes([self.job.id])
+        self.assertEqual(self.index.filter(user_tags=["employment"]), set())
+
+    def test_scheme_writes_reach_the_index_only_when_committed(self):
+        from django.db import transaction
+        from .utils.facet_index import get_generation, scheme_facet_index
+        scheme_facet_index.rebuild()
+        generation = get_generation()
+        try:
+            with transaction.atomic():
+                self.job.tags.add(Tag.objects.create(name="Skill Training"))
+                raise RuntimeError("rolled back")
+        except RuntimeError:
+            pass
+        self.assertEqual(get_generation(), generation)
+        self.assertEqual(scheme_facet_index.filter(tag="skill"), set())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.tags.add(Tag.objects.create(name="Skill Training"))
+            self.assertEqual(get_generation(), generation)
+        self.assertEqual(scheme_facet_index.filter(tag="skill"), {self.job.id})
+
+    def test_admin_activation_actions_refresh_the_index(self):
+        from .admin import StateAdmin, DepartmentAdmin, admin_site
+        state_admin = StateAdmin(State, admin_site)
+        with self.captureOnCommitCallbacks(execute=True):
+            state_admin.deactivate_states(None, State.objects.all())
+        self.assertEqual(self.index.filter(tag="scholarship"), set())
+        with self.captureOnCommitCallbacks(execute=True):
+            state_admin.activate_states(None, State.objects.all())
+        self.assertEqual(self.index.filter(tag="scholarship"), {self.scholarship.id})
+
+        department_admin = DepartmentAdmin(Department, admin_site)
+        with self.captureOnCommitCallbacks(execute=True):
+            department_admin.deactivate_departments(None, Department.objects.all())
+        self.assertEqual(self.index.filter(tag="scholarship"), set())
+
+
+class SchemeSearchTest(TestCase):
+    def test_ranked_prefix_search_over_tags_and_title(self):
+        from .utils.search import get_search_backend
+        state = State.objects.create(state_name="Punjab")
+        department = Department.objects.create(state=state, department_name="Social Justice Department")
+        best = Scheme.objects.create(title="Post Matric Scholarship for SC Students", department=department)
+        other = Scheme.objects.create(title="Hostel Grant", department=department, description="For post matric students")
+        other.tags.add(Tag.objects.create(name="Scholarship"))
+        Scheme.objects.create(title="Old Age Pension", department=department)
+
+        backend = get_search_backend()
+        backend.update()
+        results = list(backend.search(Scheme.objects.all(), "post matric scholar"))
+        self.assertEqual([s.id for s in results], [best.id, other.id])
+
+
+class SimilarityStoreTest(TestCase):
+    def test_top_k_store_round_trip(self):
+        import tempfile
+        from scipy.sparse import csr_matrix
+        from .utils.similarity import top_k_neighbours, save_similarity_store, SimilarityStore
+        matrix = csr_matrix([[1.0, 0.0], [0.8, 0.6], [0.0, 1.0]])
+        neighbours, scores = top_k_neighbours(matrix, k=2, chunk_size=2)
+        with tempfile.TemporaryDirectory() as directory:
+            save_similarity_store([10, 20, 30], neighbours, scores, directory=directory)
+            store = SimilarityStore(directory)
+            self.assertEqual([i for i, _ in store.neighbours_for(10)], [20, 30])
+            self.assertEqual([i for i, _ in store.neighbours_for(30)], [20, 10])
+            self.assertEqual(store.neighbours_for(99), [])
+
+    def test_republishing_swaps_whole_snapshots(self):
+        import os
+        import tempfile
+        import numpy as np
+        from django.test import override_settings
+        from .utils.similarity import save_similarity_store, load_similarity_store, SimilarityStore
+        from .utils.snapshots import current_snapshot
+        with tempfile.TemporaryDirectory() as directory, override_settings(SIMILARITY_STORE_DIR=directory):
+            save_similarity_store([10, 20], [[1], [0]], [[0.5], [0.5]], directory=directory)
+            first = load_similarity_store()
+            save_similarity_store([10, 20, 30], [[2], [2], [0]], [[0.9], [0.8], [0.9]], directory=directory)
+            # A store opened before the swap keeps reading its own snapshot.
+            self.assertEqual(first.neighbours_for(10), [(20, 0.5)])
+            second = load_similarity_store()
+            self.assertIsNot(second, first)
+            self.assertEqual([i for i, _ in second.neighbours_for(10)], [30])
+
+            save_similarity_store([10], [[-1]], [[0.0]], directory=directory)
+            snapshots = [name for name in os.listdir(directory) if name.startswith('snapshot-')]
+            self.assertEqual(len(snapshots), 2)
+
+            np.save(os.path.join(current_snapshot(directory), 'scores.npy'), np.zeros((3, 1), dtype=np.float32))
+            with self.assertRaises(ValueError):
+                SimilarityStore(directory)
+
+    def test_partitioned_neighbours_stay_within_state(self):
+        from scipy.sparse import csr_matrix
+        from .utils.similarity import partitioned_top_k_neighbours
+        matrix = csr_matrix([[1.0, 0.0], [0.8, 0.6], [0.0, 1.0]])
+        neighbours, _ = partitioned_top_k_neighbours(matrix, [1, 2, 1], k=2)
+        self.assertEqual(neighbours[0].tolist(), [2, -1])
+        self.assertEqual(neighbours[1].tolist(), [-1, -1])
+
+    def test_incremental_update_repairs_neighbours(self):
+        import tempfile
+        from .utils.similarity import SimilarityStore, build_similarity_store, update_similarity_store
+        state = State.objects.create(state_name="Bihar")
+        department = Department.objects.create(state=state, department_name="Welfare Department")
+        titles = ["Girls Scholarship", "Scholarship for Students", "Farmer Loan Waiver", "Crop Loan Subsidy"]
+        schemes = [Scheme.objects.create(title=title, department=department) for title in titles]
+        queryset = Scheme.objects.select_related('department').prefetch_related(
+            'tags', 'beneficiaries', 'sponsors'
+        ).order_by('id')
+
+        with tempfile.TemporaryDirectory() as directory:
+            build_similarity_store(queryset, k=2, directory=directory)
+            Scheme.objects.filter(id=schemes[3].id).update(title="Girls Scholarship Hostel")
+            removed_id = schemes[2].id
+            schemes[2].delete()
+            added = Scheme.objects.create(title="Farmer Crop Insurance", department=department)
+            update_similarity_store([removed_id, schemes[3].id, added.id], directory=directory)
+            store = SimilarityStore(directory)
+
+            self.assertEqual([i for i, _ in store.neighbours_for(schemes[0].id)][0], schemes[3].id)
+            self.assertEqual(store.neighbours_for(removed_id), [])
+            self.assertNotIn(removed_id, [i for i, _ in store.neighbours_for(schemes[1].id)])
+            self.assertIsNotNone(store.row_for(added.id))
+
+
+class CollaborativeModelTest(TestCase):
+    def test_trained_model_scores_users_and_falls_back_to_popular(self):
+        import tempfile
+        from django.contrib.auth import get_user_model
+        from .models import UserInteraction
+        from .utils.collaborative import CollaborativeModel, train_collaborative_model
+        User = get_user_model()
+        schemes = [Scheme.objects.create(title=f"Scheme {i}") for i in range(4)]
+        users = [User.objects.create_user(email=f"user{i}@example.com", username=f"user{i}") for i in range(3)]
+        for user, scheme, value in [
+            (users[0], schemes[0], 2.0), (users[0], schemes[1], 1.0),
+            (users[1], schemes[0], 2.0), (users[1], schemes[1], 2.0), (users[1], schemes[2], 1.0),
+            (users[2], schemes[0], 1.0), (users[2], schemes[3], 1.0),
+        ]:
+            UserInteraction.objects.create(user=user, scheme=scheme, interaction_value=value)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(train_collaborative_model(n_components=2, directory=directory), (3, 4))
+            model = CollaborativeModel(directory)
+            recommended = model.recommend(users[0].id, top_n=2)
+            self.assertEqual(len(recommended), 2)
+            self.assertIn(schemes[0].id, recommended)
+            self.assertEqual(model.recommend(-1, top_n=2), [schemes[0].id, schemes[1].id])
+
+    def test_retraining_swaps_snapshots_and_torn_models_fall_back_to_popular(self):
+        import os
+        import tempfile
+        import numpy as np
+        from .utils.collaborative import CollaborativeModel, save_collaborative_model
+        from .utils.snapshots import current_snapshot
+        with tempfile.TemporaryDirectory() as directory:
+            save_collaborative_model([1, 2], [10, 20, 30], np.eye(2), np.ones((3, 2)), [30, 20, 10], directory=directory)
+            first = CollaborativeModel(directory)
+            save_collaborative_model([1], [10, 20], np.ones((1, 2)), [[1.0, 0.0], [0.0, 2.0]], [10, 20],
+                                     directory=directory)
+            self.assertEqual(len(first.recommend(2, top_n=3)), 3)
+            self.assertEqual(CollaborativeModel(directory).recommend(1, top_n=1), [20])
+
+            np.save(os.path.join(current_snapshot(directory), 'item_factors.npy'), np.ones((5, 2), dtype=np.float32))
+            self.assertEqual(CollaborativeModel(directory).recommend(1, top_n=1), [10])
+            self.assertFalse(CollaborativeModel(directory).is_consistent())
+
+
+class SchemeLoaderTest(TestCase):
+    def state_data(self, description):
+        return {
+            "state_name": "goa",
+            "departments": [{
+                "department_name": "Social Welfare",
+                "organisations": [{
+                    "organisation_name": "Social Welfare",
+                    "schemes": [{
+                        "title": "Widow Pension", "description": description,
+                        "scheme_link": "https://socialwelfare.goa.gov.in/pension",
+                        "beneficiaries": ["Widows"], "documents": ["Aadhaar"], "sponsors": ["State"],
+                        "criteria": ["Resident of Goa"], "procedures": ["Apply online"],
+                        "tags": ["pension", "women"],
+                    }],
+                }],
+            }],
+        }
+
+    def test_reload_is_idempotent_and_updates_changed_fields(self):
+        from .utils.scheme_loader import SchemeLoader
+        loader = SchemeLoader()
+        loader.load_state(self.state_data("Monthly pension"))
+        scheme = Scheme.objects.get(title="Widow Pension")
+        self.assertEqual(scheme.department.state.state_name, "Goa")
+        self.assertEqual(sorted(scheme.tags.values_list('name', flat=True)), ["pension", "women"])
+        self.assertEqual(scheme.criteria.get().criteria_data, "Resident of Goa")
+
+        loader = SchemeLoader()
+        loader.load_state(self.state_data("Monthly pension"))
+        self.assertEqual(loader.rows_written, 0)
+
+        loader.load_state(self.state_data("Monthly pension of Rs 2000"))
+        self.assertEqual(loader.changeset(), {'new': [], 'updated': [scheme.id], 'removed': []})
+        self.assertEqual(Scheme.objects.get().description, "Monthly pension of Rs 2000")
+
+    def test_schemes_missing_from_scrape_are_reported_removed(self):
+        from .utils.scheme_loader import SchemeLoader
+        SchemeLoader().load_state(self.state_data("Monthly pension"))
+        scheme = Scheme.objects.get(title="Widow Pension")
+        state_data = self.state_data("Monthly pension")
+        state_data["departments"][0]["organisations"][0]["schemes"] = []
+
+        loader = SchemeLoader()
+        loader.load_state(state_data)
+        self.assertEqual(loader.changeset()['removed'], [scheme.id])
+
+
+class ParallelSchemeLoaderTest(TransactionTestCase):
+    def setUp(self):
+        from django.db import connection
+        if connection.vendor == 'sqlite':
+            self.skipTest("worker processes need a database that takes concurrent writers")
+
+    def write_fixture(self, directory):
+        import json
+        import os
+        states = []
+        for state_name in ("goa", "kerala", "assam"):
+            states.append({
+                "state_name": state_name,
+                "departments": [{
+                    "department_name": "Social Welfare",
+                    "organisations": [{
+                        "organisation_name": "Social Welfare",
+                        "schemes": [{
+                            "title": f"{title} {state_name}", "description": "Monthly support",
+                            "beneficiaries": ["Widows", f"Residents of {state_name}"], "documents": ["Aadhaar"],
+                            "sponsors": ["State"], "criteria": ["Resident"], "procedures": ["Apply online"],
+                            "tags": ["pension", "women", state_name],
+                        } for title in ("Widow Pension", "Old Age Pension")],
+                    }],
+                }],
+            })
+        path = os.path.join(directory, "combined.json")
+        with open(path, "w") as f:
+            json.dump({"states": states}, f)
+        return path
+
+    def loaded(self, changeset):
+        schemes = {
+            scheme.id: (
+                scheme.department.state.state_name, scheme.title,
+                tuple(sorted(scheme.tags.values_list('name', flat=True))),
+                tuple(sorted(scheme.beneficiaries.values_list('beneficiary_type', flat=True))),
+            ) for scheme in Scheme.objects.select_related('department__state')
+        }
+        titles = {name: sorted(schemes[i][1] for i in ids) for name, ids in changeset.items()}
+        return sorted(schemes.values()), titles
+
+    def test_parallel_load_matches_serial_load(self):
+        import tempfile
+        from .utils.scheme_loader import load_file
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_fixture(directory)
+            serial = self.loaded(load_file(path, workers=1).changeset())
+            for model in (Scheme, Department, State, Tag, Beneficiary, Document, Sponsor):
+                model.objects.all().delete()
+
+            loader = load_file(path, workers=2)
+            self.assertEqual(self.loaded(loader.changeset()), serial)
+            self.assertEqual(Tag.objects.filter(name__in=["pension", "women"]).count(), 2)
+            self.assertEqual(Beneficiary.objects.filter(beneficiary_type="Widows").count(), 1)
+            self.assertEqual(Document.objects.count(), 1)
+
+            reloaded = load_file(path, workers=2)
+            self.assertEqual(reloaded.rows_written, 0)
+            self.assertEqual(reloaded.changeset(), {'new': [], 'updated': [], 'removed': []})
+
+
+try:
+    import moto
+except ImportError:
+    moto = None
+
+
+@skipUnless(moto, "moto is not installed")
+class PdfTransferEngineTest(TestCase):
+    def setUp(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        self.failures = {'/flaky.pdf': 1}
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if test.failures.get(self.path):
+                    test.failures[self.path] -= 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = self.path.encode() * 1000
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', f'"{self.path}"')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_uploads_retries_and_skips_unchanged(self):
+        import boto3
+        from .utils.pdf_transfer import PdfTransferEngine
+        with moto.mock_aws():
+            s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='test', aws_secret_access_key='test')
+            s3.create_bucket(Bucket='pdfs')
+            items = [{'url': f"{self.base_url}/{name}.pdf", 'key': f"pdfs/goa/{name}.pdf", 'metadata': {'id': name}}
+                     for name in ('a', 'b', 'flaky')]
+            engine = PdfTransferEngine(s3, 'pdfs', max_workers=3, per_host=2, backoff=0.01)
+
+            stats = engine.run(items)
+            self.assertEqual((stats.uploaded, stats.skipped, stats.failed), (3, 0, 0))
+            body = s3.get_object(Bucket='pdfs', Key='pdfs/goa/a.pdf')['Body'].read()
+            self.assertEqual(body, b'/a.pdf' * 1000)
+
+            stats = engine.run(items)
+            self.assertEqual((stats.uploaded, stats.skipped, stats.failed), (0, 3, 0))
+
+
+@skipUnless(moto, "moto is not installed")
+class S3PdfListingTest(TestCase):
+    def test_manifest_limits_head_calls_to_new_or_changed_objects(self):
+        import os
+        import tempfile
+        import boto3
+        from .management.commands.listDownloadFromS3 import list_pdfs_in_directory
+        with moto.mock_aws(), tempfile.TemporaryDirectory() as directory:
+            s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='test', aws_secret_access_key='test')
+            s3.create_bucket(Bucket='pdfs')
+            for name in ('a', 'b', 'c'):
+                s3.put_object(Bucket='pdfs', Key=f"pdfs/goa/{name}.pdf", Body=name.encode(), Metadata={'id': name})
+            heads = []
+            s3.meta.events.register('before-call.s3.HeadObject', lambda **kwargs: heads.append(1))
+            manifest_path = os.path.join(directory, 'goa.json')
+
+            listed = list_pdfs_in_directory('goa', client=s3, bucket='pdfs', manifest_path=manifest_path)
+            self.assertEqual(sorted(pdf['metadata']['id'] for pdf in listed), ['a', 'b', 'c'])
+            self.assertEqual(len(heads), 3)
+
+            s3.put_object(Bucket='pdfs', Key="pdfs/goa/a.pdf", Body=b'changed', Metadata={'id': 'a2'})
+            listed = list_pdfs_in_directory('goa', client=s3, bucket='pdfs', manifest_path=manifest_path)
+            self.assertEqual(sorted(pdf['metadata']['id'] for pdf in listed), ['a2', 'b', 'c'])
+            self.assertEqual(len(heads), 4)
+
+
+def make_pdf(pages):
+    """A minimal PDF with one line of Helvetica text per page."""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+class PdfExtractionServiceTest(TestCase):
+    def test_extracts_in_parallel_with_limits_and_hash_cache(self):
+        import os
+        import tempfile
+        from .utils.pdf_text import PdfExtractionService, PdfTextCache
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {}
+            for name, pages in [('long', ["Widow pension", "Eligibility", "Documents"]), ('short', ["Scholarship"])]:
+                paths[name] = os.path.join(directory, f'{name}.pdf')
+                with open(paths[name], 'wb') as f:
+                    f.write(make_pdf(pages))
+            cache = PdfTextCache(os.path.join(directory, 'cache'))
+
+            texts, stats = PdfExtractionService(max_workers=2, max_pages=2, cache=cache).extract_many(paths.values())
+            self.assertIn("Eligibility", texts[paths['long']])
+            self.assertNotIn("Documents", texts[paths['long']])
+            self.assertIn("Scholarship", texts[paths['short']])
+            self.assertEqual((stats.pages, stats.cached, stats.failed), (3, 0, 0))
+
+            texts, stats = PdfExtractionService(max_workers=2, max_pages=2, cache=cache).extract_many(paths.values())
+            self.assertEqual((stats.pages, stats.cached), (3, 2))
+            # A higher page limit re-parses only the document that was cut short.
+            texts, stats = PdfExtractionService(max_workers=2, max_pages=5, cache=cache).extract_many(paths.values())
+            self.assertIn("Documents", texts[paths['long']])
+            self.assertEqual((stats.pages, stats.cached), (4, 1))
+
+    def test_documents_held_between_download_and_parse_are_bounded(self):
+        import os
+        import tempfile
+        import threading
+        from unittest import mock
+        from .utils.pdf_text import PdfExtractionService, PdfTextCache
+        peak = {'held': 0, 'max': 0}
+        lock = threading.Lock()
+
+        class CountingSemaphore(threading.BoundedSemaphore):
+            def acquire(self, *args, **kwargs):
+                acquired = super().acquire(*args, **kwargs)
+                with lock:
+                    peak['held'] += 1
+                    peak['max'] = max(peak['max'], peak['held'])
+                return acquired
+
+            def release(self, *args, **kwargs):
+                with lock:
+                    peak['held'] -= 1
+                super().release(*args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i in range(8):
+                paths.append(os.path.join(directory, f'{i}.pdf'))
+                with open(paths[-1], 'wb') as f:
+                    f.write(make_pdf([f"Scheme number {i}"]))
+            service = PdfExtractionService(max_workers=1, download_workers=4, max_in_flight=2,
+                                           cache=PdfTextCache(os.path.join(directory, 'cache')))
+            with mock.patch('communityEmpowerment.utils.pdf_text.threading.BoundedSemaphore', CountingSemaphore):
+                texts, stats = service.extract_many(paths)
+
+        self.assertEqual([f"Scheme number {i}" in texts[path] for i, path in enumerate(paths)], [True] * 8)
+        self.assertEqual((stats.documents, stats.failed), (8, 0))
+        self.assertLessEqual(peak['max'], 2)
+        self.assertEqual(peak['held'], 0)
+
+    def test_oversized_document_is_rejected(self):
+        import os
+        import tempfile
+        from .utils.pdf_text import PdfExtractionService, PdfTextCache
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'big.pdf')
+            with open(path, 'wb') as f:
+                f.write(make_pdf(["Housing subsidy"]))
+            service = PdfExtractionService(max_workers=1, max_bytes=100, cache=PdfTextCache(directory))
+            texts, stats = service.extract_many([path])
+            self.assertIsNone(texts[path])
+            self.assertEqual(stats.failed, 1)
+
+
+class FakeQuotaError(Exception):
+    pass
+
+
+class FakeGeminiClient:
+    """Stands in for a per-key Gemini client: requests sent with it go out on `api_key`."""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+
+class FakeGemini:
+    """Stands in for process_and_structure_document: fixed latency and call quotas for some keys."""
+
+    def __init__(self, quotas, latency=0.05, broken=()):
+        import threading
+        self.quotas = dict(quotas)
+        self.latency = latency
+        self.broken = set(broken)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, text, client):
+        import time
+        api_key = client.api_key
+        with self.lock:
+            self.calls.append((text, api_key))
+            if api_key in self.quotas:
+                if self.quotas[api_key] <= 0:
+                    raise FakeQuotaError(api_key)
+                self.quotas[api_key] -= 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        if text in self.broken:
+            raise RuntimeError("malformed response")
+        return {"title": text.upper()}
+
+
+class StructuringSchedulerTest(TestCase):
+    def scheduler(self, fake, checkpoint=None, pool=None):
+        from .utils.llm_scheduler import KeyPool, StructuringScheduler
+        pool = pool or KeyPool(["key-a", "key-b", None], requests_per_minute=6000, cooldown=60,
+                               client=FakeGeminiClient)
+        return StructuringScheduler(fake, pool, quota_errors=(FakeQuotaError,), max_in_flight=4,
+                                    retries=0, backoff=0, checkpoint=checkpoint)
+
+    def test_routes_around_exhausted_key_with_requests_in_flight(self):
+        fake = FakeGemini({"key-a": 1})
+        results = self.scheduler(fake).run({f"doc{i}": f"scheme {i}" for i in range(8)})
+
+        self.assertEqual(results, {f"doc{i}": {"title": f"SCHEME {i}"} for i in range(8)})
+        self.assertGreater(fake.max_in_flight, 1)
+        # key-a is cooled down after its first quota error instead of being retried.
+        self.assertEqual(sum(1 for _, key in fake.calls if key == "key-a"), 2)
+
+    def test_requests_go_out_on_the_key_they_are_charged_to(self):
+        import threading
+        import time
+        from .utils.llm_scheduler import KeyPool
+        built = []
+
+        def client(api_key):
+            built.append(api_key)
+            return FakeGeminiClient(api_key)
+
+        pool = KeyPool(["key-a", "key-b"], requests_per_minute=6000, cooldown=60, client=client)
+        charged = threading.local()
+        acquire = pool.acquire
+
+        def charging_acquire():
+            charged.key = acquire()
+            return charged.key
+
+        pool.acquire = charging_acquire
+        mismatches = []
+
+        class CheckingGemini(FakeGemini):
+            def __call__(self, text, client):
+                if client.api_key != charged.key:
+                    mismatches.append((charged.key, client.api_key))
+                return super().__call__(text, client)
+
+        fake = CheckingGemini({"key-a": 1})
+        self.scheduler(fake, pool=pool).run({f"doc{i}": f"scheme {i}" for i in range(8)})
+
+        self.assertEqual(mismatches, [])
+        self.assertGreater(fake.max_in_flight, 1)
+        # One client per key, reused by every request on it.
+        self.assertEqual(sorted(built), ["key-a", "key-b"])
+        # The quota error is charged to the key that hit it, and only to that key.
+        self.assertGreater(pool.bucket("key-a").blocked_until, time.monotonic())
+        self.assertEqual(pool.bucket("key-b").blocked_until, 0.0)
+
+    def test_checkpoint_resumes_only_unfinished_documents(self):
+        import os
+        import tempfile
+        from .utils.llm_scheduler import Checkpoint
+        jobs = {"a": "widow pension", "b": "scholarship", "c": "housing"}
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, 'goa.checkpoint.jsonl'))
+            results = self.scheduler(FakeGemini({}, broken={"housing"}), checkpoint).run(jobs)
+            self.assertIsNone(results["c"])
+
+            fake = FakeGemini({})
+            results = self.scheduler(fake, checkpoint).run(jobs)
+            self.assertEqual([text for text, _ in fake.calls], ["housing"])
+            self.assertEqual(results, {"a": {"title": "WIDOW PENSION"}, "b": {"title": "SCHOLARSHIP"},
+                                       "c": {"title": "HOUSING"}})
+
+
+    def test_checkpoint_creates_its_directory_and_failures_do_not_abort_the_run(self):
+        import os
+        import tempfile
+        from unittest import mock
+        from .utils.llm_scheduler import Checkpoint
+        jobs = {"a": "widow pension", "b": "scholarship"}
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, 'structuredData', 'goa.checkpoint.jsonl'))
+            self.scheduler(FakeGemini({}), checkpoint).run(jobs)
+            self.assertEqual(checkpoint.load(), {"a": {"title": "WIDOW PENSION"}, "b": {"title": "SCHOLARSHIP"}})
+
+            checkpoint = Checkpoint(os.path.join(directory, 'broken.checkpoint.jsonl'))
+            with mock.patch.object(Checkpoint, 'record', side_effect=OSError("disk full")):
+                results = self.scheduler(FakeGemini({}), checkpoint).run(jobs)
+            self.assertEqual(results, {"a": {"title": "WIDOW PENSION"}, "b": {"title": "SCHOLARSHIP"}})
+
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+
+@skipUnless(genai, "google-generativeai is not installed")
+class GeminiClientTest(TestCase):
+    def load_structure_gemini(self):
+        import importlib.util
+        import os
+        path = os.path.join(os.path.dirname(__file__), 'management', 'commands', 'geminiAndParsingScripts',
+                            'structureGemini.py')
+        spec = importlib.util.spec_from_file_location('structureGemini', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_each_request_goes_out_on_the_charged_keys_client(self):
+        import threading
+        from unittest import mock
+        from .utils.llm_scheduler import KeyPool, StructuringScheduler
+        structure_gemini = self.load_structure_gemini()
+        glm = structure_gemini.glm
+        charged = threading.local()
+        sent = []
+
+        class Service:
+            def __init__(self, client_options):
+                self.api_key = client_options["api_key"]
+
+            def generate_content(self, request, timeout):
+                sent.append((charged.key, self.api_key, request))
+                return glm.GenerateContentResponse()
+
+        with mock.patch.object(glm, 'GenerativeServiceClient', Service):
+            pool = KeyPool(["key-a", "key-b"], requests_per_minute=6000, client=structure_gemini.gemini_client)
+            acquire = pool.acquire
+
+            def charging_acquire():
+                charged.key = acquire()
+                return charged.key
+
+            pool.acquire = charging_acquire
+            StructuringScheduler(structure_gemini.process_and_structure_document, pool, max_in_flight=4).run(
+                {f"doc{i}": f"scheme {i}" for i in range(6)}
+            )
+
+        self.assertEqual(len(sent), 6)
+        self.assertEqual({key for key, _, _ in sent}, {"key-a", "key-b"})
+        for charged_key, sent_key, request in sent:
+            self.assertEqual(sent_key, charged_key)
+            self.assertEqual(request.model, structure_gemini.MODEL_NAME)
+            self.assertEqual(request.tool_config.function_calling_config.mode, glm.FunctionCallingConfig.Mode.ANY)
+
+
+class StructuredResultCacheTest(TestCase):
+    def test_key_covers_document_model_and_prompt_version(self):
+        from .utils.structured_cache import result_key
+        key = result_key("Widow pension", "gemini-1.5-pro", 1)
+        self.assertEqual(key, result_key("Widow pension", "gemini-1.5-pro", 1))
+        self.assertNotEqual(key, result_key("Widow pension ", "gemini-1.5-pro", 1))
+        self.assertNotEqual(key, result_key("Widow pension", "gemini-1.5-flash", 1))
+        self.assertNotEqual(key, result_key("Widow pension", "gemini-1.5-pro", 2))
+        self.assertEqual(result_key({"b": 1, "a": 2}, "m", 1), result_key({"a": 2, "b": 1}, "m", 1))
+
+    def test_counts_hits_and_evicts_least_recently_used(self):
+        import os
+        import tempfile
+        import time
+        from .utils.structured_cache import StructuredResultCache, result_key
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StructuredResultCache(directory, max_bytes=2500)
+            keys = [result_key(f"scheme {i}", "m", 1) for i in range(3)]
+            for i, key in enumerate(keys[:2]):
+                cache.set(key, {"title": f"Scheme {i}", "description": "x" * 1000})
+            old = time.time() - 60
+            os.utime(cache.path(keys[1]), (old, old))
+            self.assertEqual(cache.get(keys[0])["title"], "Scheme 0")
+            self.assertIsNone(cache.get(keys[2]))
+
+            cache.set(keys[2], {"title": "Scheme 2", "description": "x" * 1000})
+            self.assertIsNone(cache.get(keys[1]))
+            self.assertIsNotNone(cache.get(keys[0]))
+            self.assertEqual((cache.hits, cache.misses, cache.stores, cache.evictions), (2, 2, 3, 1))
+
+
+class RunAllScriptsSchedulerTest(TestCase):
+    def test_build_jobs_wires_every_stage(self):
+        from .management.commands.Scrapers.runAllScripts import PDF_STATES, SCRAPERS, build_jobs
+        jobs = {job.name: job for job in build_jobs("/scrapers", scraper_timeout=900, stage_timeout=None, retries=1)}
+        for job in jobs.values():
+            self.assertTrue(set(job.requires + job.after) <= set(jobs), job.name)
+        self.assertEqual(jobs["scrape:kerala"].timeout, 900)
+        self.assertEqual(jobs["pdf:goa"].requires, ["scrape:goa"])
+        self.assertEqual(set(jobs["structureScrapedSchemes"].after), {f"scrape:{state}" for state in SCRAPERS} | {"pdfParser"})
+        self.assertEqual(set(jobs["pdfParser"].after), {f"pdf:{state}" for state in PDF_STATES})
+        self.assertEqual(jobs["load_data"].requires, ["converted_combined"])
+        for name in ("pdfParser", "structureScrapedSchemes", "converted_combined", "load_data"):
+            self.assertIsNone(jobs[name].timeout)
+
+    def test_runner_retries_skips_and_times_out_stub_scripts(self):
+        import io
+        import os
+        import sys
+        import tempfile
+        from .management.commands.Scrapers.runAllScripts import Command, Job
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, "log")
+            counter = os.path.join(directory, "counter")
+
+            def stub(name, code="", exit_code=0):
+                return [sys.executable, "-c",
+                        f"import sys\nopen({log!r}, 'a').write({name!r} + '\\n')\n{code}\nsys.exit({exit_code})"]
+
+            flaky = (f"import os\ntries = int(open({counter!r}).read()) if os.path.exists({counter!r}) else 0\n"
+                     f"open({counter!r}, 'w').write(str(tries + 1))\nsys.exit(0 if tries else 1)")
+            jobs = [
+                Job("ok", stub("ok")),
+                Job("broken", stub("broken", exit_code=1), retries=1),
+                Job("needs_broken", stub("needs_broken"), requires=["broken"]),
+                Job("after_both", stub("after_both"), after=["ok", "broken"]),
+                Job("slow", stub("slow", "import time\ntime.sleep(10)"), timeout=0.5),
+                Job("flaky", stub("flaky", flaky), retries=1),
+            ]
+            Command(stdout=io.StringIO(), stderr=io.StringIO()).run_jobs(jobs, workers=3, retry_delay=0)
+            with open(log) as f:
+                runs = f.read().split()
+
+        status = {job.name: (job.status, job.attempts) for job in jobs}
+        self.assertEqual(status, {
+            "ok": ("ok", 1), "broken": ("failed", 2), "needs_broken": ("skipped", 0),
+            "after_both": ("ok", 1), "slow": ("timeout", 1), "flaky": ("ok", 2),
+        })
+        self.assertNotIn("needs_broken", runs)
+        self.assertGreater(runs.index("after_both"), max(i for i, name in enumerate(runs) if name in ("ok", "broken")))
+
+
+class CombineStateFilesTest(TestCase):
+    def test_streams_states_merging_departments_by_name(self):
+        import json
+        import os
+        import tempfile
+        from .management.commands.converted_combined import (
+            combine_state_files, transform_and_add_goa_data, transform_and_add_state_data,
+        )
+        items = {
+            'kerala.json': [
+                {"title": "1. Widow Pension", "department_name": "Social Justice", "description": "Pension\\n"},
+                {"title": "Scholarship", "department_name": "Education", "description": "For students"},
+            ],
+            'kerala_more.json': [{"title": "Housing", "department_name": "Social Justice", "description": "Homes"}],
+            'goa.json': [{"title": "Farm Loan", "department_name": "Agriculture", "schemeUrl": "https://goa.gov.in"}],
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for name, data in items.items():
+                with open(os.path.join(directory, name), 'w') as f:
+                    json.dump(data, f)
+            output_path = os.path.join(directory, 'combined.json')
+            sources = [
+                ("Kerala", "kerala.json", transform_and_add_state_data),
+                ("Goa", "goa.json", transform_and_add_goa_data),
+                ("Kerala", "kerala_more.json", transform_and_add_state_data),
+            ]
+            self.assertEqual(combine_state_files(output_path, base_dir=directory, sources=sources), (2, 4))
+
+            with open(output_path, encoding='utf-8') as f:
+                written = f.read()
+            combined = json.loads(written)
+            self.assertEqual(written, json.dumps(combined, ensure_ascii=False, indent=4))
+
+        kerala, goa = combined["states"]
+        self.assertEqual([d["department_name"] for d in kerala["departments"]], ["Social Justice", "Education"])
+        social_justice = kerala["departments"][0]["organisations"][0]["schemes"]
+        self.assertEqual([(s["title"], s["description"]) for s in social_justice],
+                         [("Widow Pension", "Pension"), ("Housing", "Homes")])
+        self.assertEqual(goa["departments"][0]["organisations"][0]["schemes"][0]["scheme_link"], "https://goa.gov.in")
+
+
+class TagClassifierTest(TestCase):
+    def test_first_matching_category_wins(self):
+        from .utils.tag_classifier import classify_tags
+        names = ["Post-Matric Scholarship for SC", "SC Students", "Rescue", "Obc", "Old Age Home", "", None]
+        self.assertEqual(classify_tags(names),
+                         ["scholarship", "sc", "general", "obc", "senior_citizen", "general", "general"])
+        self.assertEqual(Tag.objects.create(name="SC/ST Hostel").category, "sc")
+
+    def test_command_updates_only_stale_categories(self):
+        import io
+        from django.core.management import call_command
+        Tag.objects.create(name="Scholarship")
+        stale = Tag.objects.create(name="Women Empowerment")
+        Tag.objects.filter(pk=stale.pk).update(category="general")
+
+        out = io.StringIO()
+        call_command('categorize_tags', '--dry-run', stdout=out)
+        self.assertIn("1 of 2 tags would change", out.getvalue())
+        self.assertRegex(out.getvalue(), r"women\s+0\s+1\s+\+1")
+        self.assertEqual(Tag.objects.get(pk=stale.pk).category, "general")
+
+        from .utils.cache_versions import get_versions
+        from .utils.facet_index import get_generation
+        versions, generation = get_versions(['tags']), get_generation()
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks(execute=True):
+            call_command('categorize_tags', '--chunk-size', '1', stdout=io.StringIO())
+        self.assertEqual(Tag.objects.get(pk=stale.pk).category, "women")
+        self.assertNotEqual(get_versions(['tags']), versions)
+        self.assertNotEqual(get_generation(), generation)
+        self.assertEqual(Tag.objects.get(name="Scholarship").category, "scholarship")
+
+
+class SchemeListQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        state = State.objects.create(state_name="Odisha")
+        department = Department.objects.create(state=state, department_name="Education Department")
+        beneficiary = Beneficiary.objects.create(beneficiary_type="Students")
+        sponsor = Sponsor.objects.create(sponsor_type="State")
+        benefit = Benefit.objects.create(benefit_type="Cash")
+        tags = [Tag.objects.create(name=name) for name in ("Scholarship", "Employment")]
+        for i in range(12):
+            scheme = Scheme.objects.create(title=f"Scheme {i}", department=department)
+            scheme.beneficiaries.add(beneficiary)
+            scheme.sponsors.add(sponsor)
+            scheme.benefits.add(benefit)
+            scheme.tags.add(*tags)
+        cls.state = state
+        cls.user = CustomUser.objects.create_user(email="reader@example.com", username="reader")
+        cls.user.saved_schemes.add(*Scheme.objects.all())
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def page_queries(self, view, limit, method='get', data=None, user=None, **kwargs):
+        """Queries for one page with cold caches."""
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        factory = APIRequestFactory()
+        if method == 'post':
+            request = factory.post(f'/?limit={limit}', data or {}, format='json')
+        else:
+            request = factory.get('/', {'limit': limit, **(data or {})})
+        if user is not None:
+            force_authenticate(request, user=user)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = view.as_view()(request, **kwargs)
+        self.assertEqual(len(response.data['results']), limit)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        from .views import (
+            SchemeListAPIView, StateSchemesListAPIView, ScholarshipSchemesListView, JobSchemesListView,
+            UnifiedSchemesAPIView, UserSavedSchemesView,
+        )
+        cases = [
+            (UserSavedSchemesView, {'user': self.user}),
+            (SchemeListAPIView, {}),
+            (StateSchemesListAPIView, {'state_id': self.state.id}),
+            (ScholarshipSchemesListView, {}),
+            (JobSchemesListView, {}),
+        ]
+        for view, kwargs in cases:
+            with self.subTest(view=view.__name__):
+                self.assertEqual(self.page_queries(view, 2, **kwargs), self.page_queries(view, 10, **kwargs))
+        self.assertEqual(self.page_queries(UnifiedSchemesAPIView, 2, 'post', {'state_ids': []}),
+                         self.page_queries(UnifiedSchemesAPIView, 10, 'post', {'state_ids': []}))
+
+    def test_compact_view_returns_card_rows(self):
+        from rest_framework.test import APIRequestFactory
+        from .views import SchemeListAPIView, UnifiedSchemesAPIView
+        factory = APIRequestFactory()
+        with self.assertNumQueries(4):
+            response = SchemeListAPIView.as_view()(factory.get('/', {'limit': 10, 'view': 'compact', 'ordering': 'title'}))
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(response.data['results'][0], {
+            'id': Scheme.objects.get(title="Scheme 0").id, 'title': "Scheme 0", 'state': "Odisha",
+            'department': "Education Department", 'tags': ["Employment", "Scholarship"],
+        })
+
+        response = UnifiedSchemesAPIView.as_view()(factory.post('/?limit=3', {'view': 'compact'}, format='json'))
+        self.assertEqual([row['title'] for row in response.data['results']], ["Scheme 0", "Scheme 1", "Scheme 10"])
+
+
+class CacheMiddlewareVersioningTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.state = State.objects.create(state_name="Assam")
+        self.department = Department.objects.create(state=self.state, department_name="Health Department")
+        self.calls = 0
+
+    def get(self, path):
+        from django.http import JsonResponse
+        from django.test import RequestFactory
+        from .middleware import CacheMiddleware
+
+        def view(request):
+            self.calls += 1
+            return JsonResponse({"titles": list(Scheme.objects.values_list('title', flat=True))})
+
+        return CacheMiddleware(view)(RequestFactory().get(path))
+
+    def test_model_writes_start_a_new_generation(self):
+        self.assertEqual(self.get('/api/schemes/').content, self.get('/api/schemes/').content)
+        self.get('/api/organisations/')
+        self.assertEqual(self.calls, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Scheme.objects.create(title="Free Ambulance", department=self.department)
+        self.assertIn(b"Free Ambulance", self.get('/api/schemes/').content)
+        self.get('/api/organisations/')
+        self.assertEqual(self.calls, 3)
+
+        scheme = Scheme.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            scheme.tags.add(Tag.objects.create(name="Health"))
+        self.get('/api/schemes/')
+        self.assertEqual(self.calls, 4)
+
+
+class SchemeFilterCacheTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .utils.facet_index import scheme_facet_index
+        cache.clear()
+        state = State.objects.create(state_name="Bihar")
+        department = Department.objects.create(state=state, department_name="Agriculture Department")
+        for title in ("Seed Subsidy", "Crop Insurance", "Farm Loan"):
+            scheme = Scheme.objects.create(title=title, department=department)
+            scheme.tags.add(Tag.objects.get_or_create(name="Farmer Welfare")[0])
+        scheme_facet_index.invalidate()
+        self.state = state
+
+    def post(self, body, limit):
+        from rest_framework.test import APIRequestFactory
+        from .views import UnifiedSchemesAPIView
+        request = APIRequestFactory().post(f'/?limit={limit}', body, format='json')
+        return UnifiedSchemesAPIView.as_view()(request).data
+
+    def test_equivalent_bodies_share_one_ordered_id_list(self):
+        from .utils.filter_cache import canonical_filters
+        body = {"state_ids": [self.state.id, str(self.state.id)], "tag": " Farmer ", "beneficiary_keywords": []}
+        same = {"tag": "farmer", "state_ids": [self.state.id], "ordering": ["title"]}
+        self.assertEqual(canonical_filters(body, [], ["title"]), canonical_filters(same, [], "title"))
+
+        first = self.post(body, 2)
+        self.assertEqual([s['title'] for s in first['results']], ["Crop Insurance", "Farm Loan"])
+        # The id list comes from the cache; only the page is loaded (the
+        # schemes with their department and state, then five prefetches).
+        with self.assertNumQueries(6):
+            second = self.post(same, 3)
+        self.assertEqual([s['title'] for s in second['results']], ["Crop Insurance", "Farm Loan", "Seed Subsidy"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Scheme.objects.filter(title="Seed Subsidy").get().delete()
+        self.assertEqual(self.post(same, 3)['count'], 2)
+
+
+class SchemeFragmentCacheTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        state = State.objects.create(state_name="Manipur")
+        department = Department.objects.create(state=state, department_name="Fisheries Department")
+        self.schemes = [Scheme.objects.create(title=f"Pond Scheme {i}", department=department) for i in range(3)]
+        self.tag = Tag.objects.create(name="Fisheries")
+        for scheme in self.schemes:
+            scheme.tags.add(self.tag)
+
+    def test_page_is_served_from_fragments_until_a_scheme_or_shared_row_changes(self):
+        from .utils.scheme_fragments import serialized_schemes
+        ids = [scheme.id for scheme in self.schemes]
+        first = serialized_schemes(ids)
+        with self.assertNumQueries(0):
+            self.assertEqual(serialized_schemes(ids), first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Scheme.objects.filter(id=ids[1]).get().save()
+        with self.assertNumQueries(6):
+            serialized_schemes(ids)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.name = "Inland Fisheries"
+            self.tag.save()
+        self.assertEqual([data['tags'][0]['name'] for data in serialized_schemes(ids)], ["Inland Fisheries"] * 3)
+
+    def test_fragment_written_back_after_invalidation_is_never_served(self):
+        from django.core.cache import cache
+        from .utils.scheme_fragments import fragment_generation, fragment_keys, serialized_schemes
+        scheme = self.schemes[0]
+        stale = serialized_schemes([scheme.id])[0]
+        # A reader picked its keys and loaded the old row just before the write...
+        keys = fragment_keys([scheme.id], fragment_generation())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            scheme.title = "Pond Scheme Renamed"
+            scheme.save()
+        # ...and writes its fragment back only after the write invalidated it.
+        cache.set_many({keys[scheme.id]: stale})
+
+        self.assertEqual(serialized_schemes([scheme.id])[0]['title'], "Pond Scheme Renamed")
+
+
+class CacheFillTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        import time
+        self.calls += 1
+        time.sleep(0.2)
+        return ["fresh"]
+
+    def test_concurrent_misses_compute_once(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from .utils.cache_fill import get_or_fill
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: get_or_fill("fill-test", self.compute, 60), range(8)))
+        self.assertEqual(results, [["fresh"]] * 8)
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_value_is_served_while_another_request_refills(self):
+        import time
+        from django.core.cache import cache
+        from .utils.cache_fill import get_or_fill, lock_key
+        cache.set("fill-test", (["stale"], 0.1, time.time() - 1), timeout=60)
+        cache.add(lock_key("fill-test"), "someone-else", timeout=30)
+        self.assertEqual(get_or_fill("fill-test", self.compute, 60), ["stale"])
+        self.assertEqual(self.calls, 0)
+
+        cache.delete(lock_key("fill-test"))
+        self.assertEqual(get_or_fill("fill-test", self.compute, 60), ["fresh"])
+        self.assertEqual(get_or_fill("fill-test", self.compute, 60), ["fresh"])
+        self.assertEqual(self.calls, 1)
+
+    def test_refresh_comes_early_only_near_expiry(self):
+        import time
+        from unittest import mock
+        from .utils.cache_fill import refresh_due
+        with mock.patch("random.random", return_value=0.99):
+            self.assertTrue(refresh_due(1.0, time.time() + 1))
+            self.assertFalse(refresh_due(1.0, time.time() + 600))
+        self.assertTrue(refresh_due(0.0, time.time() - 1))
+
+    def test_vetoed_values_are_not_stored(self):
+        from .utils.cache_fill import get_or_fill
+        get_or_fill("fill-test", self.compute, 60, cacheable=lambda value: False)
+        get_or_fill("fill-test", self.compute, 60, cacheable=lambda value: False)
+        self.assertEqual(self.calls, 2)
+
+    def concurrent_fills(self, compute, **kwargs):
+        """One fill, then four waiters that arrive while it holds the lock: (outcomes, seconds taken)."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from .utils.cache_fill import get_or_fill, lock_key
+        from django.core.cache import cache
+
+        def fill(_):
+            try:
+                return get_or_fill("fill-test", compute, 60, wait=5.0, **kwargs)
+            except RuntimeError as e:
+                return str(e)
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            first = pool.submit(fill, None)
+            while cache.get(lock_key("fill-test")) is None:
+                time.sleep(0.01)
+            waiters = list(pool.map(fill, range(4)))
+        return [first.result()] + waiters, time.monotonic() - start
+
+    def test_waiters_stop_waiting_when_the_fill_is_vetoed(self):
+        outcomes, seconds = self.concurrent_fills(self.compute, cacheable=lambda value: False)
+        self.assertEqual(outcomes, [["fresh"]] * 5)
+        self.assertEqual(self.calls, 5)
+        # Well short of the 5s the waiters would otherwise sit out.
+        self.assertLess(seconds, 2.0)
+
+    def test_waiters_stop_waiting_when_the_fill_raises(self):
+        import threading
+        import time
+        lock = threading.Lock()
+
+        def compute():
+            with lock:
+                self.calls += 1
+                call = self.calls
+            time.sleep(0.2)
+            if call == 1:
+                raise RuntimeError("database went away")
+            return ["fresh"]
+
+        outcomes, seconds = self.concurrent_fills(compute)
+        self.assertEqual(outcomes, ["database went away"] + [["fresh"]] * 4)
+        self.assertLess(seconds, 2.0)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.state = State.objects.create(state_name="Kerala")
+        department = Department.objects.create(state=self.state, department_name="Ports Department")
+        Scheme.objects.create(title="Boat Subsidy", department=department)
+
+    def get(self, view, path='/', **headers):
+        from rest_framework.test import APIRequestFactory
+        return view.as_view()(APIRequestFactory().get(path, **headers))
+
+    def test_unchanged_state_list_is_answered_with_304_before_querying(self):
+        from .views import StateListAPIView
+        response = self.get(StateListAPIView)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(StateListAPIView, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        last_modified = response['Last-Modified']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(StateListAPIView, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            State.objects.create(state_name="Goa")
+        response = self.get(StateListAPIView, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_admin_only_faq_reads_are_not_answered_with_304(self):
+        from rest_framework.test import APIRequestFactory
+        from .utils.cache_versions import get_versions
+        from .utils.conditional_get import response_etag
+        from .views import FAQViewSet
+        request = APIRequestFactory().get('/api/faqs/1/')
+        etag = response_etag(request, get_versions(['faqs']))
+        view = FAQViewSet.as_view({'get': 'retrieve'})
+        response = view(APIRequestFactory().get('/api/faqs/1/', HTTP_IF_NONE_MATCH=etag), pk=1)
+        self.assertIn(response.status_code, (401, 403))
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_scheme_list_etag_follows_scheme_namespaces(self):
+        from .views import SchemeListAPIView, LayoutItemViewSet
+        from .models import Announcement, LayoutItem
+        etag = self.get(SchemeListAPIView)['ETag']
+        self.assertNotEqual(self.get(SchemeListAPIView, '/?limit=5')['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(title="Exam dates", description="Out now.")
+        self.assertEqual(self.get(SchemeListAPIView, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Scheme.objects.get().tags.add(Tag.objects.create(name="Fisheries"))
+        self.assertEqual(self.get(SchemeListAPIView, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        from rest_framework.test import APIRequestFactory
+        layout = LayoutItemViewSet.as_view({'get': 'list'})
+        etag = layout(APIRequestFactory().get('/'))['ETag']
+        self.assertEqual(layout(APIRequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            LayoutItem.objects.create(column_name="jobs", is_active=True)
+        self.assertEqual(layout(APIRequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 200)
+
+    def test_cached_responses_keep_their_validators(self):
+        from django.test import RequestFactory
+        from .middleware import CacheMiddleware
+        from .views import SchemeListAPIView
+        middleware = CacheMiddleware(lambda request: SchemeListAPIView.as_view()(request).render())
+        etag = middleware(RequestFactory().get('/api/schemes/'))['ETag']
+        cached = middleware(RequestFactory().get('/api/schemes/'))
+        self.assertEqual(cached['ETag'], etag)
+        self.assertEqual(middleware(RequestFactory().get('/api/schemes/', HTTP_IF_NONE_MATCH=etag)).status_code, 304)
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from communityEmpowerment.models import (
+    State, Department, Scheme, Tag, Beneficiary, SchemeBeneficiary, Sponsor, SchemeSponsor
+)
+
+TAG_WORDS = [
+    "scholarship", "post matric", "pre matric", "job", "employment", "sc", "st", "obc", "women",
+    "farmer", "pension", "housing", "health", "skill", "loan", "subsidy", "minority", "disabled",
+    "student", "startup", "fisheries", "livestock", "tribal", "widow", "girl child", "insurance",
+]
+BENEFICIARY_WORDS = [
+    "students", "farmers", "women", "senior citizens", "sc students", "st students", "obc",
+    "widows", "disabled persons", "fishermen", "artisans", "youth", "entrepreneurs", "workers",
+]
+
+
+def time_call(fn, repeat=5):
+    """Run fn repeat times and return (median seconds, last result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def _letters(n):
+    # State names may not contain digits.
+    name = ""
+    n += 1
+    while n:
+        n, r = divmod(n - 1, 26)
+        name = chr(65 + r) + name
+    return name
+
+
+@contextmanager
+def synthetic_schemes(count, states=30, departments_per_state=10, seed=42):
+    """
+    Create `count` schemes with tags, beneficiaries and sponsors inside a
+    transaction that is always rolled back, so benchmarks never touch real data.
+    """
+    rng = random.Random(seed)
+    with transaction.atomic():
+        state_objs = State.objects.bulk_create(
+            [State(state_name=f"Benchmark State {_letters(i)}") for i in range(states)]
+        )
+        departments = Department.objects.bulk_create([
+            Department(state=state, department_name=f"Benchmark Department {j}")
+            for state in state_objs for j in range(departments_per_state)
+        ])
+        tags = Tag.objects.bulk_create([
+            Tag(name=f"benchmark {word} {i}") for i in range(20) for word in TAG_WORDS
+        ])
+        beneficiaries = Beneficiary.objects.bulk_create(
+            [Beneficiary(beneficiary_type=f"Benchmark {word}") for word in BENEFICIARY_WORDS]
+        )
+        sponsors = Sponsor.objects.bulk_create(
+            [Sponsor(sponsor_type=t) for t in ("State", "Central", "State/Central", "Private")]
+        )
+        schemes = Scheme.objects.bulk_create([
+            Scheme(
+                title=f"Benchmark scheme {i} {rng.choice(TAG_WORDS)}",
+                description=" ".join(rng.sample(TAG_WORDS, 8)),
+                department=rng.choice(departments),
+            )
+            for i in range(count)
+        ], batch_size=2000)
+
+        tag_through = Scheme.tags.through
+        tag_links, beneficiary_links, sponsor_links = [], [], []
+        for scheme in schemes:
+            for tag in rng.sample(tags, 4):
+                tag_links.append(tag_through(scheme_id=scheme.id, tag_id=tag.id))
+            for beneficiary in rng.sample(beneficiaries, 2):
+                beneficiary_links.append(SchemeBeneficiary(scheme=scheme, beneficiary=beneficiary))
+            sponsor_links.append(SchemeSponsor(scheme=scheme, sponsor=rng.choice(sponsors)))
+        tag_through.objects.bulk_create(tag_links, batch_size=5000)
+        SchemeBeneficiary.objects.bulk_create(beneficiary_links, batch_size=5000)
+        SchemeSponsor.objects.bulk_create(sponsor_links, batch_size=5000)
+
+        try:
+            yield {
+                "states": state_objs,
+                "departments": departments,
+                "tags": tags,
+                "beneficiaries": beneficiaries,
+                "sponsors": sponsors,
+                "schemes": schemes,
+            }
+        finally:
+            transaction.set_rollback(True)
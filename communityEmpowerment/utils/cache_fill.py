@@ -0,0 +1,87 @@
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# How long an expired value is kept to answer requests while one of them
+# recomputes it.
+STALE_FOR = 60
+# Lock lifetime; bounds the wait when the process filling a key dies.
+LOCK_TIMEOUT = 30
+# How long a request with nothing to serve waits for another one's fill.
+FILL_WAIT = 5.0
+POLL_INTERVAL = 0.05
+# XFetch weight: above 1 refreshes earlier, below 1 later.
+EARLY_REFRESH_BETA = 1.0
+
+
+def lock_key(key):
+    return f"{key}:fill"
+
+
+def refresh_due(delta, expires, beta=EARLY_REFRESH_BETA):
+    """
+    Probabilistic early expiration (XFetch): each request refreshes ahead of
+    `expires` with a probability growing as it nears, scaled by how long the
+    value took to compute (`delta`), so one request refreshes a hot key
+    before it expires instead of all of them at once after.
+    """
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires
+
+
+def get_or_fill(key, compute, timeout, cacheable=None, stale_for=STALE_FOR, wait=FILL_WAIT):
+    """
+    The cached value of `key`, or `compute()` stored for `timeout` seconds,
+    with one request per key computing at a time across every process:
+
+    - fresh values are returned, except that refresh_due() occasionally
+      recomputes one shortly before it expires;
+    - while someone else holds the fill lock, requests get the stale value
+      if there is one, otherwise they wait up to `wait` seconds for it;
+    - `cacheable(value)` may veto storing a computed value.
+
+    A fill that is vetoed or raises releases the lock with nothing stored;
+    its waiters see the lock gone and compute for themselves at once rather
+    than sitting out the rest of `wait`.
+    """
+    entry = cache.get(key)
+    if isinstance(entry, tuple) and len(entry) == 3:
+        value, delta, expires = entry
+        if not refresh_due(delta, expires):
+            return value
+    else:
+        entry = None
+
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key(key), token, timeout=LOCK_TIMEOUT):
+        if entry is not None:
+            return entry[0]
+        deadline = time.monotonic() + wait
+        while True:
+            if time.monotonic() >= deadline:
+                logger.warning(f"Gave up waiting for another fill of {key}; computing it here")
+                break
+            time.sleep(POLL_INTERVAL)
+            found = cache.get_many([key, lock_key(key)])
+            entry = found.get(key)
+            if isinstance(entry, tuple) and len(entry) == 3:
+                return entry[0]
+            if lock_key(key) not in found:
+                # The fill ended without storing anything, so there is nothing to wait for.
+                break
+
+    try:
+        start = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - start
+        if cacheable is None or cacheable(value):
+            cache.set(key, (value, delta, time.time() + timeout), timeout=timeout + stale_for)
+        return value
+    finally:
+        if cache.get(lock_key(key)) == token:
+            cache.delete(lock_key(key))
@@ -0,0 +1,82 @@
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Same Redis cluster slot as the cached responses (see CacheMiddleware), so a
+# request reads every version it needs with one MGET.
+VERSION_KEY = "cache:{simplecache}_version:%s"
+# When each namespace last changed, as a unix timestamp; the Last-Modified of
+# responses built from it (see utils/conditional_get.py).
+MODIFIED_KEY = "cache:{simplecache}_modified:%s"
+
+# Everything a scheme response can nest or list.
+SCHEME_NAMESPACES = (
+    'schemes', 'tags', 'beneficiaries', 'benefits', 'sponsors', 'documents',
+    'criteria', 'procedures', 'departments', 'states',
+)
+
+
+def initial_version():
+    # Seeded from the clock: a counter lost to eviction or a flush comes back
+    # larger than any version older cache keys were built with.
+    return int(time.time() * 1000)
+
+
+def get_version_state(namespaces):
+    """
+    (versions, last_modified) for `namespaces` in one MGET: the current
+    generation of each and the latest time any of them changed. Missing
+    counters are created; a namespace with no recorded change counts as
+    changed now, so validators handed out after a flush are never older
+    than the data.
+    """
+    namespaces = sorted(set(namespaces))
+    if not namespaces:
+        return {}, None
+    defaults = {}
+    for namespace in namespaces:
+        defaults[VERSION_KEY % namespace] = initial_version
+        defaults[MODIFIED_KEY % namespace] = lambda: int(time.time())
+    found = cache.get_many(list(defaults))
+    for key, default in defaults.items():
+        if key not in found:
+            cache.add(key, default(), timeout=None)
+            found[key] = cache.get(key)
+    versions = {namespace: found[VERSION_KEY % namespace] for namespace in namespaces}
+    return versions, max(found[MODIFIED_KEY % namespace] for namespace in namespaces)
+
+
+def get_versions(namespaces):
+    """{namespace: current generation} for `namespaces`, creating missing counters."""
+    return get_version_state(namespaces)[0]
+
+
+def bump(*namespaces):
+    """
+    Start a new generation for each namespace. Keys built with the old
+    generation are never read again and simply expire.
+    """
+    for namespace in set(namespaces):
+        key = VERSION_KEY % namespace
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_version(), timeout=None)
+        except Exception as e:
+            logger.error(f"Could not bump cache namespace {namespace}: {str(e)}")
+        try:
+            cache.set(MODIFIED_KEY % namespace, int(time.time()), timeout=None)
+        except Exception as e:
+            logger.error(f"Could not record change to cache namespace {namespace}: {str(e)}")
+
+
+def bump_on_commit(*namespaces):
+    """
+    bump() once the current transaction commits, so no request can cache
+    the old rows under the new generation.
+    """
+    transaction.on_commit(lambda: bump(*namespaces))
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from scipy.sparse import csr_matrix
+from sklearn.decomposition import TruncatedSVD
+
+from communityEmpowerment.models import UserInteraction
+from communityEmpowerment.utils.snapshots import current_snapshot, new_snapshot
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT_VERSION = 1
+DEFAULT_COMPONENTS = 50
+NEW_INTERACTIONS_KEY = "collaborative:{simplecache}_new_interactions"
+
+
+def get_model_dir():
+    return getattr(settings, 'COLLABORATIVE_MODEL_DIR', os.path.join(settings.BASE_DIR, 'collaborative_model'))
+
+
+def train_collaborative_model(n_components=DEFAULT_COMPONENTS, directory=None):
+    """
+    Fit TruncatedSVD on the user x scheme interaction matrix and persist the
+    factors. Returns (users, schemes) in the model, or None when there is too
+    little data to factorise.
+    """
+    rows = np.array(
+        list(UserInteraction.objects.order_by().values_list('user_id', 'scheme_id', 'interaction_value')),
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    if not len(rows):
+        return None
+
+    user_ids, user_index = np.unique(rows[:, 0].astype(np.int64), return_inverse=True)
+    scheme_ids, scheme_index = np.unique(rows[:, 1].astype(np.int64), return_inverse=True)
+    if len(scheme_ids) < 2:
+        return None
+
+    interaction_matrix = csr_matrix((rows[:, 2], (user_index, scheme_index)), shape=(len(user_ids), len(scheme_ids)))
+    svd = TruncatedSVD(n_components=min(n_components, len(scheme_ids) - 1))
+    user_factors = svd.fit_transform(interaction_matrix)
+    item_factors = svd.components_.T
+
+    # Cold-start fallback: schemes ordered by total interaction value.
+    popularity = np.asarray(interaction_matrix.sum(axis=0)).ravel()
+    popular_scheme_ids = scheme_ids[np.argsort(-popularity, kind='stable')]
+
+    save_collaborative_model(user_ids, scheme_ids, user_factors, item_factors, popular_scheme_ids,
+                             interactions=len(rows), directory=directory)
+    return len(user_ids), len(scheme_ids)
+
+
+def save_collaborative_model(user_ids, scheme_ids, user_factors, item_factors, popular_scheme_ids,
+                             interactions=0, directory=None):
+    """
+    Publish the factor arrays as a new snapshot of `directory` (see
+    utils/snapshots.py), so readers switch from one whole model to the next.
+    """
+    directory = directory or get_model_dir()
+    arrays = {
+        'user_ids': np.asarray(user_ids, dtype=np.int64),
+        'scheme_ids': np.asarray(scheme_ids, dtype=np.int64),
+        'user_factors': np.asarray(user_factors, dtype=np.float32),
+        'item_factors': np.asarray(item_factors, dtype=np.float32),
+        'popular_scheme_ids': np.asarray(popular_scheme_ids, dtype=np.int64),
+    }
+    meta = {
+        'version': MODEL_FORMAT_VERSION,
+        'users': int(len(arrays['user_ids'])),
+        'schemes': int(len(arrays['scheme_ids'])),
+        'components': int(arrays['item_factors'].shape[1]),
+        'interactions': int(interactions),
+        'trained_at': timezone.now().isoformat(),
+    }
+    with new_snapshot(directory) as snapshot:
+        for name, array in arrays.items():
+            np.save(os.path.join(snapshot, f'{name}.npy'), array)
+        with open(os.path.join(snapshot, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+
+class CollaborativeModel:
+    """
+    Memory-mapped SVD factors; a user is scored with one dot product against
+    the item matrix. `directory` is a model root (its current snapshot is
+    opened) or a snapshot.
+    """
+
+    def __init__(self, directory):
+        directory = current_snapshot(directory) or directory
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != MODEL_FORMAT_VERSION:
+            raise ValueError(f"model format {self.meta.get('version')}, expected {MODEL_FORMAT_VERSION}")
+        self.user_ids = np.load(os.path.join(directory, 'user_ids.npy'), mmap_mode='r')
+        self.scheme_ids = np.load(os.path.join(directory, 'scheme_ids.npy'), mmap_mode='r')
+        self.user_factors = np.load(os.path.join(directory, 'user_factors.npy'), mmap_mode='r')
+        self.item_factors = np.load(os.path.join(directory, 'item_factors.npy'), mmap_mode='r')
+        self.popular_scheme_ids = np.load(os.path.join(directory, 'popular_scheme_ids.npy'), mmap_mode='r')
+
+    def is_consistent(self):
+        """Whether the factor arrays agree with each other and with meta.json."""
+        return (
+            len(self.user_ids) == len(self.user_factors) == self.meta.get('users')
+            and len(self.scheme_ids) == len(self.item_factors) == self.meta.get('schemes')
+            and self.user_factors.shape[1:] == self.item_factors.shape[1:]
+        )
+
+    def row_for(self, user_id):
+        row = int(np.searchsorted(self.user_ids, user_id))
+        if row < len(self.user_ids) and self.user_ids[row] == user_id:
+            return row
+        return None
+
+    def recommend(self, user_id, top_n=5):
+        """Scheme ids best first; users unknown to the model get the most popular schemes."""
+        if top_n <= 0:
+            return []
+        row = self.row_for(user_id)
+        if row is None or not self.is_consistent():
+            return self.popular_scheme_ids[:top_n].tolist()
+
+        scores = self.item_factors @ self.user_factors[row]
+        top_n = min(top_n, len(scores))
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return self.scheme_ids[top].tolist()
+
+
+_model_lock = threading.Lock()
+_model_cache = {}
+
+
+def load_collaborative_model():
+    """Per-process model, reopened only when training has published a new snapshot."""
+    directory = get_model_dir()
+    snapshot = current_snapshot(directory)
+    if snapshot is None:
+        logger.warning(f"Collaborative model not found at {directory}; run train_collaborative_model")
+        return None
+
+    with _model_lock:
+        cached = _model_cache.get(directory)
+        if cached is None or cached[0] != snapshot:
+            try:
+                cached = (snapshot, CollaborativeModel(snapshot))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Collaborative model at {directory} is unreadable or outdated: {str(e)}")
+                return None
+            _model_cache[directory] = cached
+        return cached[1]
+
+
+def count_new_interaction():
+    """Bump the interactions-since-training counter and return its new value."""
+    if cache.add(NEW_INTERACTIONS_KEY, 1, timeout=None):
+        return 1
+    try:
+        return cache.incr(NEW_INTERACTIONS_KEY)
+    except ValueError:
+        # Expired or evicted between add() and incr()
+        cache.set(NEW_INTERACTIONS_KEY, 1, timeout=None)
+        return 1
+
+
+def reset_new_interactions():
+    cache.delete(NEW_INTERACTIONS_KEY)
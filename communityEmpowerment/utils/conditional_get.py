@@ -0,0 +1,53 @@
+import hashlib
+import logging
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from communityEmpowerment.utils.cache_versions import get_version_state
+
+logger = logging.getLogger(__name__)
+
+
+def response_etag(request, versions):
+    # Accept picks the renderer (JSON or the browsable API), so it is part of
+    # the representation the tag names.
+    body = f"{request.path}?{request.META.get('QUERY_STRING', '')}|{request.META.get('HTTP_ACCEPT', '')}|" + ",".join(
+        f"{namespace}:{version}" for namespace, version in sorted(versions.items())
+    )
+    return quote_etag(hashlib.md5(body.encode()).hexdigest())
+
+
+def conditional_on(*namespaces):
+    """
+    ETag / Last-Modified for GET and HEAD views whose responses are built
+    only from `namespaces` (see signals.CACHE_NAMESPACES). Both come from the
+    namespace versions, read before the view runs, so a matching
+    If-None-Match or If-Modified-Since is answered with 304 without querying
+    or serializing anything.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            try:
+                versions, last_modified = get_version_state(namespaces)
+            except Exception as e:
+                logger.error(f"Could not read validators for {request.path}: {str(e)}")
+                return view(request, *args, **kwargs)
+
+            etag = response_etag(request, versions)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault("ETag", etag)
+                response.headers.setdefault("Last-Modified", http_date(last_modified))
+                # Revalidate on every use: the validators are cheap to check
+                # and the data can change at any time.
+                patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
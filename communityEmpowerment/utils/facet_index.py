@@ -0,0 +1,262 @@
+import logging
+import threading
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from communityEmpowerment.models import Scheme, SchemeBeneficiary, SchemeSponsor
+
+logger = logging.getLogger(__name__)
+
+FACET_INDEX_GENERATION_KEY = "facet_index:{simplecache}_generation"
+
+
+def normalize_key(value):
+    return (value or "").strip().lower()
+
+
+def coerce_ids(values):
+    """
+    Turn request values (list, scalar or comma separated string) into a set of ints.
+    """
+    if values in (None, "", []):
+        return set()
+    if isinstance(values, (str, int)):
+        values = str(values).strip("[]").split(",")
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(str(value).strip()))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+class SchemeFacetIndex:
+    """
+    In-memory inverted index of scheme facets (state, department, tag names,
+    beneficiary types, sponsor ids and the combined active flag).
+
+    Filters become set intersections over posting lists. Substring matches on
+    tags and beneficiaries scan the (small) vocabulary instead of the schemes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._built = False
+        self._generation = None
+        self._docs = {}
+        self.active = set()
+        self.by_state = defaultdict(set)
+        self.by_department = defaultdict(set)
+        self.by_tag = defaultdict(set)
+        self.by_beneficiary = defaultdict(set)
+        self.by_sponsor = defaultdict(set)
+
+    # Loading
+
+    def _fetch_docs(self, scheme_ids=None):
+        schemes = Scheme.objects.order_by()
+        tag_links = Scheme.tags.through.objects.order_by()
+        beneficiary_links = SchemeBeneficiary.objects.order_by()
+        sponsor_links = SchemeSponsor.objects.order_by()
+        if scheme_ids is not None:
+            schemes = schemes.filter(id__in=scheme_ids)
+            tag_links = tag_links.filter(scheme_id__in=scheme_ids)
+            beneficiary_links = beneficiary_links.filter(scheme_id__in=scheme_ids)
+            sponsor_links = sponsor_links.filter(scheme_id__in=scheme_ids)
+
+        docs = {}
+        for scheme_id, department_id, state_id, is_active, dept_active, state_active in schemes.values_list(
+            "id", "department_id", "department__state_id", "is_active",
+            "department__is_active", "department__state__is_active",
+        ):
+            docs[scheme_id] = {
+                "state": state_id,
+                "department": department_id,
+                "active": bool(is_active and dept_active and state_active),
+                "tags": set(),
+                "beneficiaries": set(),
+                "sponsors": set(),
+            }
+
+        for scheme_id, name in tag_links.values_list("scheme_id", "tag__name"):
+            if scheme_id in docs and name:
+                docs[scheme_id]["tags"].add(normalize_key(name))
+        for scheme_id, beneficiary_type in beneficiary_links.values_list("scheme_id", "beneficiary__beneficiary_type"):
+            if scheme_id in docs and beneficiary_type:
+                docs[scheme_id]["beneficiaries"].add(normalize_key(beneficiary_type))
+        for scheme_id, sponsor_id in sponsor_links.values_list("scheme_id", "sponsor_id"):
+            if scheme_id in docs:
+                docs[scheme_id]["sponsors"].add(sponsor_id)
+        return docs
+
+    def _add(self, scheme_id, doc):
+        self._docs[scheme_id] = doc
+        if doc["active"]:
+            self.active.add(scheme_id)
+        if doc["state"] is not None:
+            self.by_state[doc["state"]].add(scheme_id)
+        if doc["department"] is not None:
+            self.by_department[doc["department"]].add(scheme_id)
+        for key in doc["tags"]:
+            self.by_tag[key].add(scheme_id)
+        for key in doc["beneficiaries"]:
+            self.by_beneficiary[key].add(scheme_id)
+        for sponsor_id in doc["sponsors"]:
+            self.by_sponsor[sponsor_id].add(scheme_id)
+
+    def _remove(self, scheme_id):
+        doc = self._docs.pop(scheme_id, None)
+        if doc is None:
+            return
+        self.active.discard(scheme_id)
+        for postings, keys in (
+            (self.by_state, [doc["state"]]),
+            (self.by_department, [doc["department"]]),
+            (self.by_tag, doc["tags"]),
+            (self.by_beneficiary, doc["beneficiaries"]),
+            (self.by_sponsor, doc["sponsors"]),
+        ):
+            for key in keys:
+                if key in postings:
+                    postings[key].discard(scheme_id)
+                    if not postings[key]:
+                        del postings[key]
+
+    def rebuild(self):
+        with self._lock:
+            generation = get_generation()
+            self._reset()
+            for scheme_id, doc in self._fetch_docs().items():
+                self._add(scheme_id, doc)
+            self._built = True
+            self._generation = generation
+            logger.debug(f"Facet index rebuilt with {len(self._docs)} schemes")
+
+    def ensure_fresh(self):
+        generation = get_generation()
+        if not self._built or (generation is not None and generation != self._generation):
+            self.rebuild()
+
+    def reindex_schemes(self, scheme_ids):
+        """Re-read the given schemes and patch their postings in place."""
+        scheme_ids = set(scheme_ids)
+        if not scheme_ids:
+            return
+        with self._lock:
+            current = get_generation()
+            in_sync = self._built and (current is None or current == self._generation)
+            if in_sync:
+                docs = self._fetch_docs(scheme_ids)
+                for scheme_id in scheme_ids:
+                    self._remove(scheme_id)
+                    if scheme_id in docs:
+                        self._add(scheme_id, docs[scheme_id])
+            generation = bump_generation()
+            # Only claim the new generation when no other process changed the
+            # index in between, otherwise rebuild on next use.
+            if in_sync and (generation is None or current is None or generation == current + 1):
+                self._generation = generation
+            else:
+                self._built = False
+
+    def invalidate(self):
+        bump_generation()
+        with self._lock:
+            self._built = False
+
+    # Querying
+
+    def _match_vocabulary(self, postings, predicate):
+        matched = set()
+        for key, scheme_ids in postings.items():
+            if predicate(key):
+                matched |= scheme_ids
+        return matched
+
+    def filter(self, state_ids=None, department_ids=None, tag=None, user_tags=None,
+               beneficiary_keywords=None, sponsor_ids=None):
+        """
+        Return the ids of active schemes matching every given facet. Mirrors the
+        icontains semantics of UnifiedSchemesAPIView.apply_filters, where all
+        tag conditions must hold for the same tag.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            result = set(self.active)
+
+            if state_ids:
+                result &= set().union(*(self.by_state.get(i, set()) for i in coerce_ids(state_ids)))
+            if department_ids:
+                result &= set().union(*(self.by_department.get(i, set()) for i in coerce_ids(department_ids)))
+            if sponsor_ids:
+                result &= set().union(*(self.by_sponsor.get(i, set()) for i in coerce_ids(sponsor_ids)))
+
+            tag = normalize_key(tag)
+            user_tags = [normalize_key(t) for t in (user_tags or []) if t]
+            if tag or user_tags:
+                def tag_predicate(name):
+                    if tag and tag not in name:
+                        return False
+                    if user_tags and not any(t in name for t in user_tags):
+                        return False
+                    if tag == "job" and "job" not in name and "employment" not in name:
+                        return False
+                    return True
+                result &= self._match_vocabulary(self.by_tag, tag_predicate)
+
+            if beneficiary_keywords:
+                if isinstance(beneficiary_keywords, str):
+                    beneficiary_keywords = [beneficiary_keywords]
+                keywords = [normalize_key(k) for k in beneficiary_keywords]
+                result &= self._match_vocabulary(
+                    self.by_beneficiary, lambda name: any(k in name for k in keywords)
+                )
+            return result
+
+    def __len__(self):
+        return len(self._docs)
+
+
+def get_generation():
+    try:
+        return cache.get_or_set(FACET_INDEX_GENERATION_KEY, 1, timeout=None)
+    except Exception as e:
+        logger.error(f"Facet index generation lookup failed: {str(e)}")
+        return None
+
+
+def bump_generation():
+    try:
+        return cache.incr(FACET_INDEX_GENERATION_KEY)
+    except ValueError:
+        cache.set(FACET_INDEX_GENERATION_KEY, 1, timeout=None)
+        return 1
+    except Exception as e:
+        logger.error(f"Facet index generation bump failed: {str(e)}")
+        return None
+
+
+scheme_facet_index = SchemeFacetIndex()
+
+
+def reindex_on_commit(scheme_ids):
+    """
+    scheme_facet_index.reindex_schemes() once the current transaction
+    commits. Run earlier, it would read uncommitted rows and bump the
+    generation before they are visible, so other processes would rebuild
+    from the old rows and keep them under the new generation.
+    """
+    scheme_ids = set(scheme_ids)
+    if scheme_ids:
+        transaction.on_commit(lambda: scheme_facet_index.reindex_schemes(scheme_ids))
+
+
+def invalidate_on_commit():
+    """scheme_facet_index.invalidate() once the current transaction commits."""
+    transaction.on_commit(scheme_facet_index.invalidate)
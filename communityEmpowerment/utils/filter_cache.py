@@ -0,0 +1,70 @@
+import hashlib
+import json
+import logging
+
+from communityEmpowerment.utils.cache_fill import get_or_fill
+from communityEmpowerment.utils.cache_versions import SCHEME_NAMESPACES, get_versions
+from communityEmpowerment.utils.facet_index import coerce_ids, normalize_key
+
+logger = logging.getLogger(__name__)
+
+FILTER_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+FILTER_KEY = "cache:{simplecache}_scheme_filter:%s"
+
+ID_FIELDS = ('state_ids', 'department_ids', 'sponsor_ids')
+TEXT_FIELDS = ('tag', 'funding_pattern', 'search_query')
+
+
+def canonical_filters(data, user_tags, ordering):
+    """
+    The filter body reduced to what decides the result, normalised the way
+    the facet index reads it: ids as sorted ints, keywords lower-cased,
+    sorted and de-duplicated, plus the sort order. Bodies that differ only
+    in list order, case or padding share one cache entry.
+    """
+    canonical = {field: sorted(coerce_ids(data.get(field))) for field in ID_FIELDS}
+    keywords = data.get('beneficiary_keywords') or []
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    canonical['beneficiary_keywords'] = sorted({normalize_key(keyword) for keyword in keywords} - {""})
+    for field in TEXT_FIELDS:
+        canonical[field] = normalize_key(data.get(field))
+    canonical['user_tags'] = sorted(set(user_tags))
+    canonical['ordering'] = [ordering] if isinstance(ordering, str) else list(ordering or [])
+    return canonical
+
+
+def filter_cache_key(canonical, versions):
+    body = json.dumps({'filters': canonical, 'versions': versions}, sort_keys=True)
+    return FILTER_KEY % hashlib.sha256(body.encode()).hexdigest()
+
+
+def cached_scheme_ids(canonical, compute):
+    """
+    The ordered scheme ids for `canonical` filters, from the cache or from
+    `compute()`. Ids rather than rendered pages are stored, so every page
+    and page size of one filter shares the entry; the key carries the
+    scheme namespace versions, so any scheme write retires it. Filled
+    through get_or_fill, so a burst of identical searches after a write runs
+    the query once.
+    """
+    try:
+        key = filter_cache_key(canonical, get_versions(SCHEME_NAMESPACES))
+    except Exception as e:
+        logger.error(f"Scheme filter cache unavailable: {str(e)}")
+        return compute()
+
+    computed = []
+
+    def fill():
+        computed.append(compute())
+        return computed[-1]
+
+    try:
+        return get_or_fill(key, fill, FILTER_CACHE_TIMEOUT)
+    except Exception as e:
+        if computed:
+            logger.error(f"Could not cache scheme filter result: {str(e)}")
+            return computed[-1]
+        logger.error(f"Scheme filter cache unavailable: {str(e)}")
+        return compute()
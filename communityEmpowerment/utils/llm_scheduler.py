@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = 2
+DEFAULT_COOLDOWN = 30.0
+MAX_COOLDOWN = 15 * 60.0
+
+
+class KeyBucket:
+    """Token bucket for one API key, refilled at `rate_per_minute`."""
+
+    def __init__(self, api_key, rate_per_minute, burst):
+        self.api_key = api_key
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+    def delay(self, now):
+        """Seconds until this key may send a request."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class KeyPool:
+    """
+    API keys shared by many in-flight requests. Each key has its own quota;
+    a key that hits its quota is cooled down (longer each time it happens in
+    a row) while requests carry on with the remaining keys. `client(api_key)`
+    builds the API client requests on a key are sent with; one is built per
+    key and reused, so a request always goes out on the key it was charged
+    to. Without it the key itself stands in for the client.
+    """
+
+    def __init__(self, api_keys, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=None,
+                 cooldown=DEFAULT_COOLDOWN, max_cooldown=MAX_COOLDOWN, client=None):
+        api_keys = [key for key in dict.fromkeys(api_keys) if key]
+        if not api_keys:
+            raise ValueError("No API keys configured")
+        burst = burst or max(1, int(requests_per_minute))
+        self.buckets = [KeyBucket(key, requests_per_minute, burst) for key in api_keys]
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.condition = threading.Condition()
+        self.next_index = 0
+        self.client_factory = client
+        self.clients = {}
+        self.clients_lock = threading.Lock()
+
+    def acquire(self):
+        """Block until some key has a token, take it and return the key."""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for offset in range(len(self.buckets)):
+                    bucket = self.buckets[(self.next_index + offset) % len(self.buckets)]
+                    delay = bucket.delay(now)
+                    if delay == 0:
+                        bucket.tokens -= 1
+                        self.next_index = (self.next_index + offset + 1) % len(self.buckets)
+                        return bucket.api_key
+                    wait = delay if wait is None else min(wait, delay)
+                self.condition.wait(wait)
+
+    def client(self, api_key):
+        """The client bound to `api_key`, built on first use."""
+        if self.client_factory is None:
+            return api_key
+        with self.clients_lock:
+            if api_key not in self.clients:
+                self.clients[api_key] = self.client_factory(api_key)
+            return self.clients[api_key]
+
+    def bucket(self, api_key):
+        return next(bucket for bucket in self.buckets if bucket.api_key == api_key)
+
+    def exhausted(self, api_key):
+        with self.condition:
+            bucket = self.bucket(api_key)
+            seconds = min(self.cooldown * 2 ** bucket.strikes, self.max_cooldown)
+            bucket.strikes += 1
+            bucket.tokens = 0.0
+            bucket.blocked_until = time.monotonic() + seconds
+        logger.warning(f"API key ...{api_key[-4:]} hit its quota; cooling down for {seconds:.0f}s")
+
+    def succeeded(self, api_key):
+        with self.condition:
+            self.bucket(api_key).strikes = 0
+
+
+class Checkpoint:
+    """
+    Finished results appended to a JSON lines file as they arrive, so a run
+    that crashes resumes with only the unfinished jobs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self):
+        results = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by the crash; that job simply runs again.
+                        continue
+                    results[entry['id']] = entry['result']
+        except FileNotFoundError:
+            pass
+        return results
+
+    def record(self, job_id, result):
+        line = json.dumps({'id': job_id, 'result': result}, ensure_ascii=False)
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class StructuringScheduler:
+    """
+    Run `structure(payload, client)` for many documents concurrently over a
+    KeyPool, with the client of the key each attempt was charged to.
+    Exceptions in `quota_errors` cool the key down and the document is
+    retried at once on another key; any other exception is retried up to
+    `retries` times with backoff. Failed documents map to None and are not
+    checkpointed, so the next run tries them again.
+    """
+
+    def __init__(self, structure, key_pool, quota_errors=(), max_in_flight=8, retries=3,
+                 max_quota_retries=20, backoff=1.0, checkpoint=None):
+        self.structure = structure
+        self.key_pool = key_pool
+        self.quota_errors = tuple(quota_errors)
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.max_quota_retries = max_quota_retries
+        self.backoff = backoff
+        self.checkpoint = checkpoint
+
+    def run_one(self, job_id, payload):
+        failures = 0
+        quota_hits = 0
+        while True:
+            api_key = self.key_pool.acquire()
+            try:
+                result = self.structure(payload, self.key_pool.client(api_key))
+            except self.quota_errors as e:
+                self.key_pool.exhausted(api_key)
+                quota_hits += 1
+                if quota_hits > self.max_quota_retries:
+                    logger.error(f"Giving up on {job_id}: every retry hit a quota limit ({str(e)})")
+                    return None
+                continue
+            except Exception as e:
+                failures += 1
+                if failures > self.retries:
+                    logger.error(f"Giving up on {job_id} after {failures} attempts: {str(e)}")
+                    return None
+                time.sleep(self.backoff * 2 ** (failures - 1) + random.uniform(0, self.backoff))
+                continue
+
+            self.key_pool.succeeded(api_key)
+            if self.checkpoint is not None:
+                try:
+                    self.checkpoint.record(job_id, result)
+                except OSError as e:
+                    # The result is still good; only a resumed run would have to redo it.
+                    logger.error(f"Could not checkpoint {job_id}: {str(e)}")
+            return result
+
+    def run(self, jobs):
+        """Structure every (job_id, payload) pair; returns {job_id: result or None}."""
+        jobs = dict(jobs)
+        results = self.checkpoint.load() if self.checkpoint is not None else {}
+        results = {job_id: results[job_id] for job_id in jobs if job_id in results}
+        pending = [(job_id, payload) for job_id, payload in jobs.items() if job_id not in results]
+        if results:
+            logger.info(f"Resuming from checkpoint: {len(results)} done, {len(pending)} to go")
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for (job_id, _), result in zip(pending, pool.map(lambda job: self.run_one(*job), pending)):
+                results[job_id] = result
+        return results
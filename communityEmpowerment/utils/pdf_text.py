@@ -0,0 +1,210 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import requests
+from django.conf import settings
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_BYTES = 25 * MB
+CACHE_FORMAT_VERSION = 1
+
+
+class DocumentTooLarge(Exception):
+    pass
+
+
+def get_cache_dir():
+    return getattr(settings, 'PDF_TEXT_CACHE_DIR', os.path.join(settings.BASE_DIR, 'pdf_text_cache'))
+
+
+def extract_pdf_pages(data, max_pages=DEFAULT_MAX_PAGES):
+    """
+    Text of each page of a PDF, at most `max_pages` of them. Returns
+    (pages, complete) where complete is False when the page limit cut the
+    document short. Runs in the worker processes, so it only takes bytes.
+    """
+    pages = []
+    for layout in extract_pages(io.BytesIO(data), maxpages=max_pages):
+        pages.append(''.join(element.get_text() for element in layout if isinstance(element, LTTextContainer)))
+    return pages, len(pages) < max_pages
+
+
+class PdfTextCache:
+    """
+    Extracted page text on disk, keyed by the SHA-256 of the PDF bytes, so an
+    unchanged document is never parsed twice whatever URL it came from.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or get_cache_dir()
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+    def get(self, digest, max_pages):
+        try:
+            with open(self.path(digest), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        # An entry parsed with a lower page limit cannot answer a higher one.
+        if not entry['complete'] and len(entry['pages']) < max_pages:
+            return None
+        return entry['pages'][:max_pages]
+
+    def set(self, digest, pages, complete):
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_FORMAT_VERSION, 'pages': pages, 'complete': complete}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ExtractionStats:
+    def __init__(self):
+        self.documents = 0
+        self.pages = 0
+        self.cached = 0
+        self.failed = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def summary(self):
+        seconds = self.seconds or 1e-9
+        return (f"{self.documents} documents ({self.cached} cached, {self.failed} failed), {self.pages} pages "
+                f"in {self.seconds:.1f}s ({self.pages / seconds:.1f} pages/s, {self.bytes / MB / seconds:.2f} MB/s)")
+
+
+class PdfExtractionService:
+    """
+    Extract text from many PDFs at once. Downloads run on a thread pool and
+    hand the bytes to a process pool for parsing, which is CPU bound.
+    Documents above `max_bytes` are rejected while streaming and only the
+    first `max_pages` pages are read. At most `max_in_flight` documents
+    (twice the parsers by default) are held between download and parse.
+    Sources may be URLs or local paths.
+    """
+
+    def __init__(self, max_workers=None, download_workers=8, max_pages=DEFAULT_MAX_PAGES,
+                 max_bytes=DEFAULT_MAX_BYTES, cache=None, timeout=60, session=None, max_in_flight=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.download_workers = download_workers
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.cache = cache if cache is not None else PdfTextCache()
+        self.timeout = timeout
+        # Forking while download threads hold locks can deadlock the child.
+        self.mp_context = multiprocessing.get_context('forkserver')
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=download_workers, pool_maxsize=download_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, source):
+        if not source.startswith(('http://', 'https://')):
+            if os.path.getsize(source) > self.max_bytes:
+                raise DocumentTooLarge(f"{source} is larger than {self.max_bytes} bytes")
+            with open(source, 'rb') as f:
+                return f.read()
+
+        with self.session.get(source, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if int(response.headers.get('Content-Length') or 0) > self.max_bytes:
+                raise DocumentTooLarge(f"{source} is larger than {self.max_bytes} bytes")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise DocumentTooLarge(f"{source} is larger than {self.max_bytes} bytes")
+                chunks.append(chunk)
+            return b''.join(chunks)
+
+    def prepare(self, source, parsers, slots):
+        """
+        Download one document on a download thread and either answer it from
+        the cache or hand it to the parsers. Holds one of `slots` from before
+        the download until its parse finishes, so at most that many documents
+        are in memory whatever the number of sources.
+        """
+        slots.acquire()
+        try:
+            data = self.fetch(source)
+            digest = hashlib.sha256(data).hexdigest()
+            pages = self.cache.get(digest, self.max_pages)
+            if pages is not None:
+                slots.release()
+                return len(data), digest, pages, None
+            parse = parsers.submit(extract_pdf_pages, data, self.max_pages)
+        except BaseException:
+            slots.release()
+            raise
+        parse.add_done_callback(lambda _: slots.release())
+        return len(data), digest, None, parse
+
+    def extract_many(self, sources):
+        """
+        Returns ({source: text or None}, ExtractionStats). A source maps to
+        None when it could not be downloaded or parsed.
+        """
+        sources = list(dict.fromkeys(sources))
+        texts = {}
+        stats = ExtractionStats()
+        start = time.perf_counter()
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+
+        with ThreadPoolExecutor(max_workers=self.download_workers) as downloads, \
+                ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context) as parsers:
+            fetched = {downloads.submit(self.prepare, source, parsers, slots): source for source in sources}
+            parsing = {}
+            for future in as_completed(fetched):
+                source = fetched[future]
+                stats.documents += 1
+                try:
+                    size, digest, pages, parse = future.result()
+                except Exception as e:
+                    logger.error(f"Could not download {source}: {str(e)}")
+                    texts[source] = None
+                    stats.failed += 1
+                    continue
+
+                stats.bytes += size
+                if parse is None:
+                    texts[source] = '\n'.join(pages)
+                    stats.pages += len(pages)
+                    stats.cached += 1
+                    continue
+                parsing[parse] = (source, digest)
+
+            for future in as_completed(parsing):
+                source, digest = parsing[future]
+                try:
+                    pages, complete = future.result()
+                except Exception as e:
+                    logger.error(f"Could not extract text from {source}: {str(e)}")
+                    texts[source] = None
+                    stats.failed += 1
+                    continue
+                self.cache.set(digest, pages, complete)
+                texts[source] = '\n'.join(pages)
+                stats.pages += len(pages)
+
+        stats.seconds = time.perf_counter() - start
+        return texts, stats
@@ -0,0 +1,169 @@
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+class TransientError(Exception):
+    pass
+
+
+class CountingReader:
+    """File-like wrapper around a streamed response that counts bytes read."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = self.raw.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class TransferStats:
+    def __init__(self):
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, status, size=0):
+        with self.lock:
+            setattr(self, status, getattr(self, status) + 1)
+            self.bytes += size
+
+    @property
+    def files(self):
+        return self.uploaded + self.skipped + self.failed
+
+    def summary(self):
+        seconds = self.seconds or 1e-9
+        return (f"{self.uploaded} uploaded, {self.skipped} unchanged, {self.failed} failed in {self.seconds:.1f}s "
+                f"({self.bytes / MB / seconds:.2f} MB/s, {self.files / seconds:.1f} files/s)")
+
+
+class PdfTransferEngine:
+    """
+    Download PDFs and upload them to S3 from a thread pool.
+
+    Requests go through one pooled session and at most `per_host` downloads
+    run against any one source host. A file is skipped when the S3 object
+    already records the same source ETag or has the same Content-Length.
+    Connection errors, timeouts, 429/5xx responses and S3 5xx errors are
+    retried with exponential backoff; uploads above `multipart_threshold`
+    go through S3 multipart upload.
+    """
+
+    def __init__(self, s3_client, bucket, max_workers=16, per_host=4, retries=3, backoff=1.0,
+                 multipart_threshold=8 * MB, timeout=60, session=None):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transfer_config = TransferConfig(multipart_threshold=multipart_threshold,
+                                              multipart_chunksize=multipart_threshold)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+        self.host_lock = threading.Lock()
+
+    def host_slot(self, url):
+        with self.host_lock:
+            return self.host_slots[urlparse(url).netloc]
+
+    def existing_object(self, key):
+        try:
+            return self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def is_unchanged(self, existing, response):
+        if existing is None:
+            return False
+        source_etag = response.headers.get('ETag')
+        if source_etag and existing.get('Metadata', {}).get('sourceetag') == source_etag:
+            return True
+        source_length = response.headers.get('Content-Length')
+        return bool(source_length) and int(source_length) == existing.get('ContentLength')
+
+    def transfer_once(self, item):
+        existing = self.existing_object(item['key'])
+        try:
+            response = self.session.get(item['url'], stream=True, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientError(str(e))
+        with response:
+            if response.status_code in TRANSIENT_STATUS:
+                raise TransientError(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            if self.is_unchanged(existing, response):
+                return 'skipped', 0
+
+            metadata = dict(item.get('metadata', {}))
+            if response.headers.get('ETag'):
+                metadata['sourceetag'] = response.headers['ETag']
+            response.raw.decode_content = True
+            body = CountingReader(response.raw)
+            try:
+                self.s3.upload_fileobj(body, self.bucket, item['key'], Config=self.transfer_config, ExtraArgs={
+                    'ContentType': 'application/pdf', 'Metadata': metadata,
+                })
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise TransientError(str(e))
+            except ClientError as e:
+                status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+                if status >= 500 or e.response.get('Error', {}).get('Code') == 'SlowDown':
+                    raise TransientError(str(e))
+                raise
+            return 'uploaded', body.bytes_read
+
+    def transfer(self, item, stats):
+        with self.host_slot(item['url']):
+            for attempt in range(self.retries + 1):
+                try:
+                    status, size = self.transfer_once(item)
+                    stats.add(status, size)
+                    logger.info(f"{status} {item['url']} -> {item['key']}")
+                    return status
+                except (TransientError, BotoCoreError) as e:
+                    if attempt == self.retries:
+                        logger.error(f"Giving up on {item['url']} after {attempt + 1} attempts: {str(e)}")
+                        break
+                    time.sleep(self.backoff * 2 ** attempt + random.uniform(0, self.backoff))
+                except Exception as e:
+                    logger.error(f"Error downloading or uploading PDF {item['url']}: {str(e)}")
+                    break
+        stats.add('failed')
+        return 'failed'
+
+    def run(self, items):
+        """Transfer every {'url', 'key', 'metadata'} item; returns TransferStats."""
+        stats = TransferStats()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(lambda item: self.transfer(item, stats), items))
+        stats.seconds = time.perf_counter() - start
+        return stats
@@ -0,0 +1,102 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from communityEmpowerment.serializers import SchemeSerializer
+from communityEmpowerment.utils.cache_versions import get_versions, initial_version
+from communityEmpowerment.utils.scheme_queries import prefetch_scheme_relations, schemes_in_order
+
+logger = logging.getLogger(__name__)
+
+FRAGMENT_TIMEOUT = 60 * 60  # 1 hour
+FRAGMENT_KEY = "cache:{simplecache}_scheme_fragment:%s:%s:%s"
+# Per-scheme counterpart of the namespace versions in utils/cache_versions.py.
+SCHEME_VERSION_KEY = "cache:{simplecache}_scheme_fragment_version:%s"
+
+# Rows shared by many schemes; a change to any of them retires every
+# fragment at once. Changes to one scheme (its row or its links) retire
+# just that scheme's fragment, see invalidate_scheme_fragments.
+FRAGMENT_NAMESPACES = ('tags', 'beneficiaries', 'benefits', 'sponsors', 'documents', 'departments', 'states')
+
+
+def fragment_generation():
+    versions = get_versions(FRAGMENT_NAMESPACES)
+    body = ",".join(f"{namespace}:{version}" for namespace, version in sorted(versions.items()))
+    return hashlib.md5(body.encode()).hexdigest()[:12]
+
+
+def scheme_versions(scheme_ids):
+    """{scheme id: current version} in one MGET, creating missing counters."""
+    keys = {scheme_id: SCHEME_VERSION_KEY % scheme_id for scheme_id in scheme_ids}
+    found = cache.get_many(list(keys.values()))
+    for key in keys.values():
+        if key not in found:
+            cache.add(key, initial_version(), timeout=None)
+            found[key] = cache.get(key)
+    return {scheme_id: found[key] for scheme_id, key in keys.items()}
+
+
+def fragment_keys(scheme_ids, generation):
+    versions = scheme_versions(scheme_ids)
+    return {scheme_id: FRAGMENT_KEY % (generation, scheme_id, versions[scheme_id]) for scheme_id in scheme_ids}
+
+
+def serialized_schemes(schemes):
+    """
+    SchemeSerializer data for `schemes` (Scheme instances or ids), in order.
+    Cached fragments for the whole page come back in one get_many; only the
+    misses are loaded, serialized and written back.
+    """
+    schemes = list(schemes)
+    scheme_ids = [scheme if isinstance(scheme, int) else scheme.id for scheme in schemes]
+    keys = {}
+    fragments = {}
+    try:
+        keys = fragment_keys(dict.fromkeys(scheme_ids), fragment_generation())
+        cached = cache.get_many(list(keys.values()))
+        fragments = {scheme_id: cached[key] for scheme_id, key in keys.items() if key in cached}
+    except Exception as e:
+        logger.error(f"Scheme fragment cache unavailable: {str(e)}")
+
+    missing = [scheme_id for scheme_id in dict.fromkeys(scheme_ids) if scheme_id not in fragments]
+    if missing:
+        instances = {scheme.id: scheme for scheme in schemes if not isinstance(scheme, int)}
+        if len(instances) == len(set(scheme_ids)):
+            loaded = prefetch_scheme_relations([instances[scheme_id] for scheme_id in missing])
+        else:
+            loaded = schemes_in_order(missing)
+        fresh = {data['id']: data for data in SchemeSerializer(loaded, many=True).data}
+        if keys:
+            try:
+                cache.set_many({keys[scheme_id]: data for scheme_id, data in fresh.items()}, timeout=FRAGMENT_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Could not cache scheme fragments: {str(e)}")
+        fragments.update(fresh)
+
+    return [fragments[scheme_id] for scheme_id in scheme_ids if scheme_id in fragments]
+
+
+def invalidate_scheme_fragments(scheme_ids):
+    """
+    Retire the current fragments of `scheme_ids` by moving each scheme to a
+    new version. Deleting the keys instead would race with a reader that
+    loaded the old rows just before: its set_many would land after the
+    delete and serve the stale fragment until it expired. Under a new
+    version that write goes to a key nobody reads again.
+    """
+    for scheme_id in set(scheme_ids):
+        key = SCHEME_VERSION_KEY % scheme_id
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_version(), timeout=None)
+        except Exception as e:
+            logger.error(f"Could not invalidate scheme fragment {scheme_id}: {str(e)}")
+
+
+def invalidate_fragments_on_commit(scheme_ids):
+    scheme_ids = set(scheme_ids)
+    if scheme_ids:
+        transaction.on_commit(lambda: invalidate_scheme_fragments(scheme_ids))
@@ -0,0 +1,420 @@
+import hashlib
+import json
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from urllib.parse import urlparse
+
+import django
+import ijson
+from django.db import connections, transaction
+from django.dispatch import Signal
+
+from communityEmpowerment.models import (
+    Beneficiary, Benefit, Criteria, Department, Document, Organisation, Procedure, Resource, Scheme,
+    SchemeBeneficiary, SchemeDocument, SchemeSponsor, Sponsor, State, Tag,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+SCHEME_FIELDS = ['introduced_on', 'valid_upto', 'funding_pattern', 'description', 'scheme_link', 'pdf_url']
+LINK_RECORDS = ('beneficiaries', 'documents', 'sponsors', 'criteria', 'procedures', 'benefits', 'tags')
+
+# Sent once per load with the ids of new, updated and removed schemes.
+schemes_ingested = Signal()
+
+
+def truncate(value, max_length=200):
+    if value and isinstance(value, str):
+        return value[:max_length]
+    return value
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def iter_states(file_path):
+    """Yield the state subtrees of the combined JSON one at a time."""
+    with open(file_path, 'rb') as file:
+        yield from ijson.items(file, 'states.item', use_float=True)
+
+
+def iter_schemes(state_data):
+    for department_data in state_data['departments']:
+        for organisation_data in department_data['organisations']:
+            yield from organisation_data['schemes']
+
+
+def scheme_record(scheme_data):
+    """Normalise one scraped scheme into its field values and linked natural keys."""
+    return {
+        'title': truncate(scheme_data['title']),
+        'fields': {
+            'introduced_on': scheme_data.get('introduced_on'),
+            'valid_upto': scheme_data.get('valid_upto'),
+            'funding_pattern': truncate(scheme_data.get('funding_pattern', 'State')),
+            'description': scheme_data.get('description'),
+            'scheme_link': truncate(scheme_data.get('scheme_link')),
+            'pdf_url': truncate(scheme_data.get('pdf_url')),
+        },
+        'beneficiaries': [b for b in map(truncate, scheme_data['beneficiaries']) if b is not None],
+        'documents': [truncate(d) for d in scheme_data['documents'] if d],
+        'sponsors': [truncate(s) for s in scheme_data['sponsors']],
+        'criteria': [truncate(c) for c in scheme_data['criteria']],
+        'procedures': [truncate(p) for p in scheme_data['procedures']],
+        'benefits': [b.get('benefit_type') for b in scheme_data.get('benefits', []) if b.get('benefit_type')],
+        'tags': [truncate(t) for t in scheme_data['tags'] if t] if scheme_data['tags'] is not None else [],
+    }
+
+
+def content_hash(record):
+    """sha256 over a scheme's fields and links; link order and repeats do not matter."""
+    canonical = {'title': record['title'], **record['fields']}
+    for name in LINK_RECORDS:
+        canonical[name] = sorted(set(record[name]), key=lambda value: '' if value is None else str(value))
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SchemeLoader:
+    """
+    Bulk loader for the scraped scheme JSON.
+
+    Natural keys (state name, department name, scheme title, tag name, ...) are
+    resolved through in-memory caches, so each batch of schemes costs a fixed
+    number of queries. Each scheme's content hash is stored on the row, and
+    schemes whose hash is unchanged are skipped along with all their links, so
+    reloading the same file is a no-op.
+    """
+
+    # Shared lookup tables: model -> natural key field
+    LOOKUPS = {
+        Beneficiary: 'beneficiary_type',
+        Document: 'document_name',
+        Sponsor: 'sponsor_type',
+        Benefit: 'benefit_type',
+        Tag: 'name',
+    }
+    # Shared lookup tables: model -> scheme_record() key holding its values
+    LOOKUP_RECORDS = {
+        Beneficiary: 'beneficiaries',
+        Document: 'documents',
+        Sponsor: 'sponsors',
+        Benefit: 'benefits',
+        Tag: 'tags',
+    }
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.schemes_seen = 0
+        self.new_scheme_ids = set()
+        self.updated_scheme_ids = set()
+        self.removed_scheme_ids = set()
+        self.states = dict(State.objects.values_list('state_name', 'id'))
+        self.lookups = {model: self.existing_keys(model, field) for model, field in self.LOOKUPS.items()}
+
+    def existing_keys(self, model, field, **filters):
+        # Iterate newest first so the oldest row wins when a key is duplicated.
+        return {key: pk for key, pk in model.objects.filter(**filters).order_by('-id').values_list(field, 'id')}
+
+    def lookup_ids(self, model, values):
+        """Return {value: id} for the given natural keys, bulk-inserting any that are missing."""
+        field = self.LOOKUPS[model]
+        cache = self.lookups[model]
+        missing = [value for value in dict.fromkeys(values) if value not in cache]
+        if missing:
+            if model is Tag:
+                new_rows = [Tag(name=name) for name in missing]
+                for tag in new_rows:
+                    tag.categorize()
+                # name is unique, so a concurrent loader may already have inserted some.
+                Tag.objects.bulk_create(new_rows, batch_size=self.batch_size, ignore_conflicts=True)
+                cache.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+            else:
+                new_rows = model.objects.bulk_create([model(**{field: value}) for value in missing],
+                                                     batch_size=self.batch_size)
+                cache.update((getattr(row, field), row.pk) for row in new_rows)
+            self.rows_written += len(missing)
+        return {value: cache[value] for value in values}
+
+    def get_state_id(self, state_name):
+        if state_name not in self.states:
+            State.objects.bulk_create([State(state_name=state_name)], ignore_conflicts=True)
+            self.states[state_name] = State.objects.values_list('id', flat=True).get(state_name=state_name)
+            self.rows_written += 1
+        return self.states[state_name]
+
+    def child_ids(self, model, parent_field, name_field, parent_ids, keys):
+        """{(parent_id, name): id} for keys under the given parents, inserting missing ones."""
+        existing = {
+            (parent_id, name): pk for parent_id, name, pk in model.objects.filter(
+                **{f'{parent_field}__in': parent_ids}
+            ).order_by('-id').values_list(parent_field, name_field, 'id')
+        }
+        missing = [key for key in dict.fromkeys(keys) if key not in existing]
+        if missing:
+            new_rows = model.objects.bulk_create(
+                [model(**{parent_field: parent_id, name_field: name}) for parent_id, name in missing],
+                batch_size=self.batch_size,
+            )
+            existing.update(((getattr(row, parent_field), getattr(row, name_field)), row.pk) for row in new_rows)
+            self.rows_written += len(missing)
+        return existing
+
+    def link(self, model, other_field, pairs, ignore_conflicts=False):
+        """Insert the (scheme_id, other) pairs that do not exist yet."""
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return
+        existing = set(model.objects.filter(
+            scheme_id__in={scheme_id for scheme_id, _ in pairs}
+        ).values_list('scheme_id', other_field))
+        missing = [pair for pair in pairs if pair not in existing]
+        if missing:
+            model.objects.bulk_create(
+                [model(**{'scheme_id': scheme_id, other_field: other}) for scheme_id, other in missing],
+                batch_size=self.batch_size, ignore_conflicts=ignore_conflicts,
+            )
+            self.rows_written += len(missing)
+
+    def seed_shared(self, state_data):
+        """
+        Insert the state row and every shared lookup value the state refers to.
+        Run over all states before a parallel load so workers only ever read
+        these tables and cannot race each other into duplicates.
+        """
+        records = [scheme_record(scheme_data) for scheme_data in iter_schemes(state_data)]
+        with transaction.atomic():
+            self.get_state_id(truncate(state_data['state_name']).strip().title())
+            for model, name in self.LOOKUP_RECORDS.items():
+                self.lookup_ids(model, [value for record in records for value in record[name]])
+
+    def load_state(self, state_data):
+        state_name = truncate(state_data['state_name']).strip().title()
+
+        with transaction.atomic():
+            state_id = self.get_state_id(state_name)
+            department_keys = [
+                (state_id, truncate(department_data['department_name']))
+                for department_data in state_data['departments']
+            ]
+            department_ids = self.child_ids(Department, 'state_id', 'department_name', [state_id], department_keys)
+            organisation_keys = [
+                (department_ids[department_key], truncate(organisation_data['organisation_name']))
+                for department_key, department_data in zip(department_keys, state_data['departments'])
+                for organisation_data in department_data['organisations']
+            ]
+            self.child_ids(Organisation, 'department_id', 'organisation_name',
+                           set(department_ids.values()), organisation_keys)
+
+        # Schemes are keyed by (department, title); a repeated key takes the
+        # last field values and the union of all links, as get_or_create did.
+        records = {}
+        base_urls = set()
+        for department_key, department_data in zip(department_keys, state_data['departments']):
+            department_id = department_ids[department_key]
+            for organisation_data in department_data['organisations']:
+                for scheme_data in organisation_data['schemes']:
+                    self.schemes_seen += 1
+                    record = scheme_record(scheme_data)
+                    key = (department_id, record['title'])
+                    if key in records:
+                        previous = records[key]
+                        previous['fields'] = record['fields']
+                        for name in LINK_RECORDS:
+                            previous[name].extend(record[name])
+                    else:
+                        records[key] = record
+
+                    parsed_url = urlparse(record['fields']['scheme_link'])
+                    if parsed_url.scheme and parsed_url.netloc:
+                        base_urls.add(f"{parsed_url.scheme}://{parsed_url.netloc}")
+
+        existing_schemes = {
+            (row['department_id'], row['title']): row for row in Scheme.objects.filter(
+                department_id__in=set(department_ids.values())
+            ).order_by('-id').values('id', 'department_id', 'title', 'content_hash', *SCHEME_FIELDS)
+        }
+        for batch in chunked(list(records.items()), self.batch_size):
+            with transaction.atomic():
+                self.load_batch(batch, existing_schemes)
+
+        # Previously ingested schemes that have disappeared from the scrape.
+        # They are reported, not deleted: admins may still want them listed.
+        self.removed_scheme_ids.update(
+            row['id'] for key, row in existing_schemes.items() if key not in records and row['content_hash']
+        )
+
+        with transaction.atomic():
+            existing_links = set(Resource.objects.filter(state_name_id=state_id).values_list('resource_link', flat=True))
+            new_links = [Resource(state_name_id=state_id, resource_link=url)
+                         for url in sorted(base_urls) if url not in existing_links]
+            Resource.objects.bulk_create(new_links)
+            self.rows_written += len(new_links)
+
+    def load_batch(self, batch, existing_schemes):
+        new_schemes, changed_schemes, scheme_ids = [], [], {}
+        for key, record in batch:
+            record_hash = content_hash(record)
+            row = existing_schemes.get(key)
+            if row is None:
+                new_schemes.append((key, Scheme(department_id=key[0], title=key[1],
+                                                content_hash=record_hash, **record['fields'])))
+            elif row['content_hash'] != record_hash:
+                scheme_ids[key] = row['id']
+                changed_schemes.append(Scheme(id=row['id'], content_hash=record_hash, **record['fields']))
+                row.update(record['fields'], content_hash=record_hash)
+
+        if new_schemes:
+            Scheme.objects.bulk_create([scheme for _, scheme in new_schemes], batch_size=self.batch_size)
+            for key, scheme in new_schemes:
+                scheme_ids[key] = scheme.pk
+                existing_schemes[key] = {'id': scheme.pk, 'department_id': key[0], 'title': key[1],
+                                         'content_hash': scheme.content_hash,
+                                         **{field: getattr(scheme, field) for field in SCHEME_FIELDS}}
+        if changed_schemes:
+            Scheme.objects.bulk_update(changed_schemes, SCHEME_FIELDS + ['content_hash'], batch_size=self.batch_size)
+        self.new_scheme_ids.update(scheme.pk for _, scheme in new_schemes)
+        self.updated_scheme_ids.update(scheme.pk for scheme in changed_schemes)
+        self.rows_written += len(new_schemes) + len(changed_schemes)
+
+        # Unchanged schemes are done: their links cannot differ either.
+        batch = [(key, record) for key, record in batch if key in scheme_ids]
+        if not batch:
+            return
+
+        def values(name):
+            return [value for _, record in batch for value in record[name]]
+
+        beneficiary_ids, document_ids, sponsor_ids, benefit_ids, tag_ids = (
+            self.lookup_ids(model, values(name)) for model, name in self.LOOKUP_RECORDS.items()
+        )
+
+        def pairs(name, ids=None):
+            return [
+                (scheme_ids[key], ids[value] if ids is not None else value)
+                for key, record in batch for value in record[name]
+            ]
+
+        self.link(SchemeBeneficiary, 'beneficiary_id', pairs('beneficiaries', beneficiary_ids))
+        self.link(SchemeDocument, 'document_id', pairs('documents', document_ids))
+        self.link(SchemeSponsor, 'sponsor_id', pairs('sponsors', sponsor_ids))
+        self.link(Scheme.benefits.through, 'benefit_id', pairs('benefits', benefit_ids), ignore_conflicts=True)
+        self.link(Scheme.tags.through, 'tag_id', pairs('tags', tag_ids), ignore_conflicts=True)
+        self.link(Procedure, 'step_description', pairs('procedures'))
+        self.load_criteria(pairs('criteria'))
+
+    def load_criteria(self, pairs):
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return
+        existing = {
+            (scheme_id, description): (pk, value, criteria_data)
+            for pk, scheme_id, description, value, criteria_data in Criteria.objects.filter(
+                scheme_id__in={scheme_id for scheme_id, _ in pairs}
+            ).order_by('-id').values_list('id', 'scheme_id', 'description', 'value', 'criteria_data')
+        }
+        new_rows, changed_rows = [], []
+        for scheme_id, description in pairs:
+            if (scheme_id, description) not in existing:
+                new_rows.append(Criteria(scheme_id=scheme_id, description=description,
+                                         value=None, criteria_data=description))
+                continue
+            pk, value, criteria_data = existing[(scheme_id, description)]
+            if value is not None or criteria_data != description:
+                changed_rows.append(Criteria(id=pk, value=None, criteria_data=description))
+        Criteria.objects.bulk_create(new_rows, batch_size=self.batch_size)
+        Criteria.objects.bulk_update(changed_rows, ['value', 'criteria_data'], batch_size=self.batch_size)
+        self.rows_written += len(new_rows) + len(changed_rows)
+
+    def changeset(self):
+        return {
+            'new': sorted(self.new_scheme_ids),
+            'updated': sorted(self.updated_scheme_ids),
+            'removed': sorted(self.removed_scheme_ids),
+        }
+
+    def take_changeset(self):
+        changeset = self.changeset()
+        self.new_scheme_ids, self.updated_scheme_ids, self.removed_scheme_ids = set(), set(), set()
+        return changeset
+
+    def merge_changeset(self, changeset):
+        self.new_scheme_ids.update(changeset['new'])
+        self.updated_scheme_ids.update(changeset['updated'])
+        self.removed_scheme_ids.update(changeset['removed'])
+
+    def finish(self):
+        """
+        Announce the changeset. Bulk writes send no model signals, so the
+        derived indexes are refreshed by schemes_ingested receivers.
+        """
+        changeset = self.changeset()
+        schemes_ingested.send(sender=self.__class__, changeset=changeset)
+        return changeset
+
+
+_worker_loader = None
+
+
+def _init_worker(batch_size):
+    global _worker_loader
+    if not django.apps.apps.ready:
+        django.setup()
+    connections.close_all()
+    _worker_loader = SchemeLoader(batch_size=batch_size)
+
+
+def _load_state_in_worker(state_data):
+    loader = _worker_loader
+    rows_written, schemes_seen = loader.rows_written, loader.schemes_seen
+    loader.load_state(state_data)
+    return (state_data['state_name'], loader.rows_written - rows_written,
+            loader.schemes_seen - schemes_seen, loader.take_changeset())
+
+
+def load_file(file_path, batch_size=DEFAULT_BATCH_SIZE, workers=1, on_state=None):
+    """
+    Load the combined JSON. With workers > 1 the shared lookup tables are
+    seeded in one pass first, then state subtrees are fanned out over a
+    process pool, each worker holding its own connection and key caches.
+    Returns the loader that holds the combined counters and changeset.
+    """
+    loader = SchemeLoader(batch_size=batch_size)
+    if workers <= 1:
+        for state_data in iter_states(file_path):
+            loader.load_state(state_data)
+            if on_state:
+                on_state(state_data['state_name'])
+        loader.finish()
+        return loader
+
+    for state_data in iter_states(file_path):
+        loader.seed_shared(state_data)
+
+    # Children must open their own connections rather than share the parent's socket.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(batch_size,)) as pool:
+        pending = set()
+        for state_data in iter_states(file_path):
+            # Keep only a few parsed states in flight to bound memory.
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(loader, done, on_state)
+            pending.add(pool.submit(_load_state_in_worker, state_data))
+        _collect(loader, wait(pending).done, on_state)
+
+    loader.finish()
+    return loader
+
+
+def _collect(loader, futures, on_state):
+    for future in futures:
+        state_name, rows_written, schemes_seen, changeset = future.result()
+        loader.rows_written += rows_written
+        loader.schemes_seen += schemes_seen
+        loader.merge_changeset(changeset)
+        if on_state:
+            on_state(state_name)
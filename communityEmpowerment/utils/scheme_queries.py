@@ -0,0 +1,74 @@
+from collections import defaultdict
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from communityEmpowerment.models import Scheme, Beneficiary, Sponsor, Benefit, Tag, Document
+
+# Tags shown on a compact scheme card.
+COMPACT_TAG_LIMIT = 5
+
+
+def scheme_prefetches():
+    """Prefetches for every many-to-many SchemeSerializer nests."""
+    return [
+        # Serialized as a list of primary keys only.
+        Prefetch('documents', queryset=Document.objects.only('id')),
+        Prefetch('beneficiaries', queryset=Beneficiary.objects.all()),
+        Prefetch('sponsors', queryset=Sponsor.objects.all()),
+        Prefetch('benefits', queryset=Benefit.objects.all()),
+        Prefetch('tags', queryset=Tag.objects.all()),
+    ]
+
+
+def scheme_list_queryset(queryset=None):
+    """
+    `queryset` (all schemes by default) loading everything SchemeSerializer
+    reads, so serializing a page costs the same handful of queries whatever
+    its size.
+    """
+    if queryset is None:
+        queryset = Scheme.objects.all()
+    return queryset.select_related('department__state').prefetch_related(*scheme_prefetches())
+
+
+def prefetch_scheme_relations(schemes):
+    """The same loading for schemes already fetched into a list, e.g. one page of them."""
+    prefetch_related_objects(schemes, 'department__state', *scheme_prefetches())
+    return schemes
+
+
+def schemes_in_order(scheme_ids):
+    """Schemes for `scheme_ids`, in that order, loaded as scheme_list_queryset does."""
+    schemes = scheme_list_queryset().in_bulk(scheme_ids)
+    return [schemes[scheme_id] for scheme_id in scheme_ids if scheme_id in schemes]
+
+
+def compact_schemes(scheme_ids):
+    """
+    Card-sized rows for `scheme_ids`, in that order: id, title, state,
+    department and the first few tag names. Read with two .values() queries,
+    so no model instances are built and no nested serializers run.
+    """
+    scheme_ids = list(scheme_ids)
+    rows = {
+        row['id']: row for row in Scheme.objects.filter(id__in=scheme_ids).values(
+            'id', 'title', 'department__department_name', 'department__state__state_name',
+        )
+    }
+    tags = defaultdict(list)
+    for scheme_id, name in Scheme.tags.through.objects.filter(scheme_id__in=rows).order_by(
+        'scheme_id', 'tag__name'
+    ).values_list('scheme_id', 'tag__name'):
+        if len(tags[scheme_id]) < COMPACT_TAG_LIMIT:
+            tags[scheme_id].append(name)
+
+    return [
+        {
+            'id': scheme_id,
+            'title': rows[scheme_id]['title'],
+            'state': rows[scheme_id]['department__state__state_name'],
+            'department': rows[scheme_id]['department__department_name'],
+            'tags': tags[scheme_id],
+        }
+        for scheme_id in scheme_ids if scheme_id in rows
+    ]
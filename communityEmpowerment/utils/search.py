@@ -0,0 +1,178 @@
+import logging
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils.module_loading import import_string
+
+from communityEmpowerment.models import Scheme, SchemeBeneficiary
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+
+# Field weights, highest first: title, tags/beneficiaries, department, description.
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+
+def tokenize(query):
+    return re.findall(r'[^\W_]+', (query or '').lower())
+
+
+def scheme_search_documents(scheme_ids=None):
+    """
+    Return {scheme_id: {'A': title, 'B': tags + beneficiaries, 'C': department, 'D': description}}.
+    """
+    schemes = Scheme.objects.order_by()
+    tag_links = Scheme.tags.through.objects.order_by()
+    beneficiary_links = SchemeBeneficiary.objects.order_by()
+    if scheme_ids is not None:
+        schemes = schemes.filter(id__in=scheme_ids)
+        tag_links = tag_links.filter(scheme_id__in=scheme_ids)
+        beneficiary_links = beneficiary_links.filter(scheme_id__in=scheme_ids)
+
+    labels = defaultdict(list)
+    for scheme_id, name in tag_links.values_list('scheme_id', 'tag__name'):
+        labels[scheme_id].append(name or '')
+    for scheme_id, beneficiary_type in beneficiary_links.values_list('scheme_id', 'beneficiary__beneficiary_type'):
+        labels[scheme_id].append(beneficiary_type or '')
+
+    documents = {}
+    for scheme_id, title, description, department_name in schemes.values_list(
+        'id', 'title', 'description', 'department__department_name'
+    ):
+        documents[scheme_id] = {
+            'A': title or '',
+            'B': ' '.join(labels.get(scheme_id, [])),
+            'C': department_name or '',
+            'D': description or '',
+        }
+    return documents
+
+
+class PostgresSearchBackend:
+    """Weighted tsvector stored on Scheme.search_vector, matched through its GIN index."""
+
+    def search_vector(self, scheme_model=Scheme):
+        """
+        The weighted document of scheme_search_documents() as one SQL
+        expression, with tags, beneficiaries and department read through
+        correlated subqueries so it can be used in a single UPDATE.
+        Related models are reached through `scheme_model`, so a migration
+        can pass its historical Scheme.
+        """
+        tags = scheme_model.tags.through.objects.filter(scheme_id=OuterRef('pk')).order_by().values('scheme_id').annotate(
+            names=StringAgg('tag__name', ' ')
+        ).values('names')
+        beneficiaries = scheme_model.beneficiaries.through.objects.filter(
+            scheme_id=OuterRef('pk')
+        ).order_by().values('scheme_id').annotate(
+            names=StringAgg('beneficiary__beneficiary_type', ' ')
+        ).values('names')
+        department_model = scheme_model._meta.get_field('department').related_model
+        department = department_model.objects.filter(pk=OuterRef('department_id')).order_by().values('department_name')
+        return (
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(Subquery(tags), Subquery(beneficiaries), weight='B', config=SEARCH_CONFIG)
+            + SearchVector(Subquery(department), weight='C', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='D', config=SEARCH_CONFIG)
+        )
+
+    def update(self, scheme_ids=None):
+        """Recompute search_vector for `scheme_ids` (all schemes by default) in one UPDATE."""
+        schemes = Scheme.objects.all()
+        if scheme_ids is not None:
+            schemes = schemes.filter(pk__in=list(scheme_ids))
+        return schemes.update(search_vector=self.search_vector())
+
+    def build_query(self, query, any_term=False):
+        terms = tokenize(query)
+        if not terms:
+            return None
+        joiner = ' | ' if any_term else ' & '
+        return SearchQuery(joiner.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG)
+
+    def filter_q(self, query):
+        search_query = self.build_query(query)
+        return Q(search_vector=search_query) if search_query is not None else Q()
+
+    def search(self, queryset, query):
+        """Rank by SearchRank; fall back to matching any term when all terms find nothing."""
+        search_query = self.build_query(query)
+        if search_query is None:
+            return queryset.none()
+        results = queryset.filter(search_vector=search_query)
+        if not results.exists():
+            search_query = self.build_query(query, any_term=True)
+            results = queryset.filter(search_vector=search_query)
+        return results.annotate(rank=SearchRank(F('search_vector'), search_query)).order_by('-rank', 'id')
+
+
+class SimpleSearchBackend:
+    """
+    In-process fallback for databases without tsvector support (e.g. SQLite in tests).
+    Every term must prefix-match a word in one of the indexed fields.
+    """
+
+    def update(self, scheme_ids=None):
+        return 0
+
+    def _term_q(self, term):
+        return (
+            Q(title__icontains=term) | Q(description__icontains=term) |
+            Q(tags__name__icontains=term) | Q(beneficiaries__beneficiary_type__icontains=term) |
+            Q(department__department_name__icontains=term)
+        )
+
+    def filter_q(self, query):
+        terms = tokenize(query)
+        if not terms:
+            return Q()
+        term_filters = Q()
+        for term in terms:
+            term_filters &= self._term_q(term)
+        return Q(pk__in=Scheme.objects.filter(term_filters).values('id'))
+
+    def score(self, document, terms):
+        total = 0.0
+        for weight, text in document.items():
+            words = tokenize(text)
+            for term in terms:
+                total += WEIGHTS[weight] * sum(1 for word in words if word.startswith(term))
+        return total
+
+    def search(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        candidates = list(queryset.filter(self.filter_q(query)))
+        documents = scheme_search_documents([s.id for s in candidates])
+        scored = []
+        for scheme in candidates:
+            document = documents.get(scheme.id, {})
+            if all(any(word.startswith(t) for text in document.values() for word in tokenize(text)) for t in terms):
+                scheme.rank = self.score(document, terms)
+                scored.append(scheme)
+        scored.sort(key=lambda s: (-s.rank, s.id))
+        return scored
+
+
+def get_search_backend():
+    backend_path = getattr(settings, 'SCHEME_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return SimpleSearchBackend()
+
+
+def update_search_index(scheme_ids=None):
+    try:
+        return get_search_backend().update(scheme_ids)
+    except Exception as e:
+        logger.error(f"Search index update failed for {scheme_ids}: {str(e)}")
+        return 0
@@ -0,0 +1,357 @@
+import json
+import logging
+import os
+import re
+import threading
+
+import joblib
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from communityEmpowerment.models import Scheme
+from communityEmpowerment.utils.snapshots import current_snapshot, new_snapshot
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 2
+DEFAULT_TOP_K = 50
+PENDING_UPDATES_KEY = "similarity:{simplecache}_pending"
+
+
+def clean_text(text):
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def scheme_text(scheme):
+    """Text the TF-IDF model sees for a scheme. Expects tags/beneficiaries/sponsors prefetched."""
+    return clean_text(" ".join([
+        scheme.title or "",
+        scheme.funding_pattern or "",
+        scheme.description or "",
+        " ".join(tag.name for tag in scheme.tags.all()),
+        " ".join(b.beneficiary_type or "" for b in scheme.beneficiaries.all()),
+        " ".join(s.sponsor_type or "" for s in scheme.sponsors.all()),
+        scheme.department.department_name or "" if scheme.department else "",
+    ]))
+
+
+def get_store_dir():
+    return getattr(settings, 'SIMILARITY_STORE_DIR', os.path.join(settings.BASE_DIR, 'scheme_similarity'))
+
+
+def _top_k(block, k):
+    """
+    Best k columns of every row of a dense score block, best first. Entries
+    scored -inf are never returned; missing slots are padded with -1 / 0.
+    """
+    m, n = block.shape
+    k_eff = min(k, n)
+    indices = np.full((m, k), -1, dtype=np.int32)
+    scores = np.zeros((m, k), dtype=np.float32)
+    if m == 0 or k_eff == 0:
+        return indices, scores
+
+    top = np.argpartition(-block, k_eff - 1, axis=1)[:, :k_eff]
+    top_scores = np.take_along_axis(block, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    valid = np.isfinite(top_scores)
+    indices[:, :k_eff] = np.where(valid, top, -1)
+    scores[:, :k_eff] = np.where(valid, top_scores, 0)
+    return indices, scores
+
+
+def top_k_neighbours(matrix, k=DEFAULT_TOP_K, chunk_size=512):
+    """
+    Top-k cosine neighbours for every row of an L2-normalised sparse matrix,
+    computed chunk by chunk so the dense N x N matrix never exists.
+    Returns (row indices int32, scores float32), both shaped (N, k); rows with
+    fewer than k candidates are padded with -1 / 0.
+    """
+    n = matrix.shape[0]
+    neighbours = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+
+    matrix_t = matrix.T.tocsc()
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        block = (matrix[start:stop] @ matrix_t).toarray().astype(np.float32)
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # never recommend itself
+        neighbours[start:stop], scores[start:stop] = _top_k(block, k)
+    return neighbours, scores
+
+
+def partitioned_top_k_neighbours(matrix, group_ids, k=DEFAULT_TOP_K, chunk_size=512):
+    """
+    Like top_k_neighbours, but only rows sharing a group id (the scheme's state)
+    compete, so each block is just that state's rows. Returned indices are global rows.
+    """
+    group_ids = np.asarray(group_ids)
+    neighbours = np.full((matrix.shape[0], k), -1, dtype=np.int32)
+    scores = np.zeros((matrix.shape[0], k), dtype=np.float32)
+    for group in np.unique(group_ids):
+        rows = np.flatnonzero(group_ids == group)
+        local_neighbours, local_scores = top_k_neighbours(matrix[rows], k=k, chunk_size=chunk_size)
+        valid = local_neighbours >= 0
+        neighbours[rows] = np.where(valid, rows[np.clip(local_neighbours, 0, None)], -1)
+        scores[rows] = local_scores
+    return neighbours, scores
+
+
+def save_similarity_store(scheme_ids, neighbours, scores, state_ids=None, directory=None, model=None):
+    """
+    Publish the neighbour store as .npy files, plus the fitted vectorizer and
+    TF-IDF rows used for incremental updates when `model` is given as
+    (vectorizer, matrix). Everything goes into a new snapshot of `directory`
+    that replaces the previous one at once (see utils/snapshots.py), so a
+    reader never mixes arrays from two fits.
+    """
+    directory = directory or get_store_dir()
+    if state_ids is None:
+        state_ids = np.full(len(scheme_ids), -1)
+    arrays = {
+        'scheme_ids': np.asarray(scheme_ids, dtype=np.int64),
+        'state_ids': np.asarray(state_ids, dtype=np.int64),
+        'neighbours': np.asarray(neighbours, dtype=np.int32),
+        'scores': np.asarray(scores, dtype=np.float32),
+    }
+    meta = {'version': STORE_FORMAT_VERSION, 'count': int(len(arrays['scheme_ids'])), 'k': int(arrays['neighbours'].shape[1])}
+    with new_snapshot(directory) as snapshot:
+        for name, array in arrays.items():
+            np.save(os.path.join(snapshot, f'{name}.npy'), array)
+        if model is not None:
+            vectorizer, matrix = model
+            joblib.dump(vectorizer, os.path.join(snapshot, 'vectorizer.joblib'))
+            sparse.save_npz(os.path.join(snapshot, 'tfidf.npz'), sparse.csr_matrix(matrix))
+        with open(os.path.join(snapshot, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+
+def build_similarity_store(schemes, k=DEFAULT_TOP_K, directory=None):
+    """
+    Fit TF-IDF over the given schemes (ordered by id, with department and the
+    M2Ms prefetched) and save their same-state neighbours. Returns the row count.
+    """
+    scheme_ids, state_ids, scheme_data = [], [], []
+    for scheme in schemes:
+        scheme_ids.append(scheme.id)
+        state_ids.append(scheme.department.state_id if scheme.department else -1)
+        scheme_data.append(scheme_text(scheme))
+    if not scheme_data:
+        return 0
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform(scheme_data)
+
+    neighbours, scores = partitioned_top_k_neighbours(tfidf_matrix, state_ids, k=k)
+    save_similarity_store(scheme_ids, neighbours, scores, state_ids=state_ids, directory=directory,
+                          model=(vectorizer, tfidf_matrix))
+    return len(scheme_ids)
+
+
+def update_similarity_store(scheme_ids, directory=None):
+    """
+    Re-vectorise only the given schemes with the persisted vocabulary/IDF and
+    repair the neighbour lists they can affect:
+
+    * changed rows, and rows whose list pointed at a changed or deleted scheme,
+      are recomputed against their state's rows;
+    * every other row in those states merges the changed rows into its list.
+
+    Schemes that no longer exist are dropped. Returns the number of schemes
+    re-vectorised, or None when no persisted model exists (a full refit is needed).
+    """
+    directory = directory or get_store_dir()
+    snapshot = current_snapshot(directory)
+    if snapshot is None:
+        logger.warning(f"No similarity snapshot in {directory}")
+        return None
+    try:
+        vectorizer = joblib.load(os.path.join(snapshot, 'vectorizer.joblib'))
+        matrix = sparse.load_npz(os.path.join(snapshot, 'tfidf.npz')).tocsr()
+        old_ids = np.load(os.path.join(snapshot, 'scheme_ids.npy'))
+        old_states = np.load(os.path.join(snapshot, 'state_ids.npy'))
+        old_neighbours = np.load(os.path.join(snapshot, 'neighbours.npy'))
+        old_scores = np.load(os.path.join(snapshot, 'scores.npy'))
+    except (OSError, ValueError) as e:
+        logger.warning(f"No usable similarity model in {directory}: {str(e)}")
+        return None
+
+    changed = {int(i) for i in scheme_ids}
+    fresh = {
+        scheme.id: scheme for scheme in Scheme.objects.select_related('department').prefetch_related(
+            'tags', 'beneficiaries', 'sponsors'
+        ).filter(id__in=changed)
+    }
+    k = old_neighbours.shape[1]
+
+    # Rebuild the row layout: untouched rows keep their vectors, changed rows get new ones.
+    touched_old = np.isin(old_ids, list(changed))
+    kept_old_rows = np.flatnonzero(~touched_old)
+    fresh_ids = np.array(sorted(fresh), dtype=np.int64)
+    fresh_states = np.array(
+        [fresh[i].department.state_id if fresh[i].department else -1 for i in fresh_ids], dtype=np.int64
+    )
+    fresh_vectors = vectorizer.transform([scheme_text(fresh[i]) for i in fresh_ids])
+
+    stacked_ids = np.concatenate([old_ids[kept_old_rows], fresh_ids])
+    order = np.argsort(stacked_ids, kind='stable')
+    new_ids = stacked_ids[order]
+    new_states = np.concatenate([old_states[kept_old_rows], fresh_states])[order]
+    new_matrix = sparse.vstack([matrix[kept_old_rows], fresh_vectors]).tocsr()[order]
+
+    old_to_new = np.full(len(old_ids), -1, dtype=np.int64)
+    surviving = np.isin(old_ids, new_ids)
+    old_to_new[surviving] = np.searchsorted(new_ids, old_ids[surviving])
+
+    neighbours = np.full((len(new_ids), k), -1, dtype=np.int32)
+    scores = np.zeros((len(new_ids), k), dtype=np.float32)
+    kept_new_rows = old_to_new[kept_old_rows]
+    kept_lists = old_neighbours[kept_old_rows]
+    neighbours[kept_new_rows] = np.where(kept_lists >= 0, old_to_new[np.clip(kept_lists, 0, None)], -1)
+    scores[kept_new_rows] = old_scores[kept_old_rows]
+
+    changed_rows = np.searchsorted(new_ids, fresh_ids)
+    dirty = np.zeros(len(new_ids), dtype=bool)
+    dirty[changed_rows] = True
+    dirty[kept_new_rows] = ((kept_lists >= 0) & touched_old[np.clip(kept_lists, 0, None)]).any(axis=1)
+
+    affected_states = set(fresh_states.tolist()) | set(old_states[touched_old].tolist())
+    for state in affected_states:
+        rows = np.flatnonzero(new_states == state)
+        if rows.size == 0:
+            continue
+
+        dirty_rows = rows[dirty[rows]]
+        if dirty_rows.size:
+            block = (new_matrix[dirty_rows] @ new_matrix[rows].T).toarray().astype(np.float32)
+            block[np.arange(dirty_rows.size), np.searchsorted(rows, dirty_rows)] = -np.inf
+            local, local_scores = _top_k(block, k)
+            neighbours[dirty_rows] = np.where(local >= 0, rows[np.clip(local, 0, None)], -1)
+            scores[dirty_rows] = local_scores
+
+        clean_rows = rows[~dirty[rows]]
+        state_changed_rows = changed_rows[fresh_states == state]
+        if clean_rows.size and state_changed_rows.size:
+            candidate_rows = np.hstack([
+                neighbours[clean_rows],
+                np.broadcast_to(state_changed_rows, (clean_rows.size, state_changed_rows.size)),
+            ])
+            candidate_scores = np.hstack([
+                np.where(neighbours[clean_rows] >= 0, scores[clean_rows], -np.inf),
+                (new_matrix[clean_rows] @ new_matrix[state_changed_rows].T).toarray().astype(np.float32),
+            ])
+            picked, picked_scores = _top_k(candidate_scores, k)
+            neighbours[clean_rows] = np.where(
+                picked >= 0, np.take_along_axis(candidate_rows, np.clip(picked, 0, None), axis=1), -1
+            )
+            scores[clean_rows] = picked_scores
+
+    save_similarity_store(new_ids, neighbours, scores, state_ids=new_states, directory=directory,
+                          model=(vectorizer, new_matrix))
+    return len(fresh_ids)
+
+
+class SimilarityStore:
+    """
+    Memory-mapped top-k neighbour lists keyed by scheme id (ids sorted ascending).
+    Neighbours are restricted to the scheme's own state at build time.
+    `directory` is a store root (its current snapshot is opened) or a snapshot.
+    """
+
+    def __init__(self, directory):
+        directory = current_snapshot(directory) or directory
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != STORE_FORMAT_VERSION:
+            raise ValueError(f"store format {self.meta.get('version')}, expected {STORE_FORMAT_VERSION}")
+        self.scheme_ids = np.load(os.path.join(directory, 'scheme_ids.npy'), mmap_mode='r')
+        self.state_ids = np.load(os.path.join(directory, 'state_ids.npy'), mmap_mode='r')
+        self.neighbours = np.load(os.path.join(directory, 'neighbours.npy'), mmap_mode='r')
+        self.scores = np.load(os.path.join(directory, 'scores.npy'), mmap_mode='r')
+        count = self.meta.get('count')
+        if not (len(self.scheme_ids) == len(self.state_ids) == len(self.neighbours) == len(self.scores) == count):
+            raise ValueError(f"store arrays disagree with meta.json count {count}")
+
+    def row_for(self, scheme_id):
+        row = int(np.searchsorted(self.scheme_ids, scheme_id))
+        if row < len(self.scheme_ids) and self.scheme_ids[row] == scheme_id:
+            return row
+        return None
+
+    def neighbours_for(self, scheme_id):
+        """Return [(scheme_id, score), ...] best first, or [] for unknown schemes."""
+        row = self.row_for(scheme_id)
+        if row is None:
+            return []
+        rows = np.asarray(self.neighbours[row])
+        valid = rows >= 0
+        ids = self.scheme_ids[rows[valid]]
+        return list(zip(ids.tolist(), np.asarray(self.scores[row])[valid].tolist()))
+
+    def state_for(self, scheme_id):
+        row = self.row_for(scheme_id)
+        return None if row is None else int(self.state_ids[row])
+
+    def __len__(self):
+        return len(self.scheme_ids)
+
+
+_store_lock = threading.Lock()
+_store_cache = {}
+
+
+def load_similarity_store():
+    """Per-process store, reopened only when a new snapshot has been published."""
+    directory = get_store_dir()
+    snapshot = current_snapshot(directory)
+    if snapshot is None:
+        logger.warning(f"Similarity store not found at {directory}; run precompute_scheme_similarity")
+        return None
+
+    with _store_lock:
+        cached = _store_cache.get(directory)
+        if cached is None or cached[0] != snapshot:
+            try:
+                cached = (snapshot, SimilarityStore(snapshot))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Similarity store at {directory} is unreadable or outdated: {str(e)}")
+                return None
+            _store_cache[directory] = cached
+        return cached[1]
+
+
+def queue_similarity_update(scheme_ids):
+    """Remember schemes whose neighbours need refreshing by the debounced task."""
+    scheme_ids = [int(i) for i in scheme_ids]
+    if not scheme_ids:
+        return
+    try:
+        get_redis_connection("default").sadd(PENDING_UPDATES_KEY, *scheme_ids)
+    except NotImplementedError:
+        # Non-Redis cache backends (local development, tests)
+        pending = cache.get(PENDING_UPDATES_KEY) or set()
+        cache.set(PENDING_UPDATES_KEY, pending | set(scheme_ids), timeout=None)
+
+
+def pop_pending_similarity_updates():
+    try:
+        redis_client = get_redis_connection("default")
+        pipeline = redis_client.pipeline()
+        pipeline.smembers(PENDING_UPDATES_KEY)
+        pipeline.delete(PENDING_UPDATES_KEY)
+        members, _ = pipeline.execute()
+        return {int(member) for member in members}
+    except NotImplementedError:
+        pending = cache.get(PENDING_UPDATES_KEY) or set()
+        cache.delete(PENDING_UPDATES_KEY)
+        return set(pending)
@@ -0,0 +1,57 @@
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CURRENT_LINK = 'current'
+SNAPSHOT_PREFIX = 'snapshot-'
+# Snapshots kept on disk: the current one plus the one before it, which
+# processes that loaded it just before a swap may still be reading.
+KEEP_SNAPSHOTS = 2
+
+
+def current_snapshot(root):
+    """The snapshot directory `root/current` points at, or None if none was published."""
+    link = os.path.join(root, CURRENT_LINK)
+    if not os.path.islink(link):
+        return None
+    return os.path.realpath(link)
+
+
+@contextmanager
+def new_snapshot(root):
+    """
+    Yield an empty directory to write a whole store into. When the block
+    exits cleanly it becomes the current snapshot with one atomic symlink
+    swap, so a reader resolving `current` sees every file of the old store
+    or every file of the new one, never a mix.
+    """
+    os.makedirs(root, exist_ok=True)
+    name = f"{SNAPSHOT_PREFIX}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    staging = os.path.join(root, f".{name}.tmp")
+    os.makedirs(staging)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    os.rename(staging, os.path.join(root, name))
+    tmp_link = os.path.join(root, f".{CURRENT_LINK}-{uuid.uuid4().hex[:8]}.tmp")
+    os.symlink(name, tmp_link)
+    os.replace(tmp_link, os.path.join(root, CURRENT_LINK))
+    prune_snapshots(root)
+
+
+def prune_snapshots(root, keep=KEEP_SNAPSHOTS):
+    """Remove all but the newest `keep` snapshots, never the current one."""
+    current = current_snapshot(root)
+    snapshots = sorted(name for name in os.listdir(root) if name.startswith(SNAPSHOT_PREFIX))
+    for name in snapshots[:-keep] if keep else snapshots:
+        path = os.path.join(root, name)
+        if path != current:
+            shutil.rmtree(path, ignore_errors=True)
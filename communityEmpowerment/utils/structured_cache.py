@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Shrink to this fraction of the limit when evicting, so every store does not evict.
+EVICT_TO = 0.9
+
+
+def get_cache_dir():
+    return getattr(settings, 'GEMINI_CACHE_DIR', os.path.join(settings.BASE_DIR, 'gemini_cache'))
+
+
+def result_key(document, model_name, prompt_version):
+    """SHA-256 over the model, the prompt/schema version and the document sent to it."""
+    if not isinstance(document, str):
+        document = json.dumps(document, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(f"{model_name}\0{prompt_version}\0".encode())
+    digest.update(document.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StructuredResultCache:
+    """
+    Gemini structuring results on disk, one JSON file per result_key. Reads
+    refresh a file's mtime and the least recently used files are removed
+    once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or get_cache_dir()
+        if max_bytes is None:
+            max_bytes = getattr(settings, 'GEMINI_CACHE_MAX_MB', 512) * MB
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.size = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+    def get(self, digest):
+        path = self.path(digest)
+        try:
+            with open(path, encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return result
+
+    def set(self, digest, result):
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self.entries())
+            try:
+                self.size -= os.path.getsize(path)
+            except OSError:
+                pass
+            self.size += os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+            self.stores += 1
+            if self.size > self.max_bytes:
+                self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every cached result."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for subdir in os.scandir(self.directory):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries())
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self.size <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+            self.evictions += 1
+        logger.info(f"Evicted Gemini cache down to {self.size / MB:.1f} MB")
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return (f"{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+                f"{self.stores} stored, {self.evictions} evicted")
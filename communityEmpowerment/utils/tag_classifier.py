@@ -0,0 +1,478 @@
+from collections import deque
+
+# Tag categorisation keywords. Matching is case-insensitive and by substring,
+# except for WORD_BOUNDARY_KEYWORDS which must appear as whole words.
+
+SCHOLARSHIP_KEYWORDS = [
+    "scholarship", "fellowship", "grant", "stipend", "tuition support", "fee waiver", "educational aid",
+    "Bursary", "Compulsory Fee Reimbursement", "Fee Exemption", "Fee Reimbursement", "Merit-based",
+    "Merit-cum-Means", "Post Matric", "Post-Matric", "Pre Matric", "Pre-Matric", "Pre-matric",
+    "Prematric", "Tuition Fee", "Tuition Fees", "Means-cum-Merit", "Student Performance",
+    "Meritorious Students", "Financial Aid", "Monetary Incentive"
+]
+
+JOB_KEYWORDS = [
+    "job", "employment", "recruitment", "vacancy", "career", "job fair", "placement", "hiring",
+    "Civil Service", "Journalism", "Journalist", "Journalists", "Advocates", "Legal practice"
+]
+
+GOVT_JOB_KEYWORDS = [
+    "govt job", "government recruitment", "public sector", "sarkari naukri", "upsc", "ssc", "psu", "rrb",
+    "IAS", "IPS", "IRS", "Government Service", "MPPSC"
+]
+
+PRIVATE_JOB_KEYWORDS = [
+    "private job", "corporate hiring", "MNC recruitment", "industry placement"
+]
+
+INTERNSHIP_KEYWORDS = [
+    "internship", "apprentice", "trainee", "training program", "summer training", "industrial training"
+]
+
+SKILL_JOB_KEYWORDS = [
+    "freelance", "gig work", "self-employment", "contract job", "daily wage", "micro job",
+    "Carpentry", "Electrician", "Fitting", "Masonry", "Motor Mechanic", "Plumbing", "Tailoring",
+    "Turning", "Welding", "Craft", "Crafts", "Handicrafts", "Leather", "Embroidery"
+]
+
+DEFENSE_JOB_KEYWORDS = [
+    "army recruitment", "navy job", "air force", "police hiring", "defense", "paramilitary", "bsf", "cisf",
+    "Military", "Ex-Servicemen", "Veterans"
+]
+
+SC_KEYWORDS = [
+    "sc", "scheduled caste", "dalit", "safai karamchari", "manual scavenger",
+    "Scheduled Caste", "Adi Dravidar", "Charmakar", "Charmakar Community", "Valmiki Samaj",
+    "Navbouddha", "SCSP", "SCs", "SCs/STs", "Caste Discrimination", "Untouchability",
+    "Untouchability Eradication", "Prevention of Atrocities", "Prevention of Atrocities Act",
+    "Atrocities", "Atrocity", "Victims of Atrocities"
+]
+
+ST_KEYWORDS = [
+    "st", "scheduled tribe", "tribal", "vanvasi", "aadivasi",
+    "Scheduled Tribe", "STs", "SCs/STs", "Vimukta Jatis", "Nomadic Tribes", "DNT", "Indigenous Population"
+]
+
+OBC_KEYWORDS = [
+    "obc", "other backward class", "backward class", "bc", "most backward class",
+    "OBC", "VJNT", "Backward Students", "OEC"
+]
+
+MINORITY_KEYWORDS = [
+    "minority", "muslim", "christian", "sikh", "buddhist", "jain", "parsi", "zoroastrian",
+    "Minorities", "National Minorities", "Hindu", "Hinduism"
+]
+
+FINANCIAL_KEYWORDS = [
+    "loan", "subsidy", "financial assistance", "funding", "support", "pension", "microfinance", "credit",
+    "Financial Incentive", "Monetary Relief", "Cash Prize", "Cash", "Assistance", "Financial Inclusion",
+    "Financial Viability", "Financial boost", "Interest-Free", "Interest-free", "Margin Money",
+    "Contributory Scheme", "Debt Relief Scheme", "One Time Settlement", "Deposit Accounts",
+    "Share Capital", "Capital", "Institutional finance", "Incentive Scheme", "Incentives",
+    "Central Assistance", "Special Assistance", "Financial Aid", "Compensation", "Relief",
+    "Marriage Assistance", "Marriage Incentive", "Calf Incentive", "One-time Incentive",
+    "One-time payment", "Maintenance Allowance", "Allowance", "Arrears", "Tax Reimbursement",
+    "Stamp Duty", "50:50 Cost Sharing", "Budget allocation"
+]
+
+WOMEN_KEYWORDS = [
+    "women", "female", "girl child", "mahila", "nari", "pregnant", "lactating", "mother", "widow",
+    "working women", "Adolescent Girls", "Adolescent girls", "Girls", "Daughters", "Housewives",
+    "Maternity", "Maternity Benefit", "Deserted", "Destitute", "IGNWPS", "Marriage",
+    "Inter-caste Marriage", "Intercaste Marriage", "Mass Marriage", "Collective Wedding",
+    "Empowerment", "Economic empowerment", "Kishori Balika", "Pregnant Women", "Safe Motherhood"
+]
+
+AGRICULTURE_KEYWORDS = [
+    "farmer", "agriculture", "kisaan", "crop", "irrigation", "fertilizer", "soil", "farm",
+    "Agricultural Marketing", "Agro-based industries", "Dairy", "Dairy Development",
+    "Animal Husbandry", "Livestock", "Livestock Development", "Poultry", "Piggery", "Goatery",
+    "Fisheries", "Fish Feed", "Fish Market", "Cattle rearing", "Cattle herders", "Milk Production",
+    "Seed", "Seed Certification", "Seed Multiplication", "Seed Production", "Seed Testing",
+    "Seeds", "Paddy Seeds", "Minikit", "Bio Agents", "Bio Pesticides", "Pesticides",
+    "Plant Protection", "Plant Protection Equipment", "Planting Material", "Cultivation Methods",
+    "Green Fodder Cultivation", "Fodder Development", "Compost", "Biogas", "Biomass Briquetting",
+    "Organic Waste", "Kitchen Garden", "Land Development", "Land terracing", "Land Management",
+    "Ponds", "Water Management", "Irrigation", "PMKSY", "PM-KISAN", "Pradhan Mantri Kisan Samman Nidhi",
+    "Pradhan Mantri Fasal Bima Yojana", "PMFBY", "Paddy Reapers", "Power Tillers",
+    "Mechanization", "Cold Storage", "Market Access", "Market Information", "Marketing",
+    "Oilseeds", "Pulses", "Maize", "Rice", "Wheat", "Grafting", "Eri Silk", "Silk Reeling",
+    "Rubber cultivation", "Tea cultivation", "Farm", "Farmers", "Fertilizer", "Rhizobium",
+    "Iodized Salt Distribution", "Subsidized Salt", "Subsidized Food Grains", "Antyodaya Anna Yojana",
+    "Food Grains", "Procurement", "Public Distribution System", "PDS", "RKVY", "Recommended Package of Practices"
+]
+
+SENIOR_KEYWORDS = [
+    "senior citizen", "pension", "old age", "vridh", "elderly", "retirement", "superannuation",
+    "IGNOAPS", "Old Age"
+]
+
+DISABILITY_KEYWORDS = [
+    "disability", "divyang", "handicapped", "pwd", "special needs", "differently abled", "blind",
+    "hearing impaired", "Disabled", "Disabled Persons", "Disabled Students", "Differently-abled",
+    "Cerebral Palsy", "Mentally Challenged", "Motorized Tricycle", "Assistive Devices",
+    "Viklangta Praman Patra", "Dwarf", "NHFDC", "Persons with Disabilities", "Physical Disability",
+    "Mental Disability", "Special Needs"
+]
+
+BUSINESS_KEYWORDS = [
+    "startup", "business", "entrepreneur", "MSME", "enterprise", "self-employment", "new venture",
+    "industrial unit", "Cottage Industries", "Cooperative Societies", "Handloom", "Handloom Weavers",
+    "Textile", "Textiles", "Textile Parks", "Industrial Estates", "Industries", "Industry",
+    "Manufacturing", "Manufacturing Industries", "Manufacturing Sector", "Agri-tech",
+    "Meditech", "Self Help Group", "Self Help Groups", "Self Reliance", "Self-Sufficiency",
+    "Self-reliance", "Micro", "Small", "Medium", "SIPCOT", "TANSidCO Industrial Estates",
+    "TIIC", "UYEGP", "NEF scheme", "NSKFDC", "Stand-Up India", "Market", "Economic Development",
+    "Economic Upliftment", "Economic growth", "Investment", "Financial Viability", "Industrial Workers"
+]
+
+EDUCATION_KEYWORDS = [
+    "education", "training", "10+2", "coaching", "school", "college", "university", "exam",
+    "online course", "learning", "Class 10", "Class 11", "Class 12", "Class 6 to 8", "Class 9",
+    "Classes 6 to 8", "10th Standard", "11th Standard", "12th Standard", "12th pass",
+    "Matriculation", "Higher Secondary", "Post Graduate", "Post-Matriculation", "Post-Matric Courses",
+    "Pre-Matric Courses", "Diploma", "Certificate", "Certificate Programme", "Certification",
+    "Professional Courses", "Technical Courses", "Short Term Courses", "Evening Courses",
+    "Correspondence Courses", "Polytechnic", "ITI", "NCVT", "Engineering", "Engineering Entrance",
+    "JEE", "GUJCET", "NEET", "Architecture", "PhD", "MPhil", "Study Abroad", "Foreign Study",
+    "Coaching", "Free Textbooks", "Text Books", "Book Bank", "Book Distribution", "Book-bank Facilities",
+    "Books", "Library", "Library Management", "Library Award Scheme", "Best Library Award",
+    "Reference Books", "Stationary", "Stationery", "Drawing", "Drawing Materials", "Calculators",
+    "Computer", "Laptop", "Bicycle Distribution", "Free Travel", "Hostel", "Hostel Facilities",
+    "Hostels", "Girls Hostel", "Boarding", "Residential Facilities", "Residential Facility",
+    "Merit", "Merit Awards", "Awards", "Awards and Recognition", "Competition", "Competitive Capacity",
+    "Cultural Talent Search", "Essay writing", "Handwriting", "Poem Writing", "Science Seminars",
+    "Study Tour", "Exposure Visit", "Sanskrit", "Hindi", "Konkani", "Konkani Language", "Marathi",
+    "Language Skill Program", "Sarva Shiksha Abhiyan", "RTE", "RTE Act", "Mid Day Meal", "MDM",
+    "POSHAN Abhiyaan", "Literacy", "Education", "Students", "Student", "Backward Students",
+    "AICTE", "NIFT", "IIM", "NLU", "Gujarat Vidhyapeeth", "Universities", "Academic Excellence",
+    "Concessions", "Admission", "Enrolment"
+]
+
+HEALTH_KEYWORDS = [
+    "health", "insurance", "medical", "ayushman", "treatment", "hospital", "disease", "wellness",
+    "nutrition", "Anemia", "Cancer", "HIV/AIDS prevention", "Tuberculosis control", "TB",
+    "TB patients", "Rabies", "Rabies Control", "Free diagnosis", "Free service", "Mediclaim Scheme",
+    "Maternity", "Maternity Benefit", "Family Planning", "Sterilization", "IFA supplementation",
+    "Childcare", "Children", "ICDS", "Anganwadi Workers", "Anganwadi Helpers", "ASHA",
+    "AWC", "Day Care", "Daycare", "Crèche", "Vaccination", "Veterinary Services", "Health Services",
+    "Emergency Services", "Ambulance service", "Fire Fighting Services", "Fire Safety",
+    "Cleanliness", "Hygienic", "Sanitation", "Drinking Water", "Water & Sewage Management",
+    "Sewerage", "Solid and Liquid Waste Management", "Waste Management", "Kitchen Waste",
+    "Organic Waste", "Stray Dog Management", "Stray Dogs", "Nutrition", "Food", "Food Security",
+    "Mid Day Meal", "Akshaya Patra", "Breakfast", "Subsidized Food Grains", "Antyodaya Anna Yojana",
+    "Public Distribution System", "POSHAN Abhiyaan", "Health Awareness", "Awareness Campaign",
+    "Awareness Programmes", "Awareness Programs", "Health Camps", "Camps"
+]
+
+HOUSING_KEYWORDS = [
+    "housing", "home", "pradhan mantri awas", "rental", "urban housing", "slum", "shelter",
+    "infrastructure", "PMAY", "House Site", "Construction of New Houses", "Repairs of Existing Houses",
+    "Reconstruction of Existing Houses", "Building", "Building Construction", "Accommodation",
+    "Government Buildings", "Guest House", "Community Halls", "Conference Hall", "Dr.Ambedkar Bhavan",
+    "Ambedkar Bhavan", "Babu Jagjiban Ram Chatrabas Yojana", "Burial Ground", "Cremation Ground",
+    "Funeral Expenses", "Funeral Rites", "Basic amenities", "Civic Amenities", "Roads-Plan",
+    "Road Construction", "Road Connectivity", "Rural Roads", "PMGSY", "Drainage", "Sewerage",
+    "Electricity", "Power Supply", "Power Tariff", "Broadband", "BharatNet", "City Wi-Fi",
+    "CCTVs", "Public Works", "Land Purchase Assistance", "Land Ownership", "Residential certificates",
+    "Economically Weaker Sections", "EWS", "Low Income", "LIG", "BPL", "Below Poverty Line",
+    "BPL families", "Urban Areas", "Urban Development", "Infrastructure Development"
+]
+
+YOUTH_KEYWORDS = [
+    "skill development", "training", "youth", "vocational", "NSDC", "kaushal", "apprenticeship",
+    "capacity building", "Skill India", "Skill upgradation", "Skills Development", "SANKALP",
+    "Yuva Srujan Puraskar", "Youth", "Cultural Talent Search", "Competitive Capacity",
+    "Sports", "Games", "Creativity", "Cultural Activities", "Dance", "Drama", "Painting",
+    "Cultural Shows", "Exhibition", "Exhibitions", "Festival/Exhibition", "Cultural Exchange",
+    "Cultural Groups", "Cultural Institutions", "Talent Search", "Competitions", "Career Counseling",
+    "Counseling", "Training Programs"
+]
+
+TRANSPORTATION_KEYWORDS = [
+    "transport", "transportation scheme", "road safety", "public transport", "metro", "bus service",
+    "railway", "auto rickshaw", "Kadamba Buses", "Free Travel", "Bicycle Distribution",
+    "Motorized Tricycle", "Electric Vehicles", "Road", "Road Construction", "Road Works",
+    "Road Connectivity", "Rural Roads", "PMGSY", "State Plan Road Works", "Border Management",
+    "Inter-State boundary", "Travel", "Tourism", "Pilgrimage", "Religious Tourism",
+    "Directorate of Civil Aviation", "Air Hostess", "Logistics", "Transport Services"
+]
+
+ENVIRONMENT_KEYWORDS = [
+    "environment", "climate change", "conservation", "pollution", "green energy", "eco-friendly",
+    "sustainability", "carbon footprint", "Afforestation", "Forestry", "Public Forest",
+    "Eco Tourism", "Green House Gas Emissions", "Green Investment", "Clean energy",
+    "Renewable Energy", "Renewable Energy sources", "Biogas", "Biomass Briquetting",
+    "Waste Management", "Solid and Liquid Waste Management", "Organic Waste", "Kitchen Waste",
+    "Waste to Wealth", "Wastelands", "Water Management", "Watershed", "Desilting", "Ponds",
+    "Ground Water Prospect Map", "Wildlife", "Wildlife damage", "Environmental Sustainability",
+    "Ecological Balance", "Forest Produce", "Minor Forest Produce", "Forest Crimes", "Forest Officer",
+    "Forest Department", "Wildlife Conservation", "Wild Animals", "National Park", "Tiger Foundation Society"
+]
+
+DIGITAL_SERVICES_KEYWORDS = [
+    "digital", "e-governance", "online services", "internet connectivity", "technology",
+    "digital literacy", "digital payment", "smart city", "Aadhaar", "Aadhaar Based Attendance System",
+    "Biometrics", "Online Portal", "Online submission of Application for Mobile Tower and OFC",
+    "Electronic Service Delivery", "Digidhan Mission", "Common Service Centre (CSC)", "ICT",
+    "IT", "ITES", "IT initiatives", "IT/ITeS Investment Promotion", "NKN", "JharNet",
+    "SMS Gateway", "Video conferencing", "Geo Data base", "GIS", "WAMIS", "Digital Services",
+    "BharatNet", "City Wi-Fi", "e-District", "e-MULAKAT", "e-Nagarik", "e-Office", "e-Procurement",
+    "e-Service", "e-Service Platform", "eKalyan", "Payment Gateway", "UIDAI"
+]
+
+SOCIAL_WELFARE_KEYWORDS = [
+    "social welfare", "welfare", "poverty alleviation", "social security", "NGO", "community service",
+    "support program", "Social Development", "Social Inclusion", "Social Inequality", "Social Reform",
+    "Social Remedies", "Social Upliftment", "Social incentive", "Socio-economic Development",
+    "Poverty", "Poverty Line", "Poverty Upliftment", "Below Poverty Line", "BPL", "BPL families",
+    "Economically Weaker Sections", "Marginalized", "Marginalized Communities", "Destitute",
+    "Orphaned", "Care and Protection", "Family based care", "Foster Care", "Bonded Labour",
+    "Unorganized Sector", "Unskilled Manual Work", "Cleaning Occupations", "Cleaning Workers",
+    "Unclean Occupation", "Rehabilitation", "Relief and Rehabilitation", "NSAP", "National Social Assistance Programme",
+    "IGNDPS", "IGNOAPS", "IGNWPS", "NFBS", "Community Development", "Advisory Committees",
+    "Advisory Services", "Awareness", "Awareness Campaign", "Awareness Programmes", "Awareness Programs",
+    "Social Service", "Human Resource Development", "Human resource development", "Social Assistance",
+    "Special Component Plan", "Sub Plan", "TSP", "SCSP", "Social Capital", "Community Self-reliance",
+    "Vulnerable Communities", "Victim Compensation", "Witness Protection"
+]
+
+RURAL_DEVELOPMENT_KEYWORDS = [
+    "rural development", "village", "panchayat", "rural infrastructure", "farmers' welfare",
+    "water supply", "sanitation", "road development", "Rural", "Rural Labourers", "Rural Roads",
+    "Rural Works Programme", "MGNREGA", "PMGSY", "Panchayat", "Panchayat Bhawan", "Local Area Development",
+    "Community Development", "Rural Electrification", "Drinking Water", "Basic amenities",
+    "Civic Amenities", "Drainage", "Sewerage", "Burial Ground", "Public Assets", "Land Development",
+    "Land Management", "Desilting", "Ponds", "Water Management", "Watershed", "Area Development",
+    "Village Development", "Gramin Vikas", "Sansad Adarsh Gram Yojana", "Rurban"
+]
+
+URBAN_DEVELOPMENT_KEYWORDS = [
+    "urban development", "city planning", "infrastructure", "housing for all", "urban slums",
+    "urbanization", "smart cities", "metro development", "Urban", "Urban Areas", "City Wi-Fi",
+    "Smart City", "Civic Amenities", "Public Works", "Sewerage", "Drainage", "Road Construction",
+    "Urban Infrastructure", "Municipal Services"
+]
+
+INTERNATIONAL_RELATIONS_KEYWORDS = [
+    "international aid", "foreign scholarships", "diaspora", "NRIs", "global initiatives",
+    "international collaboration", "International", "Overseas", "Foreign Study", "Study Abroad",
+    "Cultural Exchange"
+]
+
+TECHNOLOGY_INNOVATION_KEYWORDS = [
+    "innovation", "tech innovation", "startups", "research and development", "artificial intelligence",
+    "robotics", "machine learning", "Technology", "IT", "ITES", "IT initiatives", "IT/ITeS Investment Promotion",
+    "STPI", "NSICTANSidCO Consortium", "Intellectual Property", "Modernisation", "Modernization",
+    "Mechanization", "Agri-tech", "Meditech", "Electronic Service Delivery", "Digital Services",
+    "Innovation", "Research", "ISO Certification"
+]
+
+LEGAL_KEYWORDS = [
+    "legal aid", "free legal consultation", "law", "legal assistance", "human rights", "constitution",
+    "rights", "justice", "Legal", "Special Courts", "Special Criminal Courts", "Judiciary",
+    "Prevention of Atrocities Act", "Atrocities", "Atrocity", "Victims of Atrocities",
+    "Witness Protection", "Legal Services", "Advocates", "Legal practice", "Regulation",
+    "Policy", "Consumer Protection", "Consumer Rights"
+]
+
+FOOD_SECURITY_KEYWORDS = [
+    "food security", "ration", "food assistance", "mid-day meal", "food subsidy", "PDS",
+    "nutrition scheme", "food distribution", "Antyodaya Anna Yojana", "Subsidized Food Grains",
+    "Subsidized Salt", "Public Distribution System", "Mid Day Meal", "Akshaya Patra",
+    "Breakfast", "POSHAN Abhiyaan", "Food Grains", "Iodized Salt Distribution", "Food",
+    "Nutrition", "Food Security"
+]
+
+DISASTER_MANAGEMENT_KEYWORDS = [
+    "disaster relief", "disaster management", "flood relief", "earthquake aid", "cyclone relief",
+    "drought relief", "natural calamities", "Disaster Mitigation", "Relief", "Relief and Rehabilitation",
+    "Accident", "Injury", "Death Benefit", "Compensation", "Contingency scheme", "Emergency Services",
+    "Fire Fighting Services", "Fire Safety", "Ambulance service", "Calamity Relief"
+]
+
+CLIMATE_ACTION_KEYWORDS = [
+    "climate action", "carbon emissions", "global warming", "environmental protection",
+    "green initiatives", "climate adaptation", "Green House Gas Emissions", "Green Investment",
+    "Clean energy", "Renewable Energy", "Renewable Energy sources", "Afforestation", "Forestry",
+    "Eco Tourism", "Waste Management", "Solid and Liquid Waste Management", "Waste to Wealth",
+    "Environmental Sustainability", "Ecological Balance"
+]
+
+GENDER_EQUALITY_KEYWORDS = [
+    "gender equality", "equal pay", "women empowerment", "gender-based violence", "LGBTQ+",
+    "diversity", "gender parity", "Women", "Female", "Girl child", "Mahila", "Nari", "Empowerment",
+    "Economic empowerment", "Third Gender Community", "Eunuchs", "Social Inclusion",
+    "Inter-caste Marriage", "Intercaste Marriage", "Equality"
+]
+
+CHILD_WELFARE_KEYWORDS = [
+    "child welfare", "child protection", "child rights", "child labor", "nutrition for children",
+    "angawadi", "child development", "Childcare", "Children", "Children's Festival", "ICDS",
+    "Anganwadi Workers", "Anganwadi Helpers", "ASHA", "AWC", "Day Care", "Daycare", "Crèche",
+    "POSHAN Abhiyaan", "Mid Day Meal", "Akshaya Patra", "Breakfast", "Care and Protection",
+    "Family based care", "Foster Care", "Orphaned", "Child Development", "Nutrition for Children",
+    "Child Rights", "Child Protection"
+]
+
+CONSUMER_PROTECTION_KEYWORDS = [
+    "consumer rights", "consumer protection", "consumer complaints", "consumer helpline",
+    "fraud prevention", "product safety", "Consumer Protection", "Consumer Rights", "Commercial taxes",
+    "VAT", "Quality Control", "Quality Improvement"
+]
+
+CULTURAL_PRESERVATION_KEYWORDS = [
+    "culture", "cultural heritage", "art", "music", "literature", "folklore", "museum", "archaeology",
+    "traditional arts", "Cultural Activities", "Cultural Award", "State Cultural Award",
+    "Cultural Exchange", "Cultural Groups", "Cultural Institutions", "Cultural Shows",
+    "Cultural Talent Search", "Dance", "Drama", "Painting", "Handicrafts", "Traditional Products",
+    "Traditional crafts", "Ethnic Foods", "Festivals", "Festival", "Annual Mela", "Annual Event",
+    "Annual event", "One-day event", "Three-day event", "Exhibition", "Exhibitions",
+    "Festival/Exhibition", "Folk Festival", "Religious Event", "Hindu", "Hinduism", "Sufi",
+    "Christmas", "Anant Chaturdashi", "Ganesh Chaturthi", "Navratri", "Sharad Navratri",
+    "Chaitra", "Ramnavmi", "Krishna Janmashtami", "Shivratri", "Maha Shivratri", "Religious Tourism",
+    "Pilgrimage", "Teerth", "Temple", "Historical Place", "Chamunda Mata temple",
+    "Mahakaleshwar temple", "Omkareshwar", "Jyotirlinga", "Chandraprabhu", "Khandwa", "Narwar",
+    "Sonagiri", "Datia", "Nijampur", "Pitampara Peeth", "Harsiddhi temple", "Hanuman Dhara",
+    "Sati Anusuiya Ashram", "Jatashankar Dham", "Gupta Godavari", "Caves", "Kamdagiri Parikrama",
+    "Kanha", "Chitrakut", "Urs Mela", "Rang Panchmi", "Basant Panchmi Mela", "Deepawali Mela",
+    "Navratri Mela", "Rahas Mela", "Makar Sankranti", "Magh Shukla Purnima", "Bhagwan Shankar",
+    "Bhagwan ’Shiv ka vishal mandir", "Shani Dev", "Shiva", "Mahakal", "Cultural Preservation"
+]
+
+RESEARCH_AND_DEVELOPMENT_KEYWORDS = [
+    "R&D", "scientific research", "innovation", "technology", "patents", "research funding",
+    "academic research", "university grants", "Research", "Evaluation", "Data Collection",
+    "Survey", "Census", "Monitoring", "Jharkhand Space Application Center (JSAC)", "Geo Data base",
+    "GIS", "WAMIS", "Ground Water Prospect Map", "Intellectual Property", "Innovation",
+    "Modernisation", "Modernization", "Scientific Research"
+]
+
+# Checked in this order; the first category with a matching keyword wins.
+CATEGORY_KEYWORDS = [
+    ("scholarship", SCHOLARSHIP_KEYWORDS),
+    ("govt_job", GOVT_JOB_KEYWORDS),
+    ("private_job", PRIVATE_JOB_KEYWORDS),
+    ("internship", INTERNSHIP_KEYWORDS),
+    ("skill_based_job", SKILL_JOB_KEYWORDS),
+    ("defense_job", DEFENSE_JOB_KEYWORDS),
+    ("job", JOB_KEYWORDS),
+    ("sc", SC_KEYWORDS),
+    ("st", ST_KEYWORDS),
+    ("obc", OBC_KEYWORDS),
+    ("minority", MINORITY_KEYWORDS),
+    ("financial_assistance", FINANCIAL_KEYWORDS),
+    ("women", WOMEN_KEYWORDS),
+    ("agriculture", AGRICULTURE_KEYWORDS),
+    ("senior_citizen", SENIOR_KEYWORDS),
+    ("disability", DISABILITY_KEYWORDS),
+    ("business", BUSINESS_KEYWORDS),
+    ("education", EDUCATION_KEYWORDS),
+    ("health", HEALTH_KEYWORDS),
+    ("housing", HOUSING_KEYWORDS),
+    ("youth_skill", YOUTH_KEYWORDS),
+    ("transportation", TRANSPORTATION_KEYWORDS),
+    ("environment", ENVIRONMENT_KEYWORDS),
+    ("digital_services", DIGITAL_SERVICES_KEYWORDS),
+    ("social_welfare", SOCIAL_WELFARE_KEYWORDS),
+    ("rural_development", RURAL_DEVELOPMENT_KEYWORDS),
+    ("urban_development", URBAN_DEVELOPMENT_KEYWORDS),
+    ("international_relations", INTERNATIONAL_RELATIONS_KEYWORDS),
+    ("technology_innovation", TECHNOLOGY_INNOVATION_KEYWORDS),
+    ("legal", LEGAL_KEYWORDS),
+    ("food_security", FOOD_SECURITY_KEYWORDS),
+    ("disaster_management", DISASTER_MANAGEMENT_KEYWORDS),
+    ("climate_action", CLIMATE_ACTION_KEYWORDS),
+    ("gender_equality", GENDER_EQUALITY_KEYWORDS),
+    ("child_welfare", CHILD_WELFARE_KEYWORDS),
+    ("consumer_protection", CONSUMER_PROTECTION_KEYWORDS),
+    ("cultural_preservation", CULTURAL_PRESERVATION_KEYWORDS),
+    ("research_and_development", RESEARCH_AND_DEVELOPMENT_KEYWORDS),
+]
+
+WORD_BOUNDARY_KEYWORDS = {"sc", "st", "obc"}
+DEFAULT_CATEGORY = "general"
+
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over every lower-cased keyword. One pass over a
+    tag name finds all keywords in it; the name gets the matching category
+    that comes first in CATEGORY_KEYWORDS.
+    """
+
+    def __init__(self, category_keywords):
+        self.categories = [category for category, _ in category_keywords]
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        priorities = {}
+        for priority, (_, keywords) in enumerate(category_keywords):
+            for keyword in keywords:
+                priorities.setdefault(keyword.lower(), priority)
+        for keyword, priority in priorities.items():
+            self.add(keyword, priority)
+        self.link()
+
+    def add(self, keyword, priority):
+        state = 0
+        for char in keyword:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append((len(keyword), priority, keyword in WORD_BOUNDARY_KEYWORDS))
+
+    def link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def classify(self, name):
+        text = name.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        best = None
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, priority, whole_word in output[state]:
+                if best is not None and priority >= best:
+                    continue
+                if whole_word:
+                    start = end - length + 1
+                    if (start > 0 and is_word_char(text[start - 1])) or \
+                            (end + 1 < len(text) and is_word_char(text[end + 1])):
+                        continue
+                best = priority
+            if best == 0:
+                break
+        return self.categories[best] if best is not None else DEFAULT_CATEGORY
+
+
+_automaton = KeywordAutomaton(CATEGORY_KEYWORDS)
+
+
+def classify_tag(name):
+    """Category for one tag name."""
+    return _automaton.classify(name or "")
+
+
+def classify_tags(names):
+    """Categories for many tag names, in the same order."""
+    classify = _automaton.classify
+    return [classify(name or "") for name in names]
@@ -1,51 +1,31 @@
-import pickle
-from communityEmpowerment.models import Scheme, UserInteraction
-import os
-from scipy.sparse import csr_matrix
-from sklearn.decomposition import TruncatedSVD
-import numpy as np
-import pandas as pd
+from communityEmpowerment.models import Scheme
+from communityEmpowerment.utils.collaborative import load_collaborative_model
 import spacy
 from django.db.models import Q
 
-def load_cosine_similarity():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    cosine_sim_path = os.path.join(base_dir,'..','..', 'cosine_sim_matrix.pkl')
-
-    with open(cosine_sim_path, 'rb') as f:
-        return pickle.load(f)
-    
-def recommend_schemes(scheme_id, cosine_sim, top_n=5):
+def recommend_schemes(scheme_id, store, top_n=5):
+    """
+    Recommend schemes from the same state using the precomputed neighbour store.
+    Neighbour lists are already restricted to the scheme's state, so only the
+    top_n winners are fetched, with everything SchemeSerializer nests prefetched.
+    """
     try:
-        schemes = list(Scheme.objects.select_related('department').all().order_by('id'))
-        id_to_index = {s.id: idx for idx, s in enumerate(schemes)}
-
-        if scheme_id not in id_to_index:
+        if store is None:
             return []
 
-        scheme_index = id_to_index[scheme_id]
-        selected_scheme = schemes[scheme_index]
-        selected_state = selected_scheme.department.state
-
-        similarity_scores = cosine_sim[scheme_index]
-
-        similar_indices_scores = sorted(
-            [
-                (i, score) for i, score in enumerate(similarity_scores)
-                if i != scheme_index and schemes[i].department.state == selected_state
-            ],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        neighbours = store.neighbours_for(scheme_id)[:top_n]
+        if not neighbours:
+            return []
 
-        recommended_schemes = []
-        for i, score in similar_indices_scores[:top_n]:
-            recommended_schemes.append({
-                'scheme': schemes[i],
-                'score': round(float(score), 4)
-            })
+        candidates = Scheme.objects.select_related('department__state').prefetch_related(
+            'beneficiaries', 'sponsors', 'benefits', 'tags'
+        ).in_bulk([neighbour_id for neighbour_id, _ in neighbours])
 
-        return recommended_schemes
+        return [
+            {'scheme': candidates[neighbour_id], 'score': round(float(score), 4)}
+            for neighbour_id, score in neighbours
+            if neighbour_id in candidates
+        ]
 
     except Exception as e:
         return []
@@ -55,52 +35,17 @@ def recommend_schemes(scheme_id, cosine_sim, top_n=5):
 
 
 def collaborative_recommendations(user_id, top_n=5, keywords=None):
-    # Fetch user-scheme interactions
-    interactions = UserInteraction.objects.values('user_id', 'scheme_id', 'interaction_value')
-    
-    if not interactions:
-        return []  # Return empty if no interactions exist
-
-    # Create a DataFrame
-    df = pd.DataFrame(interactions)
-
-    # Map user and scheme IDs to categorical indices
-    user_categories = df['user_id'].astype('category')
-    scheme_categories = df['scheme_id'].astype('category')
-    user_ids = user_categories.cat.codes
-    scheme_ids = scheme_categories.cat.codes
-
-    # Create User-Scheme Interaction Matrix
-    interaction_matrix = csr_matrix((df['interaction_value'], (user_ids, scheme_ids)))
-
-    num_schemes = interaction_matrix.shape[1]
-    n_components = min(50, num_schemes) 
-
-    # Perform SVD
-    svd = TruncatedSVD(n_components=n_components)  # Reduce dimensionality
-    latent_matrix = svd.fit_transform(interaction_matrix)
-
-    # Get the user's latent vector
-    try:
-        user_idx = user_categories.cat.categories.get_loc(user_id)
-    except KeyError:
-        return []  # Return empty if user_id is not found in the dataset
-
-    user_vector = latent_matrix[user_idx]
-
-    # Compute similarity scores for schemes
-    scheme_latent_matrix = latent_matrix.T  # Transpose to align with schemes
-    scores = scheme_latent_matrix.T.dot(user_vector)
-
-    # Get top N recommended scheme indices
-    recommended_indices = np.argsort(scores)[-top_n:][::-1]
-
-    # Map indices back to scheme IDs
-    scheme_ids = scheme_categories.cat.categories
-    recommended_scheme_ids = [scheme_ids[idx] for idx in recommended_indices]
+    """
+    Score the user against the trained collaborative model (see
+    train_collaborative_model). Users the model has not seen get the most
+    popular schemes; without a trained model only keyword matches are returned.
+    """
+    model = load_collaborative_model()
+    recommended_ids = model.recommend(user_id, top_n=top_n) if model is not None else []
 
-    # Fetch Scheme objects for recommendations
-    recommended_schemes = list(Scheme.objects.filter(id__in=recommended_scheme_ids))
+    # Fetch Scheme objects for recommendations, best first
+    candidates = Scheme.objects.in_bulk(recommended_ids)
+    recommended_schemes = [candidates[scheme_id] for scheme_id in recommended_ids if scheme_id in candidates]
     if keywords:
         keyword_matched_schemes = Scheme.objects.filter(
             Q(tags__name__icontains=keywords) | Q(description__icontains=keywords)
@@ -41,7 +41,15 @@ from django.conf import settings
 from django.db.models import Q
 import logging
 from django.utils.timezone import now, timedelta
-from communityEmpowerment.utils.utils import recommend_schemes, load_cosine_similarity, collaborative_recommendations, extract_keywords_from_feedback
+from communityEmpowerment.utils.utils import recommend_schemes, collaborative_recommendations, extract_keywords_from_feedback
+from communityEmpowerment.utils.similarity import load_similarity_store
+from communityEmpowerment.utils.facet_index import scheme_facet_index
+from communityEmpowerment.utils.search import get_search_backend
+from communityEmpowerment.utils.scheme_queries import scheme_list_queryset, compact_schemes
+from communityEmpowerment.utils.scheme_fragments import serialized_schemes
+from communityEmpowerment.utils.filter_cache import canonical_filters, cached_scheme_ids
+from communityEmpowerment.utils.cache_versions import SCHEME_NAMESPACES
+from communityEmpowerment.utils.conditional_get import conditional_on
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 import json
@@ -53,6 +61,7 @@ import calendar
 from django.db.models.functions import Coalesce
 from django.db.models import Count, Q, Sum, F
 from django.db.models import Case, When
+from django.db.models.query import QuerySet
 from collections import OrderedDict
 
 
@@ -87,6 +96,48 @@ class SchemePagination(PageNumberPagination):
     page_size_query_param = 'limit'
 
 
+def is_compact_view(request):
+    """`view=compact`, in the query string or a JSON body, asks for card-sized scheme rows."""
+    view = request.query_params.get('view')
+    if view is None and isinstance(request.data, dict):
+        view = request.data.get('view')
+    return view == 'compact'
+
+
+def scheme_page_response(request, paginator, schemes):
+    """
+    Paginate `schemes` (a queryset, a list of schemes or a list of scheme
+    ids) and serialize the page from the scheme fragment cache, or as
+    compact_schemes rows for `view=compact`. Querysets are paginated as ids,
+    so cached schemes are never loaded.
+    """
+    if isinstance(schemes, QuerySet):
+        schemes = schemes.prefetch_related(None).values_list('id', flat=True)
+    page = paginator.paginate_queryset(schemes, request) if paginator is not None else None
+    items = list(schemes) if page is None else page
+
+    if is_compact_view(request):
+        data = compact_schemes(item if isinstance(item, int) else item.id for item in items)
+    else:
+        data = serialized_schemes(items)
+
+    if page is not None:
+        return paginator.get_paginated_response(data)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+class SchemeListMixin:
+    """Scheme ListAPIViews answered through scheme_page_response (fragments, `?view=compact`)."""
+
+    @method_decorator(conditional_on(*SCHEME_NAMESPACES))
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return scheme_page_response(request, self.paginator, self.filter_queryset(self.get_queryset()))
+
+
+@method_decorator(conditional_on('states'), name='dispatch')
 class StateListAPIView(generics.ListAPIView):
     queryset = State.objects.filter(is_active=True)
     serializer_class = StateSerializer 
@@ -94,7 +145,7 @@ class StateListAPIView(generics.ListAPIView):
     ordering_fields = ['created_at', 'state_name']
     ordering = ['state_name']
 
-class StateSchemesListAPIView(generics.ListAPIView):
+class StateSchemesListAPIView(SchemeListMixin, generics.ListAPIView):
     serializer_class = SchemeSerializer
     filter_backends = [OrderingFilter]
     ordering_fields = ['introduced_on', 'title']
@@ -105,7 +156,7 @@ class StateSchemesListAPIView(generics.ListAPIView):
         state_id = self.kwargs.get('state_id')
         
         if state_id:
-            return Scheme.objects.filter(
+            return scheme_list_queryset().filter(
                 is_active=True,
                 department__state_id=state_id,
                 department__is_active=True, 
@@ -114,10 +165,12 @@ class StateSchemesListAPIView(generics.ListAPIView):
 
         return Scheme.objects.none()
     
+@method_decorator(conditional_on('states'), name='dispatch')
 class StateDetailAPIView(generics.RetrieveAPIView):
     queryset = State.objects.all()
     serializer_class = StateSerializer
 
+@method_decorator(conditional_on('departments', 'states'), name='dispatch')
 class DepartmentListAPIView(generics.ListAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer 
@@ -134,7 +187,7 @@ class OrganisationListAPIView(generics.ListAPIView):
 
 
 
-class SchemeListAPIView(generics.ListAPIView):
+class SchemeListAPIView(SchemeListMixin, generics.ListAPIView):
     serializer_class = SchemeSerializer 
     filter_backends = [OrderingFilter]
     ordering_fields = ['introduced_on', 'title']
@@ -143,7 +196,7 @@ class SchemeListAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         department_id = self.request.query_params.get('department_id')
-        queryset = Scheme.objects.filter(
+        queryset = scheme_list_queryset().filter(
             is_active=True,
             department__is_active=True,
             department__state__is_active=True
@@ -253,7 +306,7 @@ class StateDepartmentsListAPIView(generics.ListAPIView):
             raise NotFound("State ID not provided.")
         return Department.objects.filter(state_id=state_id)
 
-class DepartmentSchemesListAPIView(generics.ListAPIView):
+class DepartmentSchemesListAPIView(SchemeListMixin, generics.ListAPIView):
     serializer_class = SchemeSerializer
     filter_backends = [OrderingFilter]
     ordering_fields = ['introduced_on', 'title']
@@ -263,7 +316,7 @@ class DepartmentSchemesListAPIView(generics.ListAPIView):
         department_id = self.kwargs.get('department_id')
         if not department_id:
             raise NotFound("Department ID not provided.")
-        return Scheme.objects.filter(department_id=department_id)
+        return scheme_list_queryset().filter(department_id=department_id)
 
 class SchemeBeneficiariesListAPIView(generics.ListAPIView):
     serializer_class = SchemeBeneficiarySerializer
@@ -561,12 +614,16 @@ class ProtectedView(APIView):
 
 
 class SchemeSearchView(APIView):
+    pagination_class = SchemePagination
+
     def get(self, request, *args, **kwargs):
         query = request.query_params.get('q', None)
         if query:
-            schemes = Scheme.objects.filter(title__icontains=query)
-            serializer = SchemeSerializer(schemes, many=True)
-            return Response(serializer.data, status= status.HTTP_200_OK)
+            schemes = get_search_backend().search(
+                Scheme.objects.filter(is_active=True, department__is_active=True, department__state__is_active=True),
+                query,
+            )
+            return scheme_page_response(request, self.pagination_class(), schemes)
         return Response({"detail": "Query parameter 'q' is required."}, status=HTTP_400_BAD_REQUEST)
 
 
@@ -594,7 +651,7 @@ class UserSavedSchemesView(APIView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        saved_schemes = user.saved_schemes.all()
+        saved_schemes = scheme_list_queryset(user.saved_schemes.all())
         search_query = request.query_params.get('q', None)
         state_ids = request.query_params.getlist('state_ids', [])
         department_ids = request.query_params.getlist('department_ids', [])
@@ -629,17 +686,7 @@ class UserSavedSchemesView(APIView):
                 beneficiary_filters |= Q(beneficiaries__beneficiary_type__icontains=keyword)
             saved_schemes = saved_schemes.filter(beneficiary_filters)
 
-        # Apply pagination
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(saved_schemes, request)
-        
-        if page is not None:
-            serializer = SchemeSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-
-        # Fallback if pagination is not applied
-        serializer = SchemeSerializer(saved_schemes, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return scheme_page_response(request, self.pagination_class(), saved_schemes)
 
 
     
@@ -804,9 +851,8 @@ class PreferenceView(APIView):
         try:
             user_state = request.user.state_of_residence
             state_instance = State.objects.get(state_name=user_state)
-            schemes = Scheme.objects.filter(department__state=state_instance)
-            serializer = SchemeSerializer(schemes, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            schemes = Scheme.objects.filter(department__state=state_instance).values_list('id', flat=True)
+            return Response(serialized_schemes(schemes), status=status.HTTP_200_OK)
 
         except State.DoesNotExist:
             return Response({"error": "State not found."}, status=status.HTTP_404_NOT_FOUND)
@@ -814,12 +860,12 @@ class PreferenceView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class ScholarshipSchemesListView(generics.ListAPIView):
+class ScholarshipSchemesListView(SchemeListMixin, generics.ListAPIView):
     serializer_class = SchemeSerializer
     pagination_class = SchemePagination
 
     def get_queryset(self):
-        queryset = Scheme.objects.filter(
+        queryset = scheme_list_queryset().filter(
             tags__name__icontains='scholarship',
             is_active=True,
             department__is_active=True,
@@ -839,12 +885,12 @@ class ScholarshipSchemesListView(generics.ListAPIView):
         return queryset
 
 
-class JobSchemesListView(generics.ListAPIView):
+class JobSchemesListView(SchemeListMixin, generics.ListAPIView):
     serializer_class = SchemeSerializer
     pagination_class = SchemePagination
 
     def get_queryset(self):
-        queryset = Scheme.objects.filter(
+        queryset = scheme_list_queryset().filter(
             Q(tags__name__icontains='job') | Q(tags__name__icontains='employment'),
             is_active=True,
             department__is_active=True,
@@ -948,19 +994,12 @@ class SchemesByMultipleStatesAndDepartmentsAPIView(APIView):
 
         scheme_filters &= Q(department__is_active=True, department__state__is_active=True,is_active=True,)
 
-        schemes = Scheme.objects.filter(scheme_filters).distinct()
+        schemes = scheme_list_queryset(Scheme.objects.filter(scheme_filters).distinct())
 
         if ordering:
             schemes = schemes.order_by(*ordering)
 
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(schemes, request)
-        if page is not None:
-            serializer = SchemeSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-
-        serializer = SchemeSerializer(schemes, many=True)
-        return Response(serializer.data)
+        return scheme_page_response(request, self.pagination_class(), schemes)
     
 class ResendVerificationEmailView(APIView):
     permission_classes = [IsAuthenticated]
@@ -1003,7 +1042,7 @@ class UserSavedSchemesFilterView(APIView):
 
     def post(self, request, *args, **kwargs):
         user = request.user
-        saved_schemes = user.saved_schemes.all()
+        saved_schemes = scheme_list_queryset(user.saved_schemes.all())
 
         logger.debug(f"User: {user}, Saved Schemes: {saved_schemes}")
 
@@ -1053,19 +1092,7 @@ class UserSavedSchemesFilterView(APIView):
             saved_schemes = saved_schemes.filter(beneficiary_filters)
             logger.debug(f"Filtered by Beneficiary Keywords: {saved_schemes}")
 
-        # Apply pagination
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(saved_schemes, request)
-        
-        if page is not None:
-            serializer = SchemeSerializer(page, many=True)
-            logger.debug(f"Paginated Data: {serializer.data}")
-            return paginator.get_paginated_response(serializer.data)
-
-        # Fallback if pagination is not applied
-        serializer = SchemeSerializer(saved_schemes, many=True)
-        logger.debug(f"Non-Paginated Data: {serializer.data}")
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return scheme_page_response(request, self.pagination_class(), saved_schemes)
 
 class SchemeReportViewSet(viewsets.ModelViewSet):
     queryset = SchemeReport.objects.all()
@@ -1106,18 +1133,16 @@ class RecommendSchemesAPIView(APIView):
         except Scheme.DoesNotExist:
             return Response({'detail': 'Scheme not found'}, status=404)
 
-        cosine_sim = load_cosine_similarity()
+        store = load_similarity_store()
 
-        recommended = recommend_schemes(scheme.id, cosine_sim, top_n=10)
+        recommended = recommend_schemes(scheme.id, store, top_n=10)
 
-        response_data = []
-        for item in recommended:
-            scheme_data = SchemeSerializer(item['scheme']).data
-            scheme_data['score'] = item['score']
-            response_data.append(scheme_data)
+        scheme_data, *response_data = serialized_schemes([scheme] + [item['scheme'] for item in recommended])
+        for item, recommended_data in zip(recommended, response_data):
+            recommended_data['score'] = item['score']
 
         return Response({
-            'scheme': SchemeSerializer(scheme).data,
+            'scheme': scheme_data,
             'recommended_schemes': response_data
         })
 
@@ -1212,14 +1237,7 @@ class HybridRecommendationView(APIView):
         if ordering:
             final_schemes.sort(key=lambda x: getattr(x, ordering[0].lstrip('-')), reverse=ordering[0].startswith('-'))
 
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(final_schemes, request)
-        if page is not None:
-            serializer = SchemeSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-
-        serializer = SchemeSerializer(final_schemes, many=True)
-        return Response(serializer.data)
+        return scheme_page_response(request, self.pagination_class(), final_schemes)
 
     
 
@@ -1250,7 +1268,7 @@ class UnifiedSchemesAPIView(APIView):
 
     def apply_filters(self, data, user_tags):
         from django.db.models import Q
-        
+
         state_ids = data.get("state_ids", [])
         department_ids = data.get("department_ids", [])
         beneficiary_keywords = data.get("beneficiary_keywords", [])
@@ -1259,39 +1277,50 @@ class UnifiedSchemesAPIView(APIView):
         search_query = data.get("search_query")
         tag = data.get("tag")
 
-        scheme_filters = Q(department__is_active=True, department__state__is_active=True, is_active=True)
-
-        if tag:
-            scheme_filters &= Q(tags__name__icontains=tag)
-
-        if user_tags:
-            tag_filters = Q()
-            for user_tag in user_tags:
-                tag_filters |= Q(tags__name__icontains=user_tag)
-            scheme_filters &= tag_filters
+        if any([tag, user_tags, state_ids, department_ids, beneficiary_keywords, sponsor_ids]):
+            # Facet filters are answered by the in-memory index as set
+            # intersections, so the query below needs no joins or DISTINCT.
+            scheme_ids = scheme_facet_index.filter(
+                state_ids=state_ids,
+                department_ids=department_ids,
+                tag=tag,
+                user_tags=user_tags,
+                beneficiary_keywords=beneficiary_keywords,
+                sponsor_ids=sponsor_ids,
+            )
+            scheme_filters = Q(pk__in=scheme_ids)
+        else:
+            scheme_filters = Q(department__is_active=True, department__state__is_active=True, is_active=True)
 
-        if tag == "job":
-            scheme_filters &= Q(tags__name__icontains='job') | Q(tags__name__icontains='employment')
-        if tag == "scholarship":
-            scheme_filters &= Q(tags__name__icontains='scholarship')
-        if state_ids:
-            scheme_filters &= Q(department__state_id__in=state_ids)
-        if department_ids:
-            scheme_filters &= Q(department_id__in=department_ids)
-        if beneficiary_keywords:
-            bf_filter = Q()
-            for keyword in beneficiary_keywords:
-                bf_filter |= Q(beneficiaries__beneficiary_type__icontains=keyword)
-            scheme_filters &= bf_filter
-        if sponsor_ids:
-            scheme_filters &= Q(sponsors__id__in=sponsor_ids)
         if funding_pattern:
             scheme_filters &= Q(funding_pattern__icontains=funding_pattern)
         if search_query:
-            scheme_filters &= Q(title__icontains=search_query) | Q(description__icontains=search_query)
+            scheme_filters &= get_search_backend().filter_q(search_query)
 
         return scheme_filters
 
+    def ordered_scheme_ids(self, scheme_filters, ordering, user=None, top_n=10):
+        """Ids of the matching schemes, the user's recommendations first, then sorted by the first ordering field."""
+        recommended_schemes = Scheme.objects.none()
+        if user:
+            feedback = WebsiteFeedback.objects.filter(user=user).order_by('-created_at').first()
+            keywords = extract_keywords_from_feedback(feedback.description) if feedback else None
+
+            collaborative_schemes = collaborative_recommendations(user.id, top_n=top_n, keywords=keywords)
+            state_based = Scheme.objects.filter(department__state=user.state_of_residence)
+            all_recommended = list(set(collaborative_schemes) | set(state_based))
+
+            recommended_schemes = Scheme.objects.filter(pk__in=[s.id for s in all_recommended]).filter(scheme_filters).distinct()
+
+        field = ordering[0].lstrip('-') if ordering else None
+        columns = ('id', field) if field else ('id',)
+        rows = list(recommended_schemes.values_list(*columns))
+        rows += list(Scheme.objects.filter(scheme_filters).exclude(id__in=[row[0] for row in rows]).values_list(*columns))
+
+        if field:
+            rows.sort(key=lambda row: (row[1] is None, row[1]), reverse=ordering[0].startswith('-'))
+        return [row[0] for row in rows]
+
     def handle_request(self, request):
         user = request.user if request.user.is_authenticated else None
         data = self.get_data_source(request)
@@ -1307,35 +1336,17 @@ class UnifiedSchemesAPIView(APIView):
                 user_profile = {}
 
         user_tags = self.get_user_tags(user_profile)
-        scheme_filters = self.apply_filters(data, user_tags)
+        filters = canonical_filters(data, user_tags, ordering)
 
-        recommended_schemes = []
         if user:
-            feedback = WebsiteFeedback.objects.filter(user=user).order_by('-created_at').first()
-            keywords = extract_keywords_from_feedback(feedback.description) if feedback else None
-
-            collaborative_schemes = collaborative_recommendations(user.id, top_n=top_n, keywords=keywords)
-            state_based = Scheme.objects.filter(department__state=user.state_of_residence)
-            all_recommended = list(set(collaborative_schemes) | set(state_based))
-
-            recommended_schemes = Scheme.objects.filter(pk__in=[s.id for s in all_recommended]).filter(scheme_filters).distinct()
-
-        excluded_ids = [s.id for s in recommended_schemes]
-        other_schemes = Scheme.objects.filter(scheme_filters).exclude(id__in=excluded_ids).distinct()
-
-        final_schemes = list(recommended_schemes) + list(other_schemes)
-
-        if ordering:
-            final_schemes.sort(key=lambda x: getattr(x, ordering[0].lstrip('-')), reverse=ordering[0].startswith('-'))
-
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(final_schemes, request)
-        if page is not None:
-            serializer = SchemeSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            scheme_ids = self.ordered_scheme_ids(self.apply_filters(filters, user_tags), filters['ordering'], user, top_n)
+        else:
+            # Anonymous results depend on the filters alone, so they are shared.
+            scheme_ids = cached_scheme_ids(filters, lambda: self.ordered_scheme_ids(
+                self.apply_filters(filters, user_tags), filters['ordering']
+            ))
 
-        serializer = SchemeSerializer(final_schemes, many=True)
-        return Response(serializer.data)
+        return scheme_page_response(request, self.pagination_class(), scheme_ids)
 
     def get(self, request, *args, **kwargs):
         return self.handle_request(request)
@@ -1427,6 +1438,7 @@ class TrackEventView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
+@method_decorator(conditional_on('layout'), name='dispatch')
 class LayoutItemViewSet(viewsets.ViewSet):
 
     def list(self, request):
@@ -2140,6 +2152,13 @@ class SuperuserLoginView(APIView):
 
 class FAQViewSet(viewsets.ModelViewSet):
     serializer_class = FAQSerializer
+
+    # Only the public list: on dispatch the 304 would be answered before
+    # authentication, so admin-only reads could skip their 401/403.
+    @method_decorator(conditional_on('faqs'))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         if self.action == 'list':
             return FAQ.objects.filter(is_active=True).order_by("order")
@@ -2150,6 +2169,7 @@ class FAQViewSet(viewsets.ModelViewSet):
             return [AllowAny()] 
         return [IsAdminUser()]
 
+@method_decorator(conditional_on('company_meta'), name='dispatch')
 class CompanyMetaDetailView(generics.RetrieveUpdateAPIView):
     queryset = CompanyMeta.objects.all()
     serializer_class = CompanyMetaSerializer
@@ -2175,6 +2195,7 @@ class ResourceViewSet(viewsets.ModelViewSet):
         active_states = State.objects.filter(is_active=True)
         return Resource.objects.filter(state_name__in=active_states)
 
+@method_decorator(conditional_on('announcements'), name='dispatch')
 class AnnouncementListView(generics.ListAPIView):
     queryset = Announcement.objects.filter(is_active=True).order_by('-created_at')
     serializer_class = AnnouncementSerializer
@@ -2282,10 +2303,8 @@ class UserSchemeInteractionView(APIView):
         events = UserEvents.objects.filter(user_id=user_id, event_type__in=event_types).select_related('scheme')
         
         scheme_ids = events.values_list('scheme_id', flat=True).distinct()
-        schemes = Scheme.objects.filter(id__in=scheme_ids)
-        
-        serializer = SchemeSerializer(schemes, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        schemes = Scheme.objects.filter(id__in=scheme_ids).values_list('id', flat=True)
+        return Response(serialized_schemes(schemes), status=status.HTTP_200_OK)
     
 
 class AllSchemesInteractionSummaryView(APIView):
@@ -2293,7 +2312,7 @@ class AllSchemesInteractionSummaryView(APIView):
         schemes = Scheme.objects.all()
         response_data = []
 
-        for scheme in schemes:
+        for scheme, scheme_data in zip(schemes, serialized_schemes(schemes)):
             events = UserEvents.objects.filter(scheme=scheme)
 
             interaction_list = [
@@ -2309,7 +2328,6 @@ class AllSchemesInteractionSummaryView(APIView):
                 'save': events.filter(event_type='save').count(),
             }
 
-            scheme_data = SchemeSerializer(scheme).data
             scheme_data.update({
                 'interactions': interaction_list,
                 'counts': counts
@@ -34,7 +34,15 @@ app.conf.beat_schedule = {
     "{mysite}monthly-analytics-report": {
         "task": "communityEmpowerment.tasks.send_monthly_analytics_report_task",
         "schedule": crontab(day_of_month=1, hour=9, minute=0),  # First day of each month at 9 AM
-    }
+    },
+    "{mysite}refit-scheme-similarity": {
+        "task": "communityEmpowerment.tasks.refit_scheme_similarity_task",
+        "schedule": crontab(hour=2, minute=30),  # every day at 2:30 AM
+    },
+    "{mysite}train-collaborative-model": {
+        "task": "communityEmpowerment.tasks.train_collaborative_model_task",
+        "schedule": crontab(hour=3, minute=0),  # every day at 3:00 AM
+    },
 }
 
 app.conf.timezone = 'Asia/Kolkata' 
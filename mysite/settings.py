@@ -67,6 +67,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'cacheops',
     'import_export',
     'storages'
@@ -226,6 +227,19 @@ AWS_S3_MEDIA_CUSTOM_DOMAIN = f'https://{AWS_MEDIA_STORAGE_BUCKET_NAME}.s3.amazon
 AWS_S3_PDF_CUSTOM_DOMAIN = f'https://{AWS_PDF_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
 
 STATIC_URL = '/static/'
+
+# Top-k scheme neighbour store written by precompute_scheme_similarity
+SIMILARITY_STORE_DIR = os.getenv('SIMILARITY_STORE_DIR', os.path.join(BASE_DIR, 'scheme_similarity'))
+# SVD factors written by train_collaborative_model, retrained nightly and after N new interactions
+COLLABORATIVE_MODEL_DIR = os.getenv('COLLABORATIVE_MODEL_DIR', os.path.join(BASE_DIR, 'collaborative_model'))
+COLLABORATIVE_RETRAIN_INTERACTIONS = int(os.getenv('COLLABORATIVE_RETRAIN_INTERACTIONS', 500))
+# Page text extracted by pdfParser, keyed by the hash of each PDF
+PDF_TEXT_CACHE_DIR = os.getenv('PDF_TEXT_CACHE_DIR', os.path.join(BASE_DIR, 'pdf_text_cache'))
+# Requests per minute allowed on each Gemini API key used by the structuring scripts
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 2))
+# Structured Gemini results keyed by document hash, model and prompt version; least recently used evicted past the limit
+GEMINI_CACHE_DIR = os.getenv('GEMINI_CACHE_DIR', os.path.join(BASE_DIR, 'gemini_cache'))
+GEMINI_CACHE_MAX_MB = int(os.getenv('GEMINI_CACHE_MAX_MB', 512))
 STATIC_ROOT = os.path.join(BASE_DIR, 'static_files')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 